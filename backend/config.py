@@ -21,17 +21,90 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     
+    # Additional LLM Providers (optional)
+    PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY", "")
+    LLM_STUB_PROVIDER_ENABLED = os.getenv("LLM_STUB_PROVIDER_ENABLED", "False") == "True"
+    
     # Debug Mode
     DEBUG = os.getenv("DEBUG", "False") == "True"
     
     # Sentiment Analysis Settings
     SENTIMENT_CONFIDENCE_THRESHOLD = float(os.getenv("SENTIMENT_CONFIDENCE_THRESHOLD", "0.5"))
+    # Sentences around each brand mention whose keywords count toward its sentiment (-1 = whole response)
+    SENTIMENT_MENTION_WINDOW = int(os.getenv("SENTIMENT_MENTION_WINDOW", "1"))
+    # JSON file with {"positive": [...], "negative": [...]} (empty = built-in lexicon); re-read when it changes
+    SENTIMENT_LEXICON_PATH = os.getenv("SENTIMENT_LEXICON_PATH", "")
+    SENTIMENT_LEXICON_RELOAD_SECONDS = float(os.getenv("SENTIMENT_LEXICON_RELOAD_SECONDS", "30"))
     
     # API Settings
     MAX_TOKENS = int(os.getenv("MAX_TOKENS", "500"))
     TEMPERATURE = float(os.getenv("TEMPERATURE", "0.7"))
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "10"))
     
+    # LLM Execution Settings
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    
+    # Outbound HTTP Settings (homepage fetches)
+    BRAND_FETCH_TIMEOUT_SECONDS = float(os.getenv("BRAND_FETCH_TIMEOUT_SECONDS", "5"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "4"))
+    BRAND_FETCH_MAX_BYTES = int(os.getenv("BRAND_FETCH_MAX_BYTES", "262144"))  # stop reading after this much HTML
+    
+    # Brand Info Cache (homepage metadata per URL)
+    BRAND_INFO_CACHE_TTL_SECONDS = int(os.getenv("BRAND_INFO_CACHE_TTL_SECONDS", "21600"))
+    BRAND_INFO_NEGATIVE_TTL_SECONDS = int(os.getenv("BRAND_INFO_NEGATIVE_TTL_SECONDS", "300"))
+    BRAND_INFO_CACHE_MAX_ENTRIES = int(os.getenv("BRAND_INFO_CACHE_MAX_ENTRIES", "4096"))
+    
+    # Public Suffix List (empty = bundled subset in backend/utils/public_suffix_list.dat)
+    PUBLIC_SUFFIX_LIST_PATH = os.getenv("PUBLIC_SUFFIX_LIST_PATH", "")
+    
+    # Batch Analysis Settings
+    BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", "500"))
+    BATCH_MAX_CONCURRENT_BRANDS = int(os.getenv("BATCH_MAX_CONCURRENT_BRANDS", "16"))
+    BATCH_HOST_MIN_INTERVAL_SECONDS = float(os.getenv("BATCH_HOST_MIN_INTERVAL_SECONDS", "1.0"))
+    
+    # Hedged LLM Requests (duplicate a call that is slower than the model's recent percentile)
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "False") == "True"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.1"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0"))
+    LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+    
+    # Latency Budgets (milliseconds; 0 disables the ceiling)
+    WAITLIST_PREVIEW_DEADLINE_MS = int(os.getenv("WAITLIST_PREVIEW_DEADLINE_MS", "10000"))
+    
+    # LLM Rate Limiting Settings (per model; override with "model=rpm:tpm,...")
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+    LLM_MODEL_RATE_LIMITS = os.getenv("LLM_MODEL_RATE_LIMITS", "")
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+    
+    # Local Storage Settings (SQLite databases for cache, jobs, ...)
+    DATA_DIR = Path(os.getenv("DATA_DIR", str(config_dir / "data")))
+    
+    # LLM Completion Cache Settings
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True") == "True"
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(DATA_DIR / "llm_cache.sqlite3"))
+    
+    # Background Job Settings
+    JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", str(DATA_DIR / "jobs.sqlite3"))
+    JOB_EMBEDDED_WORKER = os.getenv("JOB_EMBEDDED_WORKER", "True") == "True"
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))  # Backoff before rerunning a transient failure
+    JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "300"))
+    
+    # Analysis History Settings
+    HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", str(DATA_DIR / "history.sqlite3"))
+    HISTORY_MAX_PAGE_SIZE = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "500"))
+    TRENDS_DEFAULT_DAYS = int(os.getenv("TRENDS_DEFAULT_DAYS", "30"))
+    
     # Application Settings
     APP_NAME = "VISIBI - AI Brand Monitor"
     VERSION = "0.1.0"
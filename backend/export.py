@@ -0,0 +1,86 @@
+"""
+VISIBI - Export
+Streams the analysis history or the waitlist to NDJSON or CSV
+
+Records are read and written a page at a time, so exports of any size run
+in constant memory. History exports in NDJSON (view "full") are valid input
+for python -m backend.rescore.
+
+Usage:
+    python -m backend.export history -o history.ndjson
+    python -m backend.export history --format csv --brand Slack --since 2025-01-01 -o slack.csv
+    python -m backend.export history --view summary --format csv > runs.csv
+    python -m backend.export waitlist --format csv -o waitlist.csv
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import config
+from backend.services.export_service import EXPORT_FORMATS, EXPORT_VIEWS, export_history, export_waitlist
+from backend.services.history_store import HistoryStore
+from backend.services.waitlist_service import WaitlistService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export VISIBI analysis history or the waitlist")
+    parser.add_argument("source", choices=["history", "waitlist"], help="What to export")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="Output format (default: ndjson)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument(
+        "--view",
+        choices=EXPORT_VIEWS,
+        default="full",
+        help="History: full analyses (CSV: one row per query) or summaries only (default: full)"
+    )
+    parser.add_argument("--no-responses", action="store_true", help="History: leave out the LLM response texts")
+    parser.add_argument("--brand", help="History: only analyses of this brand")
+    parser.add_argument("--url", help="History: only analyses of this URL")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="History: only analyses at or after this time")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="History: only analyses before this time")
+    parser.add_argument("--waitlist-dir", default="backend/data", help="Waitlist: data directory (default: backend/data)")
+    args = parser.parse_args()
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    store = None
+    try:
+        if args.source == "history":
+            store = HistoryStore(config.HISTORY_DB_PATH)
+            chunks = export_history(
+                store,
+                args.format,
+                args.view,
+                include_responses=not args.no_responses,
+                brand=args.brand,
+                url=args.url,
+                since=args.since,
+                until=args.until
+            )
+        else:
+            chunks = export_waitlist(WaitlistService(args.waitlist_dir), args.format)
+
+        written = 0
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if store:
+            store.close()
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+    # Progress goes to stderr so stdout stays a clean export
+    print(f"✅ Exported {args.source} ({args.format}, {written} bytes) to {args.output or 'stdout'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
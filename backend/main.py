@@ -5,8 +5,12 @@ Main application entry point with API endpoints
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-from typing import List
+from fastapi.responses import JSONResponse, StreamingResponse
+from datetime import date, datetime, timedelta
+from typing import Optional, Union
+import asyncio
+import json
+import math
 import sys
 import os
 from pathlib import Path
@@ -17,9 +21,16 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.config import config
 from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.http_client import AsyncHTTPClient
 from backend.services.sentiment_analyzer import SentimentAnalyzer
 from backend.services.waitlist_service import WaitlistService
 from backend.services.email_service import EmailService
+from backend.services.llm_service import LLMError, build_llm_service
+from backend.services.analysis_service import AnalysisService
+from backend.services.job_queue import JobQueue
+from backend.services.job_worker import JobWorker
+from backend.services.history_store import HistoryStore
+from backend.services.export_service import MEDIA_TYPES, export_history, export_waitlist
 from backend.models.schemas import (
     URLRequest,
     AnalysisResponse,
@@ -29,21 +40,20 @@ from backend.models.schemas import (
     UsageMetrics,
     HealthResponse,
     HistoryResponse,
+    HistorySummaryResponse,
+    TrendsResponse,
     WaitlistRequest,
     WaitlistResponse,
     PreviewData,
     ContactRequest,
     ContactResponse,
     BrandAnalysisRequest,
-    BrandAnalysisResponse
+    BrandAnalysisResponse,
+    BatchAnalysisRequest,
+    JobSubmitResponse,
+    JobStatusResponse
 )
 
-try:
-    from openai import OpenAI
-except ImportError:
-    print("Warning: OpenAI package not installed. Install with: pip install openai")
-    OpenAI = None
-
 # Initialize FastAPI app
 app = FastAPI(
     title=config.APP_NAME,
@@ -89,27 +99,26 @@ app.add_middleware(
 print("✅ CORS middleware configured successfully")
 
 # Initialize services
-brand_analyzer = BrandAnalyzer()
+http_client = AsyncHTTPClient()
+brand_analyzer = BrandAnalyzer(http_client=http_client)
 sentiment_analyzer = SentimentAnalyzer()
 waitlist_service = WaitlistService()
 email_service = EmailService()
 
-# Initialize OpenAI client if available
-openai_client = None
-if OpenAI and config.OPENAI_API_KEY:
-    try:
-        openai_client = OpenAI(api_key=config.OPENAI_API_KEY)
-        print(f"✅ OpenAI client initialized successfully with key: {config.OPENAI_API_KEY[:20]}...")
-    except Exception as e:
-        print(f"❌ Warning: Failed to initialize OpenAI client: {e}")
-else:
-    if not OpenAI:
-        print("❌ OpenAI package not installed")
-    if not config.OPENAI_API_KEY:
-        print(f"❌ OPENAI_API_KEY not found in environment (value: '{config.OPENAI_API_KEY}')")
+# Initialize async LLM execution layer (OpenAI client, completion cache, rate limiter)
+llm_service = build_llm_service()
+completion_cache = llm_service.cache
+rate_limiter = llm_service.rate_limiter
+
+analysis_service = AnalysisService(brand_analyzer, sentiment_analyzer, llm_service)
+
+# Durable background job queue (workers: `python -m backend.worker`, or the embedded one below)
+job_queue = JobQueue(config.JOB_QUEUE_PATH, max_attempts=config.JOB_MAX_ATTEMPTS)
+embedded_worker = None
+embedded_worker_task = None
 
-# In-memory storage for MVP (will be replaced with database in Phase 2)
-analysis_history: List[dict] = []
+# Persistent analysis history, shared by every API worker process
+history_store = HistoryStore(config.HISTORY_DB_PATH)
 
 
 def verify_recaptcha(token: str) -> bool:
@@ -139,43 +148,37 @@ def verify_recaptcha(token: str) -> bool:
     return success and score >= 0.5
 
 
-def get_chatgpt_response(query: str):
+def ensure_llm_available(models=None):
     """
-    Get response from ChatGPT for a given query
-    Returns tuple of (response_text, usage_data)
+    Raise an HTTP error if no LLM client is configured
+    
+    Requests naming explicit models are validated per model instead.
     """
-    if not openai_client:
+    if not models and not llm_service.is_available:
         raise HTTPException(
             status_code=500,
             detail="OpenAI client not initialized. Check OPENAI_API_KEY in .env file"
         )
+
+
+def llm_http_exception(error: LLMError) -> HTTPException:
+    """
+    Convert an LLM failure into an HTTP error
     
-    try:
-        response = openai_client.chat.completions.create(
-            model=config.OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "user",
-                    "content": query
-                }
-            ],
-            max_tokens=config.MAX_TOKENS,
-            temperature=config.TEMPERATURE
-        )
-        
-        # Extract usage data
-        usage_data = {
-            "prompt_tokens": response.usage.prompt_tokens,
-            "completion_tokens": response.usage.completion_tokens,
-            "total_tokens": response.usage.total_tokens
-        }
-        
-        return response.choices[0].message.content, usage_data
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"ChatGPT API Error: {str(e)}"
+    Transient provider failures that survived all retries (rate limits,
+    5xx, connection errors) become 503 with a Retry-After hint.
+    """
+    if error.transient:
+        retry_after = max(1, math.ceil(error.retry_after or config.LLM_BACKOFF_MAX_SECONDS))
+        return HTTPException(
+            status_code=503,
+            detail=f"ChatGPT API temporarily unavailable: {str(error)}",
+            headers={"Retry-After": str(retry_after)}
         )
+    return HTTPException(
+        status_code=500,
+        detail=f"ChatGPT API Error: {str(error)}"
+    )
 
 
 @app.get("/", tags=["Root"])
@@ -201,162 +204,580 @@ async def health_check():
     )
 
 
-@app.post("/api/brands/analyze", response_model=AnalysisResponse, tags=["Analysis"])
-async def analyze_brand(request: URLRequest):
+def enqueue_brand_analysis(url: str, queries=None, custom_keywords=None, **extra) -> str:
+    """Queue a brand analysis for the background workers, returning the job id"""
+    payload = {
+        "url": url,
+        "queries": queries,
+        "custom_keywords": custom_keywords,
+        **extra
+    }
+    job_id = job_queue.enqueue("brand_analysis", payload)
+    print(f"📥 Queued brand analysis job {job_id} for {url}")
+    return job_id
+
+
+@app.post(
+    "/api/brands/analyze",
+    response_model=Union[AnalysisResponse, JobSubmitResponse],
+    tags=["Analysis"]
+)
+async def analyze_brand(request: URLRequest, async_job: bool = False):
     """
     Main endpoint: Analyze brand mentions and sentiment
     
     This endpoint:
     1. Extracts brand name from URL
     2. Generates or uses provided monitoring queries
-    3. Sends queries to ChatGPT
+    3. Sends queries to ChatGPT, or to every model in `models` (concurrently)
     4. Analyzes sentiment in responses
     5. Returns comprehensive analysis with metrics
+    
+    With deadline_ms set, queries still running when the budget expires are
+    cancelled: the response is marked partial, lists them in dropped_queries
+    and computes the summary from the queries that finished.
+    
+    With ?async_job=true the analysis is queued for a background worker
+    instead: the response is 202 with a job id to poll at /api/jobs/{job_id}.
     """
     try:
-        # Fetch brand info
-        brand_info = await brand_analyzer.fetch_brand_info(request.url)
-        brand_name = brand_info["brand_name"]
+        ensure_llm_available(request.models)
         
-        # Generate or use provided queries
-        if request.queries:
-            queries = request.queries
-        else:
-            queries = brand_analyzer.generate_monitoring_queries(
-                brand_name,
-                custom_keywords=request.custom_keywords
-            )
+        try:
+            models = analysis_service.resolve_models(request.models)
+        except LLMError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Analyze each query
-        analysis_results = []
-        total_prompt_tokens = 0
-        total_completion_tokens = 0
+        if async_job:
+            job_id = enqueue_brand_analysis(
+                request.url,
+                queries=request.queries,
+                custom_keywords=request.custom_keywords,
+                models=models,
+                deadline_ms=request.deadline_ms,
+                competitors=request.competitors,
+                brand_aliases=request.brand_aliases
+            )
+            job_response = JobSubmitResponse(
+                job_id=job_id,
+                status="queued",
+                status_url=f"/api/jobs/{job_id}"
+            )
+            return JSONResponse(status_code=202, content=job_response.model_dump())
         
-        for query in queries:
-            # Get ChatGPT response with usage data
-            response, usage_data = get_chatgpt_response(query)
-            
-            # Accumulate token usage
-            total_prompt_tokens += usage_data["prompt_tokens"]
-            total_completion_tokens += usage_data["completion_tokens"]
-            
-            # Analyze sentiment
-            sentiment_analysis = sentiment_analyzer.analyze_sentiment(response, brand_name)
-            
-            query_result = QueryAnalysis(
-                query=query,
-                response=response,
-                sentiment_analysis=SentimentResult(**sentiment_analysis)
+        try:
+            analysis_response = await analysis_service.analyze(
+                request.url,
+                queries=request.queries,
+                custom_keywords=request.custom_keywords,
+                models=models,
+                deadline_ms=request.deadline_ms,
+                competitors=request.competitors,
+                brand_aliases=request.brand_aliases
             )
-            
-            analysis_results.append(query_result)
+        except LLMError as e:
+            raise llm_http_exception(e)
         
-        # Calculate summary metrics
-        mentions_count = sum(1 for a in analysis_results if a.sentiment_analysis.mentioned)
-
-        # Calculate total citations (total occurrences of brand across all responses)
-        citations_count = sum(
-            sentiment_analyzer.count_brand_occurrences(a.response, brand_name)
-            for a in analysis_results
-        )
-
-        positive_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "POSITIVE")
-        negative_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "NEGATIVE")
-        neutral_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "NEUTRAL")
+        # Store in history
+        await asyncio.to_thread(history_store.add, analysis_response)
         
-        # Determine overall sentiment
-        overall_sentiment = "POSITIVE" if positive_count > negative_count else \
-                          "NEGATIVE" if negative_count > positive_count else "NEUTRAL"
+        return analysis_response
         
-        # Calculate average confidence
-        mentioned_analyses = [a for a in analysis_results if a.sentiment_analysis.mentioned]
-        avg_confidence = (
-            sum(a.sentiment_analysis.confidence for a in mentioned_analyses) / len(mentioned_analyses)
-            if mentioned_analyses else 0.0
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Analysis failed: {str(e)}")
+
+
+@app.post("/api/brands/analyze/stream", tags=["Analysis"])
+async def analyze_brand_stream(request: URLRequest):
+    """
+    Streaming variant of /api/brands/analyze (NDJSON)
+    
+    Emits one JSON object per line:
+    - {"type": "start", ...} with the brand name and the queries that will run
+    - {"type": "query", "index": i, "analysis": QueryAnalysis} as soon as each query finishes
+      (with several models, index m * len(queries) + i is query i on models[m])
+    - {"type": "summary", "summary": SummaryMetrics, "usage": UsageMetrics, "share_of_voice": ...} closing the stream
+    - {"type": "error", "detail": ...} if the analysis fails after streaming started
+    
+    With deadline_ms set, the summary frame is sent when the budget expires
+    and lists the cancelled queries in dropped_queries.
+    """
+    ensure_llm_available(request.models)
+    
+    try:
+        models = analysis_service.resolve_models(request.models)
+    except LLMError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    deadline = analysis_service.make_deadline(request.deadline_ms)
+    try:
+        brand_info = await analysis_service.fetch_brand_info(request.url, deadline)
+        brand_name = brand_info["brand_name"]
+        queries = analysis_service.resolve_queries(
+            brand_name,
+            queries=request.queries,
+            custom_keywords=request.custom_keywords
         )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Analysis failed: {str(e)}")
+    
+    def frame(payload: dict) -> str:
+        return json.dumps(payload) + "\n"
+    
+    async def event_stream():
+        yield frame({
+            "type": "start",
+            "brand_name": brand_name,
+            "url": request.url,
+            "queries": queries,
+            "models": models
+        })
         
-        summary = SummaryMetrics(
-            total_queries=len(queries),
-            mentions_count=mentions_count,
-            citations=citations_count,
-            visibility=(mentions_count / len(queries)) * 100 if queries else 0,
-            positive=positive_count,
-            negative=negative_count,
-            neutral=neutral_count,
-            overall_sentiment=overall_sentiment,
-            average_confidence=round(avg_confidence, 2)
-        )
+        analysis_results = [None] * (len(queries) * len(models))
+        usages = []
+        try:
+            async for index, query_result, usage_data in analysis_service.iter_query_analyses(
+                queries, brand_name, models, deadline
+            ):
+                analysis_results[index] = query_result
+                usages.append(usage_data)
+                yield frame({
+                    "type": "query",
+                    "index": index,
+                    "analysis": query_result.model_dump(mode="json")
+                })
+        except asyncio.TimeoutError:
+            pass
+        except LLMError as e:
+            yield frame({"type": "error", "detail": llm_http_exception(e).detail})
+            return
         
-        # Calculate usage metrics and estimated cost
-        # gpt-4o-mini pricing: $0.150/1M input tokens, $0.600/1M output tokens
-        total_tokens = total_prompt_tokens + total_completion_tokens
-        estimated_cost = (
-            (total_prompt_tokens / 1_000_000) * 0.150 +
-            (total_completion_tokens / 1_000_000) * 0.600
+        analysis_response = analysis_service.build_response(
+            request.url, brand_name, analysis_results, usages, queries, models,
+            competitors=request.competitors, brand_aliases=request.brand_aliases
         )
+        await asyncio.to_thread(history_store.add, analysis_response)
         
-        usage_metrics = UsageMetrics(
-            model=config.OPENAI_MODEL,
-            total_tokens=total_tokens,
-            prompt_tokens=total_prompt_tokens,
-            completion_tokens=total_completion_tokens,
-            estimated_cost=round(estimated_cost, 6)
+        yield frame({
+            "type": "summary",
+            "timestamp": analysis_response.timestamp.isoformat(),
+            "queries_analyzed": analysis_response.queries_analyzed,
+            "summary": analysis_response.summary.model_dump(mode="json"),
+            "usage": analysis_response.usage.model_dump(mode="json"),
+            "model_results": [
+                model_result.model_dump(mode="json") for model_result in analysis_response.model_results or []
+            ] or None,
+            "partial": analysis_response.partial,
+            "dropped_queries": [
+                dropped.model_dump(mode="json") for dropped in analysis_response.dropped_queries or []
+            ] or None,
+            "share_of_voice": (
+                analysis_response.share_of_voice.model_dump(mode="json")
+                if analysis_response.share_of_voice else None
+            )
+        })
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@app.post("/api/brands/analyze/batch", tags=["Analysis"])
+async def analyze_brands_batch(request: BatchAnalysisRequest, async_job: bool = False):
+    """
+    Analyze many brands in one request (NDJSON stream, or a job with ?async_job=true)
+    
+    URLs are de-duplicated by brand name (the first URL of each brand is
+    kept). Homepage fetches are spaced out per host and every brand's LLM
+    calls share one bounded pool.
+    
+    The stream emits one JSON object per line:
+    - {"type": "start", "urls": [...], "duplicates": [...]} with the brands that will run
+    - {"type": "result", "index": i, "url": ..., "analysis": AnalysisResponse} as each brand finishes
+    - {"type": "error", "index": i, "url": ..., "detail": ...} for a brand that failed
+    - {"type": "done", "analyzed": n, "failed": m} closing the stream
+    
+    With ?async_job=true the batch is queued instead (job kind "batch_analysis")
+    and the response is 202 with a job id; the job result is a BatchAnalysisResult.
+    """
+    ensure_llm_available(request.models)
+    
+    try:
+        models = analysis_service.resolve_models(request.models)
+    except LLMError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    urls, duplicates = analysis_service.dedupe_urls(request.urls)
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs to analyze")
+    if len(urls) > config.BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many brands in one batch ({len(urls)}); the limit is {config.BATCH_MAX_URLS}"
         )
-        
-        # Create response
-        analysis_response = AnalysisResponse(
-            brand_name=brand_name,
-            url=request.url,
-            timestamp=datetime.now(),
-            queries_analyzed=len(queries),
-            analysis=analysis_results,
-            summary=summary,
-            usage=usage_metrics
+    
+    if async_job:
+        job_id = job_queue.enqueue("batch_analysis", {
+            "urls": urls,
+            "duplicates": duplicates,
+            "queries": request.queries,
+            "custom_keywords": request.custom_keywords,
+            "models": models
+        })
+        print(f"📥 Queued batch analysis job {job_id} for {len(urls)} brands")
+        job_response = JobSubmitResponse(
+            job_id=job_id,
+            status="queued",
+            status_url=f"/api/jobs/{job_id}"
         )
+        return JSONResponse(status_code=202, content=job_response.model_dump())
+    
+    def frame(payload: dict) -> str:
+        return json.dumps(payload) + "\n"
+    
+    async def event_stream():
+        yield frame({"type": "start", "urls": urls, "duplicates": duplicates})
         
-        # Store in history
-        analysis_history.append(analysis_response.model_dump())
-        
-        return analysis_response
+        analyzed = failed = 0
+        async for index, url, analysis_response, error in analysis_service.iter_batch(
+            urls,
+            queries=request.queries,
+            custom_keywords=request.custom_keywords,
+            models=models
+        ):
+            if analysis_response is None:
+                failed += 1
+                yield frame({"type": "error", "index": index, "url": url, "detail": error})
+                continue
+            analyzed += 1
+            await asyncio.to_thread(history_store.add, analysis_response)
+            yield frame({
+                "type": "result",
+                "index": index,
+                "url": url,
+                "analysis": analysis_response.model_dump(mode="json")
+            })
         
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Analysis failed: {str(e)}")
+        yield frame({"type": "done", "analyzed": analyzed, "failed": failed})
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatusResponse, tags=["Jobs"])
+async def get_job_status(job_id: str):
+    """
+    Get background job status, progress and (once completed) the AnalysisResponse
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return JobStatusResponse(
+        job_id=job["id"],
+        kind=job["kind"],
+        status=job["status"],
+        progress=job["progress"],
+        total=job["total"],
+        attempts=job["attempts"],
+        created_at=datetime.fromtimestamp(job["created_at"]),
+        updated_at=datetime.fromtimestamp(job["updated_at"]),
+        error=job["error"],
+        result=job["result"]
+    )
+
+
+@app.get("/api/jobs", tags=["Jobs"])
+async def get_job_queue_stats():
+    """Get the number of jobs in each status (admin endpoint)"""
+    return {
+        "message": "Job queue statistics",
+        **job_queue.get_stats()
+    }
+
+
+def history_filters(
+    brand: Optional[str],
+    url: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    sentiment: Optional[str],
+    min_visibility: Optional[float]
+) -> dict:
+    """Validated history filters as keyword arguments for HistoryStore"""
+    if sentiment and sentiment.upper() not in ("POSITIVE", "NEGATIVE", "NEUTRAL"):
+        raise HTTPException(status_code=400, detail="sentiment must be POSITIVE, NEGATIVE or NEUTRAL")
+    return {
+        "brand": brand,
+        "url": url,
+        "since": since,
+        "until": until,
+        "sentiment": sentiment,
+        "min_visibility": min_visibility
+    }
 
 
 @app.get("/api/brands/history", response_model=HistoryResponse, tags=["History"])
-async def get_analysis_history(limit: int = 10):
+async def get_analysis_history(
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    brand: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sentiment: Optional[str] = None,
+    min_visibility: Optional[float] = None,
+    include_responses: bool = True
+):
     """
-    Get analysis history
+    Get analysis history, newest first
     
     Args:
-        limit: Maximum number of results to return (default: 10)
+        limit: Maximum number of results to return (default: 10, capped by HISTORY_MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        brand: Only analyses of this brand (case-insensitive)
+        url: Only analyses of this URL
+        since: Only analyses at or after this time
+        until: Only analyses before this time
+        sentiment: Only analyses with this overall sentiment (POSITIVE, NEGATIVE, NEUTRAL)
+        min_visibility: Only analyses with at least this visibility (percent)
+        include_responses: Load the LLM response texts (with false, each
+            response is empty and response_hash can be fetched from
+            /api/brands/history/responses/{response_hash} when needed)
     
     Returns:
-        List of past analyses
+        A page of past analyses; use /api/brands/history/summary for listings
+        that don't need the queries at all
     """
-    # Return most recent analyses first
-    recent_analyses = analysis_history[-limit:][::-1]
+    filters = history_filters(brand, url, since, until, sentiment, min_visibility)
+    try:
+        analyses, next_cursor = history_store.page(
+            min(limit, config.HISTORY_MAX_PAGE_SIZE), cursor, hydrate=include_responses, **filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return HistoryResponse(
-        analyses=recent_analyses,
-        total_count=len(analysis_history)
+        analyses=analyses,
+        total_count=history_store.count(**filters),
+        next_cursor=next_cursor
+    )
+
+
+@app.get("/api/brands/history/summary", response_model=HistorySummaryResponse, tags=["History"])
+async def get_analysis_history_summary(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    brand: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sentiment: Optional[str] = None,
+    min_visibility: Optional[float] = None
+):
+    """
+    Get the summary and usage metrics of past analyses, newest first
+    
+    Takes the same parameters as /api/brands/history but leaves out the
+    queries and LLM responses, so dashboards can list many runs cheaply.
+    Fetch a full analysis from /api/brands/history when it is needed.
+    """
+    filters = history_filters(brand, url, since, until, sentiment, min_visibility)
+    try:
+        items, next_cursor = history_store.page_summaries(min(limit, config.HISTORY_MAX_PAGE_SIZE), cursor, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return HistorySummaryResponse(
+        items=items,
+        total_count=history_store.count(**filters),
+        next_cursor=next_cursor
     )
 
 
+@app.get("/api/brands/history/export", tags=["History"])
+def export_analysis_history(
+    format: str = "ndjson",
+    view: str = "full",
+    brand: Optional[str] = None,
+    url: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    sentiment: Optional[str] = None,
+    min_visibility: Optional[float] = None,
+    include_responses: bool = True
+):
+    """
+    Download the analysis history matching the filters, newest first
+    
+    The body is streamed (chunked transfer) as records are read from the
+    store, a page at a time, so exports of any size use constant memory.
+    
+    Args:
+        format: ndjson or csv
+        view: full (NDJSON: one AnalysisResponse per line, which
+            python -m backend.rescore accepts as input; CSV: one row per
+            query) or summary (one HistorySummary per line / row)
+        include_responses: Include the LLM response texts (view=full)
+        Other filters as for /api/brands/history
+    """
+    filters = history_filters(brand, url, since, until, sentiment, min_visibility)
+    try:
+        body = export_history(history_store, format, view, include_responses, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="history-{view}.{format}"'}
+    )
+
+
+@app.get("/api/brands/trends", response_model=TrendsResponse, tags=["History"])
+async def get_brand_trends(
+    brand: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None
+):
+    """
+    Get daily visibility and sentiment trends
+    
+    Read from per-brand daily rollups that are updated as each analysis is
+    stored, so the cost depends on the number of days, not of analyses.
+    
+    Args:
+        brand: One brand (case-insensitive); all brands are combined if omitted
+        since: First day (default: TRENDS_DEFAULT_DAYS days before until)
+        until: Last day (default: today)
+    """
+    until = until or date.today()
+    since = since or until - timedelta(days=config.TRENDS_DEFAULT_DAYS - 1)
+    if since > until:
+        raise HTTPException(status_code=400, detail="since must not be after until")
+    
+    return TrendsResponse(
+        brand=brand,
+        since=since,
+        until=until,
+        days=history_store.daily_trends(brand, since, until)
+    )
+
+
+@app.get("/api/brands/history/responses/{response_hash}", tags=["History"])
+async def get_history_response(response_hash: str):
+    """Get one stored LLM response text by its response_hash"""
+    response = history_store.get_response(response_hash)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Response not found")
+    return {"response_hash": response_hash, "response": response}
+
+
 @app.delete("/api/brands/history", tags=["History"])
 async def clear_history():
     """Clear all analysis history (for testing purposes)"""
-    global analysis_history
-    count = len(analysis_history)
-    analysis_history = []
+    count = history_store.clear()
     return {
         "message": "History cleared",
         "items_deleted": count
     }
 
 
+@app.post("/api/brands/history/rescore", tags=["History"])
+def rescore_history(batch_size: int = 100):
+    """
+    Re-score stored analyses against the current sentiment lexicon
+    
+    Uses the keyword counts stored with each response, so only terms added
+    since the response was scored are searched for in its text. Analyses
+    already scored with the current lexicon are left alone, and the rest
+    are written back batch_size at a time. Runs in the threadpool so other
+    requests are served meanwhile; for large histories use the bulk command
+    instead: python -m backend.rescore --history
+    """
+    version = sentiment_analyzer.lexicon.version
+    analyses = updated = scanned = 0
+    pending = []
+    for record_id, data in history_store.iter_records(batch_size=batch_size):
+        analyses += 1
+        analysis = AnalysisResponse.model_validate_json(data)
+        if all(a.lexicon_version == version for a in analysis.analysis):
+            continue
+        rescored, rescanned = analysis_service.rescore_analysis(analysis)
+        pending.append((record_id, rescored.model_dump_json()))
+        scanned += rescanned
+        if len(pending) >= batch_size:
+            history_store.update_many(pending)
+            updated += len(pending)
+            pending = []
+    if pending:
+        history_store.update_many(pending)
+        updated += len(pending)
+    return {
+        "analyses": analyses,
+        "updated": updated,
+        "responses_scanned": scanned,
+        "lexicon_version": version
+    }
+
+
+@app.get("/api/sentiment/lexicon", tags=["Sentiment"])
+async def get_sentiment_lexicon():
+    """Get the current sentiment lexicon and its version"""
+    return {
+        **sentiment_analyzer.lexicons.get_stats(),
+        "positive": sorted(sentiment_analyzer.positive_keywords),
+        "negative": sorted(sentiment_analyzer.negative_keywords)
+    }
+
+
+@app.post("/api/sentiment/lexicon/reload", tags=["Sentiment"])
+async def reload_sentiment_lexicon():
+    """Re-read the lexicon file (SENTIMENT_LEXICON_PATH) now"""
+    if not sentiment_analyzer.lexicons.path:
+        raise HTTPException(status_code=400, detail="No lexicon file configured (SENTIMENT_LEXICON_PATH)")
+    try:
+        changed = sentiment_analyzer.lexicons.reload()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Could not load lexicon: {e}")
+    return {"changed": changed, **sentiment_analyzer.lexicons.get_stats()}
+
+
+@app.get("/api/brands/info-cache/stats", tags=["Analysis"])
+async def get_brand_info_cache_stats():
+    """Get homepage metadata cache counters and HTTP pool stats"""
+    return {
+        "cache": brand_analyzer.cache.get_stats(),
+        "http": http_client.get_stats()
+    }
+
+
+@app.get("/api/llm/stats", tags=["LLM"])
+async def get_llm_stats():
+    """Get LLM execution counters (executed vs. coalesced requests)"""
+    return llm_service.get_stats()
+
+
+@app.get("/api/llm/cache/stats", tags=["LLM"])
+async def get_llm_cache_stats():
+    """Get LLM completion cache hit/miss counters"""
+    if completion_cache is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        **completion_cache.get_stats()
+    }
+
+
+@app.delete("/api/llm/cache", tags=["LLM"])
+async def clear_llm_cache():
+    """Clear all cached LLM completions"""
+    items_deleted = completion_cache.clear() if completion_cache is not None else 0
+    return {
+        "message": "LLM cache cleared",
+        "items_deleted": items_deleted
+    }
+
+
 @app.post("/api/waitlist", response_model=WaitlistResponse, tags=["Waitlist"])
 async def join_waitlist(request: WaitlistRequest):
     """
@@ -375,8 +796,12 @@ async def join_waitlist(request: WaitlistRequest):
         if not request.email or '@' not in request.email:
             raise HTTPException(status_code=400, detail="Invalid email address")
 
+        # Hard latency ceiling for the preview (the request may ask for less)
+        budgets_ms = [ms for ms in (request.deadline_ms, config.WAITLIST_PREVIEW_DEADLINE_MS) if ms]
+        deadline = analysis_service.make_deadline(min(budgets_ms)) if budgets_ms else None
+
         # Fetch brand info and run quick analysis
-        brand_info = await brand_analyzer.fetch_brand_info(request.brand_url)
+        brand_info = await analysis_service.fetch_brand_info(request.brand_url, deadline)
         brand_name = brand_info["brand_name"]
 
         # Generate queries based on custom inputs or defaults
@@ -392,18 +817,40 @@ async def join_waitlist(request: WaitlistRequest):
             # preview_queries = brand_analyzer.generate_monitoring_queries(brand_name)[:5]
             preview_queries = []  # No default queries - user must provide custom queries
 
-        # Quick sentiment analysis
+        # Quick sentiment analysis (all queries sent to ChatGPT concurrently)
         preview_results = []
-        preview_responses = []  # Store responses to count citations
-        for query in preview_queries:
+        preview_responses = []
+        preview_citations = []  # Brand occurrences per response, from the same scan as the sentiment
+        timeout = deadline - asyncio.get_running_loop().time() if deadline is not None else None
+        llm_results = await llm_service.complete_many(preview_queries, return_exceptions=True, timeout=timeout)
+
+        # Queries cut off by the deadline are left out of the preview metrics
+        dropped_queries = [
+            query for query, llm_result in zip(preview_queries, llm_results)
+            if isinstance(llm_result, asyncio.TimeoutError)
+        ]
+        if dropped_queries:
+            print(f"⏱️  Preview deadline reached: {len(dropped_queries)}/{len(preview_queries)} queries dropped")
+            finished = [
+                (query, llm_result) for query, llm_result in zip(preview_queries, llm_results)
+                if not isinstance(llm_result, asyncio.TimeoutError)
+            ]
+            preview_queries = [query for query, _ in finished]
+            llm_results = [llm_result for _, llm_result in finished]
+
+        for query, llm_result in zip(preview_queries, llm_results):
             try:
                 print(f"\n=== Query: {query} ===")
-                response, _ = get_chatgpt_response(query)
+                if isinstance(llm_result, BaseException):
+                    raise llm_result
+                response, _ = llm_result
                 print(f"=== Response (first 100 chars): {response[:100]}... ===")
-                sentiment_analysis = sentiment_analyzer.analyze_sentiment(response, brand_name)
+                response_analysis = sentiment_analyzer.analyze_response(response, brand_name)
+                sentiment_analysis = response_analysis.sentiment()
                 print(f"=== Sentiment: {sentiment_analysis['sentiment']}, Mentioned: {sentiment_analysis['mentioned']} ===")
                 preview_results.append(sentiment_analysis)
                 preview_responses.append(response)
+                preview_citations.append(response_analysis.citations)
             except Exception as e:
                 # If OpenAI fails, provide fallback data
                 error_msg = str(e) if str(e) else repr(e)
@@ -421,6 +868,7 @@ async def join_waitlist(request: WaitlistRequest):
                     "negative_indicators": 0
                 })
                 preview_responses.append("")
+                preview_citations.append(0)
 
         # Calculate preview metrics
         mentions_count = sum(1 for r in preview_results if r["mentioned"])
@@ -428,10 +876,7 @@ async def join_waitlist(request: WaitlistRequest):
         negative_count = sum(1 for r in preview_results if r["sentiment"] == "NEGATIVE")
 
         # Calculate total citations (total occurrences of brand across all preview responses)
-        citations_count = sum(
-            sentiment_analyzer.count_brand_occurrences(response, brand_name)
-            for response in preview_responses
-        )
+        citations_count = sum(preview_citations)
 
         # Determine overall sentiment
         overall_sentiment = "POSITIVE" if positive_count > negative_count else \
@@ -471,7 +916,8 @@ async def join_waitlist(request: WaitlistRequest):
             visibility=round(visibility, 1),
             sample_query=sample_query,
             sample_response=sample_response,
-            citation_urls=citation_urls if citation_urls else None
+            citation_urls=citation_urls if citation_urls else None,
+            dropped_queries=dropped_queries or None
         )
 
         # Save to waitlist
@@ -533,6 +979,25 @@ async def get_waitlist_stats():
     }
 
 
+@app.get("/api/waitlist/export", tags=["Waitlist"])
+def export_waitlist_entries(format: str = "ndjson"):
+    """
+    Download the waitlist as NDJSON (complete entries) or CSV (admin endpoint)
+    
+    Entries are decoded from the waitlist file and streamed one at a time.
+    """
+    try:
+        body = export_waitlist(waitlist_service, format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="waitlist.{format}"'}
+    )
+
+
 @app.post("/api/send-email", response_model=ContactResponse, tags=["Contact"])
 async def send_contact_email(request: ContactRequest):
     """
@@ -647,11 +1112,28 @@ async def submit_brand_analysis(request: BrandAnalysisRequest, background_tasks:
         # Add email sending to background tasks
         background_tasks.add_task(send_emails)
 
+        # Queue the actual analysis for the background workers
+        job_id = None
+        if llm_service.is_available:
+            queries = None
+            if request.custom_queries or request.custom_keywords:
+                queries = brand_analyzer.generate_monitoring_queries(
+                    brand_analyzer.extract_brand_name(request.brand_url),
+                    custom_queries=request.custom_queries,
+                    custom_keywords=request.custom_keywords
+                )
+            job_id = enqueue_brand_analysis(
+                request.brand_url,
+                queries=queries,
+                requested_by=request.email
+            )
+
         # Return immediately without waiting for emails
         return BrandAnalysisResponse(
             message="Thank you! We'll send your brand analysis report to your email within 24-48 hours.",
             email=request.email,
-            brand_url=request.brand_url
+            brand_url=request.brand_url,
+            job_id=job_id
         )
 
     except HTTPException:
@@ -731,6 +1213,15 @@ async def startup_event():
         print("\n✅ Configuration validated\n")
     except ValueError as e:
         print(f"\n❌ Configuration error: {e}\n")
+    
+    # Open the shared outbound HTTP pool (homepage fetches)
+    await http_client.start()
+    
+    # Start the in-process job worker (separate workers: python -m backend.worker)
+    global embedded_worker, embedded_worker_task
+    if config.JOB_EMBEDDED_WORKER:
+        embedded_worker = JobWorker(job_queue, analysis_service, history_store)
+        embedded_worker_task = asyncio.create_task(embedded_worker.run())
 
 
 # Shutdown event
@@ -738,6 +1229,12 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown"""
     print(f"👋 Shutting down {config.APP_NAME}")
+    if embedded_worker is not None:
+        embedded_worker.stop()
+        await embedded_worker_task
+    await http_client.close()
+    await llm_service.close()
+    history_store.close()
 
 
 if __name__ == "__main__":
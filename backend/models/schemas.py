@@ -3,8 +3,8 @@ Pydantic schemas for request/response validation
 """
 
 from pydantic import BaseModel, HttpUrl
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import List, Optional, Dict, Union
+from datetime import date, datetime
 
 
 class URLRequest(BaseModel):
@@ -12,13 +12,21 @@ class URLRequest(BaseModel):
     url: str
     queries: Optional[List[str]] = None
     custom_keywords: Optional[List[str]] = None
+    models: Optional[List[str]] = None  # e.g. ["gpt-4o-mini", "perplexity:sonar"]; default model if omitted
+    deadline_ms: Optional[int] = None  # Latency budget; queries still running when it expires are dropped
+    competitors: Optional[List[str]] = None  # For share of voice; read from the competitors query's answers if omitted
+    brand_aliases: Optional[List[str]] = None  # Other names that count as mentions of the brand
     
     class Config:
         json_schema_extra = {
             "example": {
                 "url": "https://www.slack.com",
                 "queries": None,
-                "custom_keywords": ["security", "integrations"]
+                "custom_keywords": ["security", "integrations"],
+                "models": None,
+                "deadline_ms": 15000,
+                "competitors": ["Microsoft Teams", "Discord"],
+                "brand_aliases": ["Slack Technologies"]
             }
         }
 
@@ -50,6 +58,12 @@ class QueryAnalysis(BaseModel):
     query: str
     response: str
     sentiment_analysis: SentimentResult
+    cached: bool = False  # True if the response was served from the completion cache
+    model: Optional[str] = None  # Model id that produced the response
+    citations: Optional[int] = None  # Brand occurrences in the response
+    term_counts: Optional[Dict[str, int]] = None  # Lexicon keywords counted for the sentiment (for re-scoring)
+    lexicon_version: Optional[str] = None  # Sentiment lexicon version the response was scored with
+    response_hash: Optional[str] = None  # Content hash of the response text (set on analyses read from history)
     
     class Config:
         json_schema_extra = {
@@ -63,7 +77,9 @@ class QueryAnalysis(BaseModel):
                     "position": 0,
                     "positive_indicators": 5,
                     "negative_indicators": 1
-                }
+                },
+                "cached": False,
+                "citations": 2
             }
         }
 
@@ -74,7 +90,8 @@ class UsageMetrics(BaseModel):
     total_tokens: int
     prompt_tokens: int
     completion_tokens: int
-    estimated_cost: float  # Estimated cost in USD
+    estimated_cost: float  # Estimated cost in USD (only calls actually sent to the API)
+    cached_queries: int = 0  # Number of queries served from the completion cache
     
     class Config:
         json_schema_extra = {
@@ -83,7 +100,8 @@ class UsageMetrics(BaseModel):
                 "total_tokens": 2500,
                 "prompt_tokens": 500,
                 "completion_tokens": 2000,
-                "estimated_cost": 0.001
+                "estimated_cost": 0.001,
+                "cached_queries": 2
             }
         }
 
@@ -116,6 +134,99 @@ class SummaryMetrics(BaseModel):
         }
 
 
+class DroppedQuery(BaseModel):
+    """Schema for a query cancelled because the analysis ran out of time"""
+    index: int  # Position the query would have had in the analysis list
+    query: str
+    model: Optional[str] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "index": 3,
+                "query": "What are the alternatives to Slack?",
+                "model": "gpt-4o-mini"
+            }
+        }
+
+
+class ModelAnalysisSummary(BaseModel):
+    """Schema for the metrics of one model in a cross-model analysis"""
+    model: str
+    summary: SummaryMetrics
+    usage: UsageMetrics
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "model": "gpt-4o-mini",
+                "summary": {
+                    "total_queries": 5,
+                    "mentions_count": 4,
+                    "citations": 6,
+                    "visibility": 80.0,
+                    "positive": 3,
+                    "negative": 0,
+                    "neutral": 1,
+                    "overall_sentiment": "POSITIVE",
+                    "average_confidence": 0.85
+                },
+                "usage": {
+                    "model": "gpt-4o-mini",
+                    "total_tokens": 2500,
+                    "prompt_tokens": 500,
+                    "completion_tokens": 2000,
+                    "estimated_cost": 0.001
+                }
+            }
+        }
+
+
+class BrandVoice(BaseModel):
+    """Schema for one brand's presence across the analyzed responses"""
+    name: str
+    mentions: int  # Occurrences of the brand or its aliases across all responses
+    responses_mentioned: int
+    share_of_voice: float  # Percentage of all tracked-brand mentions
+    average_rank: Optional[float] = None  # Mean mention order (1 = named first) where mentioned
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Slack",
+                "mentions": 12,
+                "responses_mentioned": 5,
+                "share_of_voice": 48.0,
+                "average_rank": 1.2
+            }
+        }
+
+
+class ShareOfVoiceMetrics(BaseModel):
+    """Schema for the brand's share of voice against its competitors"""
+    brand: str
+    share_of_voice: float  # Brand mentions as a percentage of all tracked-brand mentions
+    average_rank: Optional[float] = None  # Mean mention order of the brand where mentioned
+    first_mention_rate: float  # Percentage of responses naming any tracked brand that name this one first
+    competitors_source: str  # "request" or "responses" (read from the competitors query's answers)
+    brands: List[BrandVoice]  # Brand and competitors, most mentioned first
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "brand": "Slack",
+                "share_of_voice": 48.0,
+                "average_rank": 1.2,
+                "first_mention_rate": 80.0,
+                "competitors_source": "responses",
+                "brands": [
+                    {"name": "Slack", "mentions": 12, "responses_mentioned": 5, "share_of_voice": 48.0, "average_rank": 1.2},
+                    {"name": "Microsoft Teams", "mentions": 8, "responses_mentioned": 4, "share_of_voice": 32.0, "average_rank": 1.8}
+                ]
+            }
+        }
+
+
 class AnalysisResponse(BaseModel):
     """Schema for complete analysis response"""
     brand_name: str
@@ -125,8 +236,13 @@ class AnalysisResponse(BaseModel):
     analysis: List[QueryAnalysis]
     summary: SummaryMetrics
     usage: Optional[UsageMetrics] = None  # API usage metrics
+    model_results: Optional[List[ModelAnalysisSummary]] = None  # Per-model breakdown when several models ran
+    partial: bool = False  # True if the deadline expired before every query finished
+    dropped_queries: Optional[List[DroppedQuery]] = None  # Queries cancelled by the deadline
+    share_of_voice: Optional[ShareOfVoiceMetrics] = None  # Set when competitors are known
     
     class Config:
+        protected_namespaces = ()  # allow the model_results field
         json_schema_extra = {
             "example": {
                 "brand_name": "Slack",
@@ -155,6 +271,94 @@ class AnalysisResponse(BaseModel):
         }
 
 
+class BatchAnalysisRequest(BaseModel):
+    """Schema for analyzing many brands at once"""
+    urls: List[str]
+    queries: Optional[List[str]] = None  # Shared by every brand; generated per brand if omitted
+    custom_keywords: Optional[List[str]] = None
+    models: Optional[List[str]] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "urls": ["https://www.slack.com", "https://www.notion.so", "https://slack.com/pricing"],
+                "queries": None,
+                "custom_keywords": ["security"],
+                "models": None
+            }
+        }
+
+
+class BatchAnalysisError(BaseModel):
+    """Schema for a brand that could not be analyzed in a batch"""
+    url: str
+    detail: str
+
+
+class BatchAnalysisResult(BaseModel):
+    """Schema for the result of a queued batch analysis"""
+    brands_requested: int
+    duplicates: List[str]  # URLs skipped because an earlier URL had the same brand
+    results: List[AnalysisResponse]
+    errors: List[BatchAnalysisError]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "brands_requested": 2,
+                "duplicates": ["https://slack.com/pricing"],
+                "results": [],
+                "errors": [{"url": "https://www.notion.so", "detail": "Rate limited"}]
+            }
+        }
+
+
+class JobSubmitResponse(BaseModel):
+    """Schema for a queued background analysis"""
+    job_id: str
+    status: str  # queued, running, completed, failed
+    status_url: str
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "3f2a9c0e8b7d4e1f9a6b5c4d3e2f1a0b",
+                "status": "queued",
+                "status_url": "/api/jobs/3f2a9c0e8b7d4e1f9a6b5c4d3e2f1a0b"
+            }
+        }
+
+
+class JobStatusResponse(BaseModel):
+    """Schema for background job status"""
+    job_id: str
+    kind: str
+    status: str  # queued, running, completed, failed
+    progress: int  # Queries (or, for batches, brands) completed so far
+    total: int  # Total queries/brands in the job (0 until the job starts)
+    attempts: int
+    created_at: datetime
+    updated_at: datetime
+    error: Optional[str] = None
+    result: Optional[Union[AnalysisResponse, BatchAnalysisResult]] = None  # Set once status is "completed"
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "3f2a9c0e8b7d4e1f9a6b5c4d3e2f1a0b",
+                "kind": "brand_analysis",
+                "status": "running",
+                "progress": 3,
+                "total": 5,
+                "attempts": 1,
+                "created_at": "2025-10-10T12:00:00",
+                "updated_at": "2025-10-10T12:00:04",
+                "error": None,
+                "result": None
+            }
+        }
+
+
 class HealthResponse(BaseModel):
     """Schema for health check response"""
     status: str
@@ -174,13 +378,127 @@ class HealthResponse(BaseModel):
 class HistoryResponse(BaseModel):
     """Schema for history response"""
     analyses: List[AnalysisResponse]
-    total_count: int
+    total_count: int  # Analyses matching the filters, across all pages
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
 
     class Config:
         json_schema_extra = {
             "example": {
                 "analyses": [],
-                "total_count": 0
+                "total_count": 0,
+                "next_cursor": None
+            }
+        }
+
+
+class HistorySummary(BaseModel):
+    """Schema for one stored analysis without its queries and responses"""
+    id: int
+    brand_name: str
+    url: str
+    timestamp: datetime
+    queries_analyzed: int
+    summary: SummaryMetrics
+    usage: Optional[UsageMetrics] = None
+    partial: bool = False
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 42,
+                "brand_name": "Slack",
+                "url": "https://slack.com",
+                "timestamp": "2024-01-15T10:30:00",
+                "queries_analyzed": 5,
+                "summary": {
+                    "total_queries": 5,
+                    "mentions_count": 5,
+                    "citations": 8,
+                    "visibility": 100.0,
+                    "positive": 4,
+                    "negative": 0,
+                    "neutral": 1,
+                    "overall_sentiment": "POSITIVE",
+                    "average_confidence": 0.89
+                },
+                "usage": {
+                    "model": "gpt-4o-mini",
+                    "total_tokens": 2500,
+                    "prompt_tokens": 500,
+                    "completion_tokens": 2000,
+                    "estimated_cost": 0.001
+                },
+                "partial": False
+            }
+        }
+
+
+class HistorySummaryResponse(BaseModel):
+    """Schema for a page of history summaries"""
+    items: List[HistorySummary]
+    total_count: int
+    next_cursor: Optional[str] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [],
+                "total_count": 0,
+                "next_cursor": None
+            }
+        }
+
+
+class DailyTrend(BaseModel):
+    """Schema for one day of a brand's visibility and sentiment trend"""
+    day: date
+    runs: int  # Analyses stored that day
+    queries: int
+    mentions: int
+    citations: int
+    visibility: float  # Percentage of queries where the brand was mentioned
+    positive: int
+    negative: int
+    neutral: int
+    net_sentiment: float  # (positive - negative) / sentiment-bearing responses, from -1 to 1
+    average_confidence: float  # Over responses mentioning the brand
+    total_tokens: int
+    estimated_cost: float
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "day": "2024-01-15",
+                "runs": 4,
+                "queries": 20,
+                "mentions": 17,
+                "citations": 31,
+                "visibility": 85.0,
+                "positive": 12,
+                "negative": 2,
+                "neutral": 3,
+                "net_sentiment": 0.59,
+                "average_confidence": 0.84,
+                "total_tokens": 10400,
+                "estimated_cost": 0.0042
+            }
+        }
+
+
+class TrendsResponse(BaseModel):
+    """Schema for daily trends read from the history rollups"""
+    brand: Optional[str] = None  # None when all brands are combined
+    since: date
+    until: date
+    days: List[DailyTrend]  # Oldest first; days without analyses are left out
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "brand": "Slack",
+                "since": "2024-01-01",
+                "until": "2024-01-30",
+                "days": []
             }
         }
 
@@ -191,6 +509,7 @@ class WaitlistRequest(BaseModel):
     brand_url: str
     custom_queries: Optional[List[str]] = None
     custom_keywords: Optional[List[str]] = None
+    deadline_ms: Optional[int] = None  # Preview latency budget (capped by WAITLIST_PREVIEW_DEADLINE_MS)
 
     class Config:
         json_schema_extra = {
@@ -219,6 +538,7 @@ class PreviewData(BaseModel):
     sample_query: Optional[str] = None
     sample_response: Optional[str] = None
     citation_urls: Optional[List[CitationURL]] = None  # List of queries with mention status
+    dropped_queries: Optional[List[str]] = None  # Queries cut off by the preview deadline
 
     class Config:
         json_schema_extra = {
@@ -316,6 +636,7 @@ class BrandAnalysisResponse(BaseModel):
     message: str
     email: str
     brand_url: str
+    job_id: Optional[str] = None  # Background analysis job queued for this request
 
     class Config:
         json_schema_extra = {
@@ -0,0 +1,447 @@
+"""
+VISIBI - Bulk Re-scoring
+Re-scores stored analyses against the current sentiment lexicon on every core
+
+Analyses are read from the history database or an export (NDJSON, one
+AnalysisResponse per line, or a JSON list / {"analyses": [...]}), re-scored
+in chunks on a process pool and written back (history) or out as NDJSON in
+input order (exports). Progress is checkpointed after every
+chunk, so an interrupted run picks up where it stopped when started again
+with the same arguments.
+
+Usage:
+    python -m backend.rescore --history                     # the history database, in place
+    python -m backend.rescore analyses.ndjson -o rescored.ndjson
+    python -m backend.rescore analyses.ndjson --in-place --workers 8
+    python -m backend.rescore analyses.ndjson -o out.ndjson --full    # rescan every response
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import config
+from backend.models.schemas import AnalysisResponse
+from backend.services.analysis_service import AnalysisService
+from backend.services.history_store import HistoryStore
+from backend.services.lexicon import Lexicon, LexiconRegistry
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+
+# Set in each pool process by _init_worker
+_service: Optional[AnalysisService] = None
+_full = False
+
+
+def _build_service(lexicon: Dict, mention_window: Optional[int]) -> AnalysisService:
+    """An AnalysisService that only scores, pinned to one lexicon version"""
+    registry = LexiconRegistry(
+        archive_dir=str(config.DATA_DIR / "lexicons"),
+        lexicon=Lexicon.from_dict(lexicon)
+    )
+    return AnalysisService(None, SentimentAnalyzer(mention_window=mention_window, lexicon=registry), None)
+
+
+def _init_worker(lexicon: Dict, mention_window: Optional[int], full: bool):
+    global _service, _full
+    _service = _build_service(lexicon, mention_window)
+    _full = full
+
+
+def rescore_chunk(lines: List[str]) -> Tuple[List[str], int]:
+    """
+    Re-score a chunk of serialized analyses (runs in a pool process)
+
+    Returns:
+        Tuple of (re-scored analyses as JSON lines, responses scanned)
+    """
+    out = []
+    scanned = 0
+    for line in lines:
+        updated, n = _service.rescore_analysis(AnalysisResponse.model_validate_json(line), full=_full)
+        out.append(updated.model_dump_json())
+        scanned += n
+    return out, scanned
+
+
+class _JSONReader:
+    """Buffered reads of a text file, decoded one JSON value at a time"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping what has been consumed; returns whether there was more"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """The next non-whitespace character ("" at the end of the file)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def skip(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON input")
+        self.pos += 1
+
+    def raw(self) -> Tuple[object, str]:
+        """Decode the next value; returns it and its source text"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number running into the end of the buffer may go on in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            text = self.buffer[self.pos:end]
+            self.pos = end
+            return value, text
+
+    def items(self) -> Iterator[str]:
+        """Yield the source text of each element of the list being read, through its closing ]"""
+        while True:
+            char = self.peek()
+            if char == "]":
+                self.pos += 1
+                return
+            if char == ",":
+                self.pos += 1
+                continue
+            if not char:
+                raise ValueError("JSON input ends inside the list of analyses")
+            yield self.raw()[1]
+
+
+def iter_analyses(path: str, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """
+    Yield each stored analysis in an export as one JSON string
+
+    NDJSON is read a line at a time. A JSON list or {"analyses": [...]} is
+    decoded incrementally, chunk_size characters at a time, so neither
+    format is held in memory whole.
+    """
+    with open(path, encoding="utf-8") as f:
+        reader = _JSONReader(f, chunk_size)
+        first = reader.peek()
+        if first == "[":
+            reader.skip("[")
+            yield from reader.items()
+            return
+        if not first:
+            return
+
+        # {"analyses": [...]}, or the first record of an NDJSON file: walk its keys
+        reader.skip("{")
+        while reader.peek() not in ("}", ""):
+            if reader.peek() == ",":
+                reader.skip(",")
+                continue
+            key, _ = reader.raw()
+            reader.skip(":")
+            if key == "analyses" and reader.peek() == "[":
+                reader.skip("[")
+                yield from reader.items()
+                return
+            reader.raw()
+
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield line.strip()
+
+
+def chunked(items: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Checkpoint:
+    """
+    Progress of one run, saved after every chunk
+
+    position is where the finished analyses end: the output file size for
+    file runs, the last record id for history runs. A checkpoint is only
+    resumed by a run with the same identity (source, destination, lexicon,
+    full or incremental).
+    """
+
+    def __init__(self, path: str, **identity):
+        self.path = path
+        self.identity = identity
+        self.state = {**identity, "analyses_done": 0, "position": 0, "scanned": 0}
+
+    def load(self) -> bool:
+        """Resume from an earlier checkpoint of the same run; returns whether one was found"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if any(saved.get(k) != v for k, v in self.identity.items()):
+            print(f"⚠️  Ignoring checkpoint {self.path}: it belongs to a different run")
+            return False
+        self.state.update(saved)
+        return True
+
+    def advance(self, analyses: int, position: int, scanned: int):
+        self.state["analyses_done"] += analyses
+        self.state["position"] = position
+        self.state["scanned"] += scanned
+        self.save()
+        print(f"   {self.state['analyses_done']} analyses re-scored")
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def rescore_chunks(
+    chunks: Iterator[Tuple[object, List[str]]],
+    workers: int,
+    lexicon: Lexicon,
+    mention_window: Optional[int],
+    full: bool
+) -> Iterator[Tuple[object, List[str], int]]:
+    """
+    Re-score (key, serialized analyses) chunks on a process pool
+
+    Yields (key, re-scored analyses, responses scanned) in input order.
+    At most 2 * workers chunks are in flight, so the source is never read
+    far ahead of the consumer. workers=0 runs everything in this process.
+    """
+    initargs = (lexicon.to_dict(), mention_window, full)
+    if workers == 0:
+        _init_worker(*initargs)
+        for key, lines in chunks:
+            yield (key, *rescore_chunk(lines))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        for key, lines in chunks:
+            pending.append((key, pool.submit(rescore_chunk, lines)))
+            if len(pending) >= workers * 2:
+                key, future = pending.popleft()
+                yield (key, *future.result())
+        while pending:
+            key, future = pending.popleft()
+            yield (key, *future.result())
+
+
+def _stats(checkpoint: Checkpoint, done_before: int, resumed: bool, lexicon: Lexicon, started: float) -> Dict:
+    return {
+        "analyses": checkpoint.state["analyses_done"],
+        "rescored": checkpoint.state["analyses_done"] - done_before,
+        "scanned": checkpoint.state["scanned"],
+        "lexicon_version": lexicon.version,
+        "resumed": resumed,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+
+def run(
+    input_path: str,
+    output_path: str,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    checkpoint_path: Optional[str] = None,
+    full: bool = False,
+    lexicon: Optional[Lexicon] = None,
+    mention_window: Optional[int] = None
+) -> Dict:
+    """
+    Re-score every analysis in input_path and write them to output_path
+
+    Args:
+        input_path: Exported analyses (NDJSON or JSON)
+        output_path: Where the re-scored analyses are written (NDJSON)
+        workers: Pool processes (defaults to the CPU count; 0 = run in this process)
+        chunk_size: Analyses per task sent to a pool process
+        checkpoint_path: Progress file (defaults to <output_path>.checkpoint)
+        full: Rescan every response instead of re-scoring incrementally
+        lexicon: Lexicon to score with (defaults to the configured current one)
+        mention_window: Sentiment window (defaults to SENTIMENT_MENTION_WINDOW)
+
+    Returns:
+        Run statistics
+    """
+    lexicon = lexicon or SentimentAnalyzer().lexicon
+    if workers is None:
+        workers = os.cpu_count() or 1
+    checkpoint = Checkpoint(
+        checkpoint_path or f"{output_path}.checkpoint",
+        input=os.path.abspath(input_path),
+        output=os.path.abspath(output_path),
+        lexicon_version=lexicon.version,
+        full=full
+    )
+    resumed = checkpoint.load() and os.path.exists(output_path)
+    if not resumed:
+        checkpoint.state.update(analyses_done=0, position=0, scanned=0)
+    done = checkpoint.state["analyses_done"]
+    if resumed:
+        print(f"↩️  Resuming after {done} analyses")
+
+    analyses = iter_analyses(input_path)
+    for _ in islice(analyses, done):
+        pass
+    chunks = ((None, chunk) for chunk in chunked(analyses, chunk_size))
+
+    started = time.perf_counter()
+    with open(output_path, "r+b" if resumed else "wb") as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(checkpoint.state["position"])
+        out.seek(checkpoint.state["position"])
+        for _, lines, scanned in rescore_chunks(chunks, workers, lexicon, mention_window, full):
+            out.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.advance(len(lines), out.tell(), scanned)
+
+    stats = _stats(checkpoint, done, resumed, lexicon, started)
+    checkpoint.remove()
+    return stats
+
+
+def run_history(
+    store: HistoryStore,
+    workers: Optional[int] = None,
+    chunk_size: int = 200,
+    checkpoint_path: Optional[str] = None,
+    full: bool = False,
+    lexicon: Optional[Lexicon] = None,
+    mention_window: Optional[int] = None
+) -> Dict:
+    """
+    Re-score every analysis in the history store, updating the records in place
+
+    Records are read in id order a chunk at a time, so memory use does not
+    grow with the history; the checkpoint keeps the last id written back.
+    Arguments are as for run (checkpoint defaults to <db path>.rescore.checkpoint).
+    """
+    lexicon = lexicon or SentimentAnalyzer().lexicon
+    if workers is None:
+        workers = os.cpu_count() or 1
+    checkpoint = Checkpoint(
+        checkpoint_path or f"{store.db_path}.rescore.checkpoint",
+        history=os.path.abspath(store.db_path),
+        lexicon_version=lexicon.version,
+        full=full
+    )
+    resumed = checkpoint.load()
+    done = checkpoint.state["analyses_done"]
+    if resumed:
+        print(f"↩️  Resuming after {done} analyses (record {checkpoint.state['position']})")
+
+    chunks = (
+        ([record_id for record_id, _ in chunk], [data for _, data in chunk])
+        for chunk in chunked(store.iter_records(chunk_size, after_id=checkpoint.state["position"]), chunk_size)
+    )
+
+    started = time.perf_counter()
+    for ids, lines, scanned in rescore_chunks(chunks, workers, lexicon, mention_window, full):
+        store.update_many(zip(ids, lines))
+        checkpoint.advance(len(lines), ids[-1], scanned)
+
+    stats = _stats(checkpoint, done, resumed, lexicon, started)
+    checkpoint.remove()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored VISIBI analyses against the current sentiment lexicon")
+    parser.add_argument("input", nargs="?", help="Exported analyses (NDJSON, or a JSON list)")
+    parser.add_argument("--history", action="store_true", help="Re-score the history database (HISTORY_DB_PATH) in place")
+    parser.add_argument("-o", "--output", help="Output NDJSON file")
+    parser.add_argument("--in-place", action="store_true", help="Replace the input file when done")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Pool processes (default: one per CPU; 0 runs in this process)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=200, help="Analyses per pool task (default: 200)")
+    parser.add_argument("--checkpoint", help="Progress file (default: next to the output)")
+    parser.add_argument("--full", action="store_true", help="Rescan every response instead of only changed terms")
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers is not None else os.cpu_count()
+    if args.history:
+        store = HistoryStore(config.HISTORY_DB_PATH)
+        print(f"🔁 Re-scoring history in {config.HISTORY_DB_PATH} with {workers} worker(s)")
+        try:
+            stats = run_history(
+                store,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                checkpoint_path=args.checkpoint,
+                full=args.full
+            )
+        finally:
+            store.close()
+        print(f"✅ {stats['analyses']} analyses at lexicon {stats['lexicon_version']} "
+              f"({stats['scanned']} responses scanned, {stats['seconds']}s)")
+        return
+
+    if not args.input:
+        parser.error("an input file or --history is required")
+    if not args.output and not args.in_place:
+        parser.error("either --output or --in-place is required")
+    output = args.output or f"{args.input}.rescoring"
+
+    print(f"🔁 Re-scoring {args.input} with {workers} worker(s)")
+    stats = run(
+        args.input,
+        output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        full=args.full
+    )
+    if args.in_place:
+        os.replace(output, args.input)
+        output = args.input
+
+    print(f"✅ {stats['analyses']} analyses at lexicon {stats['lexicon_version']} written to {output} "
+          f"({stats['scanned']} responses scanned, {stats['seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,520 @@
+"""
+Analysis Service
+Runs the brand analysis pipeline: queries -> LLM(s) -> sentiment -> metrics
+"""
+
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from backend.config import config
+from backend.services.llm_service import LLMError
+from backend.services.politeness import PolitenessScheduler
+from backend.services.share_of_voice import ShareOfVoiceAnalyzer, extract_competitors
+from backend.models.schemas import (
+    AnalysisResponse,
+    DroppedQuery,
+    ModelAnalysisSummary,
+    QueryAnalysis,
+    SentimentResult,
+    ShareOfVoiceMetrics,
+    SummaryMetrics,
+    UsageMetrics
+)
+
+# Fallback pricing (gpt-4o-mini: $0.150/1M input tokens, $0.600/1M output tokens)
+# for usage that doesn't name its model
+PROMPT_COST_PER_MILLION = 0.150
+COMPLETION_COST_PER_MILLION = 0.600
+
+
+class AnalysisService:
+    """Service for running brand analyses on top of the LLM and sentiment services"""
+
+    def __init__(self, brand_analyzer, sentiment_analyzer, llm_service):
+        """
+        Initialize analysis service
+
+        Args:
+            brand_analyzer: BrandAnalyzer instance
+            sentiment_analyzer: SentimentAnalyzer instance
+            llm_service: LLMService instance
+        """
+        self.brand_analyzer = brand_analyzer
+        self.sentiment_analyzer = sentiment_analyzer
+        self.llm_service = llm_service
+        self.share_of_voice_analyzer = ShareOfVoiceAnalyzer()
+
+    def resolve_queries(
+        self,
+        brand_name: str,
+        queries: Optional[List[str]] = None,
+        custom_keywords: Optional[List[str]] = None
+    ) -> List[str]:
+        """Use provided queries, or generate monitoring queries for the brand"""
+        if queries:
+            return queries
+        return self.brand_analyzer.generate_monitoring_queries(
+            brand_name,
+            custom_keywords=custom_keywords
+        )
+
+    def resolve_models(self, models: Optional[List[str]] = None) -> List[str]:
+        """
+        Validate requested model ids, defaulting to the service's default model
+
+        Raises:
+            LLMError: If a model's provider is unknown or not configured
+        """
+        model_ids = []
+        for model in models or [self.llm_service.model]:
+            _, _, model_id = self.llm_service.resolve_model(model)
+            if not self.llm_service.is_model_available(model_id):
+                raise LLMError(f"Model '{model_id}' is not available (provider not configured)")
+            if model_id not in model_ids:
+                model_ids.append(model_id)
+        return model_ids
+
+    async def fetch_brand_info(self, url: str, deadline: Optional[float] = None) -> Dict:
+        """
+        Fetch brand info, giving up on the homepage once the deadline passes
+
+        Args:
+            url: Brand URL
+            deadline: Optional event-loop time by which the fetch must finish
+
+        Returns:
+            Brand info dictionary (domain-derived name only if the fetch timed out)
+        """
+        if deadline is None:
+            return await self.brand_analyzer.fetch_brand_info(url)
+        remaining = deadline - asyncio.get_running_loop().time()
+        try:
+            return await asyncio.wait_for(self.brand_analyzer.fetch_brand_info(url), timeout=max(0.0, remaining))
+        except asyncio.TimeoutError:
+            print(f"⏱️  Skipping homepage fetch for {url}: deadline reached")
+            return {
+                "brand_name": self.brand_analyzer.extract_brand_name(url),
+                "url": url,
+                "description": None
+            }
+
+    async def analyze_query(
+        self,
+        query: str,
+        brand_name: str,
+        model: Optional[str] = None
+    ) -> Tuple[QueryAnalysis, Dict[str, int]]:
+        """
+        Send one query to an LLM and analyze the sentiment of its response
+
+        Returns:
+            Tuple of (QueryAnalysis, usage_data)
+        """
+        response, usage_data = await self.llm_service.complete(query, model=model)
+        # One scan gives sentiment, position and citations
+        response_analysis = self.sentiment_analyzer.analyze_response(response, brand_name)
+
+        query_result = QueryAnalysis(
+            query=query,
+            response=response,
+            sentiment_analysis=SentimentResult(**response_analysis.sentiment()),
+            cached=usage_data.get("cached", False),
+            model=usage_data.get("model"),
+            citations=response_analysis.citations,
+            term_counts=response_analysis.term_counts(),
+            lexicon_version=response_analysis.lexicon_version
+        )
+        return query_result, usage_data
+
+    async def iter_query_analyses(
+        self,
+        queries: List[str],
+        brand_name: str,
+        models: Optional[List[str]] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[int, QueryAnalysis, Dict[str, int]]]:
+        """
+        Run all queries against all models concurrently and yield each result
+        as soon as it completes
+
+        Results are indexed model-major: with n queries, index m * n + i is
+        query i on models[m]. With a single model the index is the query index.
+
+        Args:
+            queries: Queries to run
+            brand_name: Brand to analyze sentiment for
+            models: Optional model ids (default model if omitted)
+            deadline: Optional event-loop time; when it passes the remaining
+                calls are cancelled and asyncio.TimeoutError is raised
+
+        Yields:
+            Tuples of (result_index, QueryAnalysis, usage_data) in completion order
+        """
+        async def run(index: int, query: str, model: Optional[str]):
+            query_result, usage_data = await self.analyze_query(query, brand_name, model=model)
+            return index, query_result, usage_data
+
+        models = models or [None]
+        tasks = [
+            asyncio.ensure_future(run(m * len(queries) + i, query, model))
+            for m, model in enumerate(models)
+            for i, query in enumerate(queries)
+        ]
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+        try:
+            for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                yield await next_done
+        finally:
+            # Consumer stopped early or a query failed: cancel the stragglers
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def build_summary(
+        self,
+        analysis_results: List[QueryAnalysis],
+        brand_name: str,
+        total_queries: Optional[int] = None
+    ) -> SummaryMetrics:
+        """Calculate summary metrics over a set of query analyses"""
+        total_queries = len(analysis_results) if total_queries is None else total_queries
+        mentions_count = sum(1 for a in analysis_results if a.sentiment_analysis.mentioned)
+
+        # Calculate total citations (total occurrences of brand across all responses)
+        citations_count = sum(
+            a.citations if a.citations is not None
+            else self.sentiment_analyzer.count_brand_occurrences(a.response, brand_name)
+            for a in analysis_results
+        )
+
+        positive_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "POSITIVE")
+        negative_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "NEGATIVE")
+        neutral_count = sum(1 for a in analysis_results if a.sentiment_analysis.sentiment == "NEUTRAL")
+
+        # Determine overall sentiment
+        overall_sentiment = "POSITIVE" if positive_count > negative_count else \
+                          "NEGATIVE" if negative_count > positive_count else "NEUTRAL"
+
+        # Calculate average confidence
+        mentioned_analyses = [a for a in analysis_results if a.sentiment_analysis.mentioned]
+        avg_confidence = (
+            sum(a.sentiment_analysis.confidence for a in mentioned_analyses) / len(mentioned_analyses)
+            if mentioned_analyses else 0.0
+        )
+
+        return SummaryMetrics(
+            total_queries=total_queries,
+            mentions_count=mentions_count,
+            citations=citations_count,
+            visibility=(mentions_count / total_queries) * 100 if total_queries else 0,
+            positive=positive_count,
+            negative=negative_count,
+            neutral=neutral_count,
+            overall_sentiment=overall_sentiment,
+            average_confidence=round(avg_confidence, 2)
+        )
+
+    def estimate_cost(self, usage_data: Dict[str, int]) -> float:
+        """Estimated USD cost of one completion, using its model's pricing"""
+        prompt_price, completion_price = PROMPT_COST_PER_MILLION, COMPLETION_COST_PER_MILLION
+        if usage_data.get("model"):
+            try:
+                prompt_price, completion_price = self.llm_service.get_pricing(usage_data["model"])
+            except LLMError:
+                pass
+        return (
+            (usage_data["prompt_tokens"] / 1_000_000) * prompt_price +
+            (usage_data["completion_tokens"] / 1_000_000) * completion_price
+        )
+
+    def build_usage(self, usages: List[Dict[str, int]]) -> UsageMetrics:
+        """
+        Aggregate token usage and estimate cost
+
+        Cached and coalesced completions still report their original token
+        counts, but only calls this analysis actually sent to the API
+        contribute to the estimated cost.
+        """
+        total_prompt_tokens = sum(u["prompt_tokens"] for u in usages)
+        total_completion_tokens = sum(u["completion_tokens"] for u in usages)
+        billed = [u for u in usages if not u.get("cached") and not u.get("coalesced")]
+        estimated_cost = sum(self.estimate_cost(u) for u in billed)
+
+        models = sorted({u["model"] for u in usages if u.get("model")})
+
+        return UsageMetrics(
+            model=",".join(models) or self.llm_service.model or config.OPENAI_MODEL,
+            total_tokens=total_prompt_tokens + total_completion_tokens,
+            prompt_tokens=total_prompt_tokens,
+            completion_tokens=total_completion_tokens,
+            estimated_cost=round(estimated_cost, 6),
+            cached_queries=sum(1 for u in usages if u.get("cached"))
+        )
+
+    def dedupe_urls(self, urls: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Drop URLs whose brand was already seen earlier in the list
+
+        Returns:
+            Tuple of (unique_urls, duplicate_urls), both in input order
+        """
+        urls = [url.strip() for url in urls if url.strip()]
+        brand_names = self.brand_analyzer.map_brand_names(urls)
+        seen = set()
+        unique, duplicates = [], []
+        for url, brand_name in zip(urls, brand_names):
+            brand_key = brand_name.casefold()
+            if brand_key in seen:
+                duplicates.append(url)
+            else:
+                seen.add(brand_key)
+                unique.append(url)
+        return unique, duplicates
+
+    async def iter_batch(
+        self,
+        urls: List[str],
+        queries: Optional[List[str]] = None,
+        custom_keywords: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        scheduler: Optional[PolitenessScheduler] = None
+    ) -> AsyncIterator[Tuple[int, str, Optional[AnalysisResponse], Optional[str]]]:
+        """
+        Analyze many brands concurrently and yield each as soon as it completes
+
+        Homepage fetches go through a per-host politeness scheduler; the LLM
+        calls of every brand share the LLM service's bounded pool, and at
+        most BATCH_MAX_CONCURRENT_BRANDS brands are in progress at once. A
+        failing brand is reported and doesn't stop the batch.
+
+        Yields:
+            Tuples of (url_index, url, AnalysisResponse or None, error detail or None)
+            in completion order
+        """
+        scheduler = scheduler or PolitenessScheduler(config.BATCH_HOST_MIN_INTERVAL_SECONDS)
+        brand_slots = asyncio.Semaphore(max(1, config.BATCH_MAX_CONCURRENT_BRANDS))
+
+        async def run(index: int, url: str):
+            async with brand_slots:
+                try:
+                    # Warm the brand info cache politely; analyze() then reads it
+                    async with scheduler.slot(url):
+                        await self.brand_analyzer.fetch_brand_info(url)
+                    analysis_response = await self.analyze(
+                        url,
+                        queries=queries,
+                        custom_keywords=custom_keywords,
+                        models=models
+                    )
+                except Exception as e:
+                    print(f"❌ Batch analysis of {url} failed: {e}")
+                    return index, url, None, str(e) or type(e).__name__
+                return index, url, analysis_response, None
+
+        tasks = [asyncio.ensure_future(run(i, url)) for i, url in enumerate(urls)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def analyze(
+        self,
+        url: str,
+        queries: Optional[List[str]] = None,
+        custom_keywords: Optional[List[str]] = None,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        models: Optional[List[str]] = None,
+        deadline_ms: Optional[int] = None,
+        competitors: Optional[List[str]] = None,
+        brand_aliases: Optional[List[str]] = None
+    ) -> AnalysisResponse:
+        """
+        Run a full brand analysis
+
+        Args:
+            url: Brand URL
+            queries: Optional explicit queries
+            custom_keywords: Optional keywords used to generate queries
+            on_progress: Optional async callback(done, total) awaited as queries finish
+            models: Optional model ids to fan every query out to (default model if omitted)
+            deadline_ms: Optional latency budget. Queries still running when it
+                expires are cancelled and reported in dropped_queries; the
+                summary covers only the queries that finished
+            competitors: Optional competitor names for share of voice (read
+                from answers to the competitors query if omitted)
+            brand_aliases: Optional other names that count as brand mentions
+
+        Returns:
+            AnalysisResponse with per-query results in query order (grouped by model)
+
+        Raises:
+            LLMError: If a model is unavailable or any query fails
+        """
+        deadline = self.make_deadline(deadline_ms)
+        models = self.resolve_models(models)
+        brand_info = await self.fetch_brand_info(url, deadline)
+        brand_name = brand_info["brand_name"]
+        queries = self.resolve_queries(brand_name, queries, custom_keywords)
+
+        total = len(queries) * len(models)
+        analysis_results: List[Optional[QueryAnalysis]] = [None] * total
+        usages = []
+        if on_progress:
+            await on_progress(0, total)
+        try:
+            async for index, query_result, usage_data in self.iter_query_analyses(queries, brand_name, models, deadline):
+                analysis_results[index] = query_result
+                usages.append(usage_data)
+                if on_progress:
+                    await on_progress(len(usages), total)
+        except asyncio.TimeoutError:
+            print(f"⏱️  Deadline of {deadline_ms}ms reached for {url}: {total - len(usages)}/{total} queries dropped")
+
+        return self.build_response(
+            url, brand_name, analysis_results, usages, queries, models,
+            competitors=competitors, brand_aliases=brand_aliases
+        )
+
+    @staticmethod
+    def make_deadline(deadline_ms: Optional[int]) -> Optional[float]:
+        """Convert a latency budget in milliseconds to an absolute event-loop time"""
+        if deadline_ms is None:
+            return None
+        return asyncio.get_running_loop().time() + max(0, deadline_ms) / 1000
+
+    def build_response(
+        self,
+        url: str,
+        brand_name: str,
+        analysis_results: List[Optional[QueryAnalysis]],
+        usages: List[Dict[str, int]],
+        queries: Optional[List[str]] = None,
+        models: Optional[List[str]] = None,
+        competitors: Optional[List[str]] = None,
+        brand_aliases: Optional[List[str]] = None
+    ) -> AnalysisResponse:
+        """
+        Assemble the final AnalysisResponse from per-query results
+
+        Slots still None (queries dropped by a deadline) are left out of the
+        analysis and the metrics and listed in dropped_queries instead.
+        """
+        dropped_queries = [
+            DroppedQuery(
+                index=index,
+                query=queries[index % len(queries)] if queries else "",
+                model=models[index // len(queries)] if queries and models else None
+            )
+            for index, query_result in enumerate(analysis_results)
+            if query_result is None
+        ]
+        finished = [query_result for query_result in analysis_results if query_result is not None]
+
+        return AnalysisResponse(
+            brand_name=brand_name,
+            url=url,
+            timestamp=datetime.now(),
+            queries_analyzed=len(finished),
+            analysis=finished,
+            summary=self.build_summary(finished, brand_name),
+            usage=self.build_usage(usages),
+            model_results=self.build_model_results(finished, brand_name, usages),
+            partial=bool(dropped_queries),
+            dropped_queries=dropped_queries or None,
+            share_of_voice=self.build_share_of_voice(finished, brand_name, competitors, brand_aliases)
+        )
+
+    def build_share_of_voice(
+        self,
+        analysis_results: List[QueryAnalysis],
+        brand_name: str,
+        competitors: Optional[List[str]] = None,
+        brand_aliases: Optional[List[str]] = None
+    ) -> Optional[ShareOfVoiceMetrics]:
+        """
+        Share of voice against the given competitors, or against those named
+        in answers to competitor queries; None if there are none
+        """
+        source = "request"
+        if not competitors:
+            source = "responses"
+            competitors = []
+            for a in analysis_results:
+                if "competitor" in a.query.casefold():
+                    competitors.extend(extract_competitors(a.response, brand_name))
+        return self.share_of_voice_analyzer.analyze(
+            [a.response for a in analysis_results],
+            brand_name,
+            competitors,
+            brand_aliases=brand_aliases,
+            competitors_source=source
+        )
+
+    def rescore_analysis(self, analysis: AnalysisResponse, full: bool = False) -> Tuple[AnalysisResponse, int]:
+        """
+        Re-score a stored analysis against the current sentiment lexicon
+
+        Each response is updated incrementally from its stored keyword counts
+        (see SentimentAnalyzer.rescore), then the summary metrics are rebuilt.
+        With full=True every response is rescanned (e.g. after changing the
+        mention window).
+
+        Returns:
+            Tuple of (updated AnalysisResponse, number of responses whose text had to be scanned)
+        """
+        scanned = 0
+        rescored = []
+        for a in analysis.analysis:
+            sentiment, term_counts, was_scanned = self.sentiment_analyzer.rescore(
+                a.response,
+                analysis.brand_name,
+                a.sentiment_analysis.model_dump(),
+                None if full else a.term_counts,
+                None if full else a.lexicon_version
+            )
+            scanned += was_scanned
+            rescored.append(a.model_copy(update={
+                "sentiment_analysis": SentimentResult(**sentiment),
+                "term_counts": term_counts,
+                "lexicon_version": self.sentiment_analyzer.lexicon.version
+            }))
+
+        model_results = None
+        if analysis.model_results:
+            model_results = [
+                m.model_copy(update={
+                    "summary": self.build_summary([a for a in rescored if a.model == m.model], analysis.brand_name)
+                })
+                for m in analysis.model_results
+            ]
+        updated = analysis.model_copy(update={
+            "analysis": rescored,
+            "summary": self.build_summary(rescored, analysis.brand_name, analysis.summary.total_queries),
+            "model_results": model_results
+        })
+        return updated, scanned
+
+    def build_model_results(
+        self,
+        analysis_results: List[QueryAnalysis],
+        brand_name: str,
+        usages: List[Dict[str, int]]
+    ) -> Optional[List[ModelAnalysisSummary]]:
+        """Per-model summary and usage, or None if only one model ran"""
+        models = list(dict.fromkeys(a.model for a in analysis_results if a.model))
+        if len(models) < 2:
+            return None
+        return [
+            ModelAnalysisSummary(
+                model=model,
+                summary=self.build_summary([a for a in analysis_results if a.model == model], brand_name),
+                usage=self.build_usage([u for u in usages if u.get("model") == model])
+            )
+            for model in models
+        ]
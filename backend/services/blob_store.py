@@ -0,0 +1,148 @@
+"""
+Blob Store
+Content-addressed, compressed storage for LLM response text
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+COMPRESSION_LEVEL = 6
+
+
+def _chunks(keys: List[str], size: int = 500) -> Iterator[List[str]]:
+    """Split IN (...) lookups to stay well below SQLite's bound-parameter limit"""
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+def content_hash(text: str) -> str:
+    """Key of a text in the blob store (sha256 of its UTF-8 bytes)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """
+    Texts stored once per distinct content, zlib-compressed, in SQLite (WAL mode)
+
+    Every blob counts the references to it. Storing a text that is already
+    there only bumps its count, so an answer repeated across runs and users
+    costs one copy; a blob is deleted when its last reference is released.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize blob store
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; multi-statement operations use explicit transactions
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                refs INTEGER NOT NULL
+            )
+            """
+        )
+
+    def put_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Store texts (one reference each) in one transaction
+
+        Only texts not already stored are compressed and written.
+
+        Returns:
+            The content hash of each text, in order
+        """
+        texts = list(texts)
+        hashes = [content_hash(text) for text in texts]
+        if not texts:
+            return hashes
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = set()
+                for chunk in _chunks(list(set(hashes))):
+                    stored.update(
+                        row["hash"] for row in self._conn.execute(
+                            f"SELECT hash FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                        )
+                    )
+                new = {}
+                for key, text in zip(hashes, texts):
+                    if key not in stored and key not in new:
+                        raw = text.encode("utf-8")
+                        new[key] = (key, zlib.compress(raw, COMPRESSION_LEVEL), len(raw), 0)
+                self._conn.executemany("INSERT INTO blobs (hash, data, size, refs) VALUES (?, ?, ?, ?)", new.values())
+                self._conn.executemany("UPDATE blobs SET refs = refs + 1 WHERE hash = ?", [(key,) for key in hashes])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return hashes
+
+    def put(self, text: str) -> str:
+        """Store one text; returns its content hash"""
+        return self.put_many([text])[0]
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Look up texts by hash; unknown hashes are left out of the result"""
+        texts: Dict[str, str] = {}
+        for chunk in _chunks(list(set(hashes))):
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT hash, data FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            for row in rows:
+                texts[row["hash"]] = zlib.decompress(row["data"]).decode("utf-8")
+        return texts
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up one text by hash"""
+        return self.get_many([key]).get(key)
+
+    def release_many(self, hashes: Iterable[str]):
+        """Drop one reference per hash, deleting blobs nobody references any more"""
+        hashes = list(hashes)
+        if not hashes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("UPDATE blobs SET refs = refs - 1 WHERE hash = ?", [(key,) for key in hashes])
+                self._conn.executemany(
+                    "DELETE FROM blobs WHERE hash = ? AND refs <= 0", [(key,) for key in set(hashes)]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def get_stats(self) -> Dict:
+        """Number of blobs and references, and their raw vs stored sizes"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS blobs, COALESCE(SUM(refs), 0) AS references_count, "
+                "COALESCE(SUM(size), 0) AS raw_bytes, COALESCE(SUM(LENGTH(data)), 0) AS stored_bytes FROM blobs"
+            ).fetchone()
+        return dict(row)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
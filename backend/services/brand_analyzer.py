@@ -3,17 +3,40 @@ Brand Analyzer Service
 Extracts brand information and generates monitoring queries
 """
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
 from typing import Dict, List, Optional
-import asyncio
+
+from backend.config import config
+from backend.services.brand_info_cache import BrandInfoCache, BrandInfoEntry, normalize_url
+from backend.services.http_client import AsyncHTTPClient
+from backend.services.single_flight import SingleFlight
+from backend.utils.html_head import extract_head_metadata
+from backend.utils.public_suffix import normalize_host, split_host, to_unicode
 
 
 class BrandAnalyzer:
     """Service for analyzing brands and generating monitoring queries"""
     
-    def __init__(self):
-        """Initialize brand analyzer with default queries"""
+    def __init__(
+        self,
+        http_client: Optional[AsyncHTTPClient] = None,
+        cache: Optional[BrandInfoCache] = None
+    ):
+        """
+        Initialize brand analyzer with default queries
+
+        Args:
+            http_client: Optional shared HTTP client pool for homepage fetches
+            cache: Optional brand info cache (a default in-process one is created)
+        """
+        self.http_client = http_client or AsyncHTTPClient()
+        self.cache = cache if cache is not None else BrandInfoCache(
+            ttl_seconds=config.BRAND_INFO_CACHE_TTL_SECONDS,
+            negative_ttl_seconds=config.BRAND_INFO_NEGATIVE_TTL_SECONDS,
+            max_entries=config.BRAND_INFO_CACHE_MAX_ENTRIES
+        )
+        # Concurrent fetches of the same URL share one request
+        self._flight = SingleFlight()
         self.default_queries = [
             "What do you think about {brand}?",
             "Is {brand} good for businesses?",
@@ -36,35 +59,50 @@ class BrandAnalyzer:
             "https://www.slack.com" -> "Slack"
             "http://notion.so" -> "Notion"
             "https://www.company.co.uk" -> "Company"
+            "https://shop.brand.com.au:8443" -> "Brand"
+
+        The registrable domain is found with the bundled Public Suffix List,
+        so multi-label suffixes, subdomains, ports and IDNs are handled.
         """
         try:
-            # Remove protocol (https://, http://)
-            domain = url.replace("https://", "").replace("http://", "")
-            
-            # Remove www.
-            domain = domain.replace("www.", "")
-            
-            # Remove trailing slash
-            domain = domain.rstrip("/")
-            
-            # Get the main domain name (before first dot or slash)
-            # Handle both slashes and dots
-            if "/" in domain:
-                domain = domain.split("/")[0]
-            
-            # Get first part before dot
-            brand = domain.split(".")[0]
-            
-            # Capitalize first letter
+            _, label, suffix = split_host(normalize_host(url))
+            if not label:
+                # Bare suffix, single label or IP: best effort is the leftmost label
+                label = (suffix or normalize_host(url)).split(".")[0]
+            brand = to_unicode(label)
             return brand.title() if brand else "Unknown"
         except Exception as e:
             print(f"Error extracting brand name from {url}: {e}")
             return "Unknown"
+
+    def map_brand_names(self, urls: List[str]) -> List[str]:
+        """
+        extract_brand_name() for each URL, in a loop that looks up each distinct host once
+
+        Args:
+            urls: URL strings
+
+        Returns:
+            Brand names in the same order as urls
+        """
+        names: Dict[str, str] = {}
+        results = []
+        for url in urls:
+            host = normalize_host(url)
+            if host not in names:
+                names[host] = self.extract_brand_name(url)
+            results.append(names[host])
+        return results
     
     async def fetch_brand_info(self, url: str) -> Dict[str, str]:
         """
         Fetch brand information from URL
 
+        Results are cached per normalized URL. Stale entries are revalidated
+        with If-None-Match/If-Modified-Since, hosts that failed are skipped
+        for a short while, and concurrent fetches of the same URL share one
+        request.
+
         Args:
             url: The URL to fetch from
 
@@ -73,50 +111,78 @@ class BrandAnalyzer:
             - brand_name: str
             - url: str
             - description: Optional[str]
+            - site_name, og_title, organization_name: Optional[str] (page metadata)
         """
-        # Always extract brand from domain as primary source
-        domain_brand = self.extract_brand_name(url)
+        key = normalize_url(url)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            if entry.negative:
+                self.cache.negative_hits += 1
+            else:
+                self.cache.hits += 1
+            return {**entry.info, "url": url}
 
-        try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+        self.cache.misses += 1
+        info, _ = await self._flight.do(key, lambda: self._fetch(url, key, entry))
+        return {**info, "url": url}
 
-            # Run blocking request in executor to avoid blocking async loop
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.get(url, timeout=5, headers=headers)
-            )
-            response.raise_for_status()
+    async def _fetch(self, url: str, key: str, entry: Optional[BrandInfoEntry]) -> Dict[str, str]:
+        """Fetch (or revalidate) the homepage and update the cache"""
+        # Always extract brand from domain as primary source
+        domain_brand = self.extract_brand_name(url)
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        headers = {}
+        if entry is not None and entry.revalidatable:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
 
-            # Try to get meta description
-            description_meta = soup.find('meta', attrs={'name': 'description'})
-            description = description_meta.get('content') if description_meta else None
+        try:
+            # Pooled keep-alive client, bounded globally and per host.
+            # Only the <head> is read (up to BRAND_FETCH_MAX_BYTES); the rest is dropped
+            async with self.http_client.stream("GET", url, headers=headers or None) as response:
+                if response.status_code == 304 and headers:
+                    # Unchanged page: nothing downloaded, nothing parsed
+                    self.cache.refresh(entry)
+                    return entry.info
+                response.raise_for_status()
+                metadata = await extract_head_metadata(
+                    response.aiter_bytes(),
+                    max_bytes=config.BRAND_FETCH_MAX_BYTES,
+                    encoding=response.charset_encoding
+                )
+                etag = response.headers.get("etag")
+                last_modified = response.headers.get("last-modified")
 
             # Use domain-based brand name (more reliable than page title)
             # Page titles often contain taglines and descriptions
-            return {
+            info = {
                 "brand_name": domain_brand,
                 "url": url,
-                "description": description
+                "description": metadata["description"],
+                "site_name": metadata["og_site_name"],
+                "og_title": metadata["og_title"],
+                "organization_name": metadata["organization_name"]
             }
-        except requests.exceptions.Timeout:
+            self.cache.set(key, info, etag=etag, last_modified=last_modified)
+            return info
+        except httpx.TimeoutException:
             print(f"Timeout fetching {url}")
-            return {
-                "brand_name": domain_brand,
-                "url": url,
-                "description": None
-            }
         except Exception as e:
             print(f"Error fetching brand info from {url}: {e}")
-            return {
+
+        if entry is not None and not entry.negative:
+            # Serve what we had rather than nothing, but don't hammer the host
+            info = entry.info
+        else:
+            info = {
                 "brand_name": domain_brand,
                 "url": url,
                 "description": None
             }
+        self.cache.set_negative(key, info)
+        return info
     
     def generate_monitoring_queries(
         self,
@@ -0,0 +1,153 @@
+"""
+Brand Info Cache
+In-process LRU of homepage metadata per normalized URL, with validators for revalidation
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share a cache entry
+
+    Lowercases scheme and host, adds https:// if missing, drops default
+    ports, fragments and trailing slashes.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        netloc = host
+        if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+            netloc = f"{host}:{parts.port}"
+    except ValueError:
+        # Malformed netloc (e.g. port out of range): keep it as written, the fetch will fail on its own
+        return url.strip().lower()
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class BrandInfoEntry:
+    """Cached brand info, its HTTP validators and freshness"""
+
+    def __init__(
+        self,
+        info: Dict,
+        expires_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        negative: bool = False
+    ):
+        self.info = info
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.negative = negative
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        """Whether a conditional request can confirm this entry"""
+        return not self.negative and bool(self.etag or self.last_modified)
+
+
+class BrandInfoCache:
+    """
+    LRU cache of fetch_brand_info results
+
+    Positive entries live for ttl_seconds and keep the page's ETag and
+    Last-Modified so that, once stale, they can be revalidated with a
+    conditional request. Hosts that timed out or errored get a short-lived
+    negative entry so they aren't retried on every analysis.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 21600,
+        negative_ttl_seconds: float = 300,
+        max_entries: int = 4096
+    ):
+        """
+        Initialize brand info cache
+
+        Args:
+            ttl_seconds: How long fetched brand info is served without revalidation
+            negative_ttl_seconds: How long a failed host is skipped
+            max_entries: Maximum number of URLs kept
+        """
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, BrandInfoEntry]" = OrderedDict()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def get(self, key: str) -> Optional[BrandInfoEntry]:
+        """Get the entry for a normalized URL (fresh or stale), counting nothing"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        info: Dict,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> BrandInfoEntry:
+        """Store freshly fetched brand info"""
+        entry = BrandInfoEntry(info, time.time() + self.ttl_seconds, etag, last_modified)
+        self._put(key, entry)
+        return entry
+
+    def set_negative(self, key: str, info: Dict) -> BrandInfoEntry:
+        """Remember that a host failed, with the fallback info to serve meanwhile"""
+        entry = BrandInfoEntry(info, time.time() + self.negative_ttl_seconds, negative=True)
+        self._put(key, entry)
+        return entry
+
+    def refresh(self, entry: BrandInfoEntry):
+        """Extend a revalidated (304 Not Modified) entry for another TTL"""
+        entry.expires_at = time.time() + self.ttl_seconds
+        self.revalidated += 1
+
+    def _put(self, key: str, entry: BrandInfoEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        """Drop all entries, returning how many there were"""
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss/revalidation counters"""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "negative_ttl_seconds": self.negative_ttl_seconds
+        }
@@ -0,0 +1,172 @@
+"""
+Completion Cache
+Two-tier (in-process LRU + on-disk SQLite) cache for LLM completions
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class CompletionCache:
+    """Cache for LLM completions keyed by (model, normalized query, temperature, max_tokens)"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = 86400,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize completion cache
+
+        Args:
+            db_path: SQLite file for the on-disk tier (None keeps the cache in memory only)
+            ttl_seconds: How long a completion stays valid
+            max_entries: Maximum number of entries held in the in-process LRU tier
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, Tuple[float, str, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._init_db()
+
+    def _init_db(self):
+        """Create the on-disk table and drop expired rows"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                usage TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),))
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a query so trivial whitespace/case differences share an entry"""
+        return " ".join(query.split()).casefold()
+
+    @classmethod
+    def make_key(cls, model: str, query: str, temperature: float, max_tokens: int) -> str:
+        """Build the cache key for a completion request"""
+        raw = json.dumps([model, cls.normalize_query(query), float(temperature), int(max_tokens)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """
+        Look up a completion
+
+        Returns:
+            Tuple of (response_text, usage_data), or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, response, usage = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return response, dict(usage)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, usage, expires_at FROM completions WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    response, usage_json, expires_at = row
+                    usage = json.loads(usage_json)
+                    self._remember(key, expires_at, response, usage)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return response, dict(usage)
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, model: str, response: str, usage: Dict):
+        """Store a completion in both tiers"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        usage = dict(usage)
+        with self._lock:
+            self._remember(key, expires_at, response, usage)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, usage, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, json.dumps(usage), now, expires_at)
+                )
+                self._conn.commit()
+
+    def _remember(self, key: str, expires_at: float, response: str, usage: Dict):
+        """Insert into the LRU tier, evicting the least recently used entry if full"""
+        self._memory[key] = (expires_at, response, usage)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> int:
+        """Remove every cached completion, returning the number of disk rows deleted"""
+        with self._lock:
+            self._memory.clear()
+            deleted = 0
+            if self._conn is not None:
+                deleted = self._conn.execute("DELETE FROM completions").rowcount
+                self._conn.commit()
+            return deleted
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and tier sizes"""
+        with self._lock:
+            disk_entries = 0
+            if self._conn is not None:
+                disk_entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM completions WHERE expires_at > ?", (time.time(),)
+                ).fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+    def close(self):
+        """Close the on-disk tier"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
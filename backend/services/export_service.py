@@ -0,0 +1,192 @@
+"""
+Export Service
+Streams analysis history and the waitlist as NDJSON or CSV
+"""
+
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List
+
+from backend.models.schemas import AnalysisResponse, HistorySummary
+from backend.services.history_store import HistoryStore
+from backend.services.waitlist_service import WaitlistService
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_VIEWS = ("full", "summary")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8"
+}
+
+# One row per analysis (view=summary)
+SUMMARY_COLUMNS = [
+    "id", "brand_name", "url", "timestamp", "queries_analyzed", "mentions_count", "citations",
+    "visibility", "positive", "negative", "neutral", "overall_sentiment", "average_confidence",
+    "model", "total_tokens", "estimated_cost", "partial"
+]
+
+# One row per query (view=full)
+QUERY_COLUMNS = [
+    "brand_name", "url", "timestamp", "query", "model", "mentioned", "sentiment", "confidence",
+    "position", "citations", "response"
+]
+
+WAITLIST_COLUMNS = ["email", "brand_url", "created_at", "updated_at", "status"]
+
+# Bytes handed to the response per write
+CHUNK_BYTES = 64 * 1024
+
+
+def iter_history(
+    store: HistoryStore,
+    batch_size: int = 100,
+    include_responses: bool = True,
+    **filters
+) -> Iterator[AnalysisResponse]:
+    """Every stored analysis matching the filters, newest first, one page in memory at a time"""
+    cursor = None
+    while True:
+        analyses, cursor = store.page(batch_size, cursor, hydrate=include_responses, **filters)
+        yield from analyses
+        if cursor is None:
+            return
+
+
+def iter_history_summaries(store: HistoryStore, batch_size: int = 500, **filters) -> Iterator[HistorySummary]:
+    """Like iter_history, but the summary projection (no responses are read)"""
+    cursor = None
+    while True:
+        summaries, cursor = store.page_summaries(batch_size, cursor, **filters)
+        yield from summaries
+        if cursor is None:
+            return
+
+
+def summary_row(item: HistorySummary) -> Dict:
+    summary, usage = item.summary, item.usage
+    return {
+        "id": item.id,
+        "brand_name": item.brand_name,
+        "url": item.url,
+        "timestamp": item.timestamp.isoformat(),
+        "queries_analyzed": item.queries_analyzed,
+        "mentions_count": summary.mentions_count,
+        "citations": summary.citations,
+        "visibility": summary.visibility,
+        "positive": summary.positive,
+        "negative": summary.negative,
+        "neutral": summary.neutral,
+        "overall_sentiment": summary.overall_sentiment,
+        "average_confidence": summary.average_confidence,
+        "model": usage.model if usage else None,
+        "total_tokens": usage.total_tokens if usage else None,
+        "estimated_cost": usage.estimated_cost if usage else None,
+        "partial": item.partial
+    }
+
+
+def query_rows(analysis: AnalysisResponse) -> Iterator[Dict]:
+    for a in analysis.analysis:
+        yield {
+            "brand_name": analysis.brand_name,
+            "url": analysis.url,
+            "timestamp": analysis.timestamp.isoformat(),
+            "query": a.query,
+            "model": a.model,
+            "mentioned": a.sentiment_analysis.mentioned,
+            "sentiment": a.sentiment_analysis.sentiment,
+            "confidence": a.sentiment_analysis.confidence,
+            "position": a.sentiment_analysis.position,
+            "citations": a.citations,
+            "response": a.response
+        }
+
+
+def to_ndjson(records: Iterable[str]) -> Iterator[str]:
+    """Serialized records -> NDJSON lines"""
+    for record in records:
+        yield record + "\n"
+
+
+def to_csv(rows: Iterable[Dict], columns: List[str]) -> Iterator[str]:
+    """Dict rows -> CSV lines, header first (keys not in columns are dropped)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def to_chunks(lines: Iterable[str], chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Group text into UTF-8 chunks of about chunk_bytes, so small lines don't mean small writes"""
+    pending: List[str] = []
+    size = 0
+    for line in lines:
+        pending.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield "".join(pending).encode("utf-8")
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def export_history(
+    store: HistoryStore,
+    format: str = "ndjson",
+    view: str = "full",
+    include_responses: bool = True,
+    **filters
+) -> Iterator[bytes]:
+    """
+    Stream history as NDJSON or CSV
+
+    Args:
+        store: History store
+        format: "ndjson" or "csv"
+        view: "full" (NDJSON: AnalysisResponse per line; CSV: one row per
+            query) or "summary" (HistorySummary per line / row)
+        include_responses: Include the LLM response texts (view=full)
+        **filters: As for HistoryStore.page
+
+    Returns:
+        Iterator of byte chunks; records are read a page at a time as the
+        consumer pulls, so memory use is bounded by the page size
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    if view not in EXPORT_VIEWS:
+        raise ValueError(f"Unknown export view: {view} (expected one of {', '.join(EXPORT_VIEWS)})")
+
+    if view == "summary":
+        summaries = iter_history_summaries(store, **filters)
+        if format == "ndjson":
+            lines = to_ndjson(item.model_dump_json() for item in summaries)
+        else:
+            lines = to_csv(map(summary_row, summaries), SUMMARY_COLUMNS)
+    else:
+        analyses = iter_history(store, include_responses=include_responses, **filters)
+        if format == "ndjson":
+            lines = to_ndjson(analysis.model_dump_json() for analysis in analyses)
+        else:
+            lines = to_csv((row for analysis in analyses for row in query_rows(analysis)), QUERY_COLUMNS)
+    return to_chunks(lines)
+
+
+def export_waitlist(service: WaitlistService, format: str = "ndjson") -> Iterator[bytes]:
+    """Stream waitlist entries as NDJSON (complete entries) or CSV (WAITLIST_COLUMNS)"""
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    entries = service.iter_waitlist()
+    if format == "ndjson":
+        lines = to_ndjson(json.dumps(entry) for entry in entries)
+    else:
+        lines = to_csv(entries, WAITLIST_COLUMNS)
+    return to_chunks(lines)
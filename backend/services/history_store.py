@@ -0,0 +1,582 @@
+"""
+History Store
+Persistent SQLite-backed history of completed brand analyses
+"""
+
+import base64
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.models.schemas import AnalysisResponse, DailyTrend, HistorySummary
+from backend.services.blob_store import BlobStore, content_hash
+
+EMPTY_HASH = content_hash("")
+
+# Columns added after the table was first created, with their types
+_ADDED_COLUMNS = {
+    "overall_sentiment": "TEXT",
+    "visibility": "REAL",
+    "summary": "TEXT"
+}
+
+
+def encode_cursor(timestamp: float, record_id: int) -> str:
+    """Opaque page cursor: the sort key of the last row on a page"""
+    return base64.urlsafe_b64encode(json.dumps([timestamp, record_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        timestamp, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(timestamp), int(record_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+# Per-brand, per-day counters kept up to date as analyses are stored
+ROLLUP_COLUMNS = (
+    "runs", "queries", "mentions", "citations", "positive", "negative", "neutral",
+    "confidence_sum", "prompt_tokens", "completion_tokens", "total_tokens", "estimated_cost"
+)
+
+_ROLLUP_TABLE = """
+CREATE TABLE daily_rollups (
+    brand_key TEXT NOT NULL,
+    day TEXT NOT NULL,
+    brand_name TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    queries INTEGER NOT NULL,
+    mentions INTEGER NOT NULL,
+    citations INTEGER NOT NULL,
+    positive INTEGER NOT NULL,
+    negative INTEGER NOT NULL,
+    neutral INTEGER NOT NULL,
+    confidence_sum REAL NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    estimated_cost REAL NOT NULL,
+    PRIMARY KEY (brand_key, day)
+)
+"""
+
+_ROLLUP_UPSERT = (
+    f"INSERT INTO daily_rollups (brand_key, day, brand_name, {', '.join(ROLLUP_COLUMNS)}) "
+    f"VALUES (?, ?, ?, {', '.join('?' * len(ROLLUP_COLUMNS))}) "
+    f"ON CONFLICT (brand_key, day) DO UPDATE SET brand_name = excluded.brand_name, "
+    + ", ".join(f"{c} = {c} + excluded.{c}" for c in ROLLUP_COLUMNS)
+)
+
+
+def _rollup_row(analysis: AnalysisResponse, sign: int = 1) -> tuple:
+    """Contribution of one analysis to its brand's rollup for the analysis day"""
+    summary, usage = analysis.summary, analysis.usage
+    values = (
+        1,
+        summary.total_queries,
+        summary.mentions_count,
+        summary.citations,
+        summary.positive,
+        summary.negative,
+        summary.neutral,
+        sum(a.sentiment_analysis.confidence for a in analysis.analysis if a.sentiment_analysis.mentioned),
+        usage.prompt_tokens if usage else 0,
+        usage.completion_tokens if usage else 0,
+        usage.total_tokens if usage else 0,
+        usage.estimated_cost if usage else 0.0
+    )
+    return (
+        analysis.brand_name.casefold(),
+        analysis.timestamp.date().isoformat(),
+        analysis.brand_name,
+        *(sign * v for v in values)
+    )
+
+
+def _response_hashes(data: str) -> List[str]:
+    """Blob references of a stored record"""
+    return [item["response_hash"] for item in json.loads(data)["analysis"] if item.get("response_hash")]
+
+
+def _summary_columns(analysis: AnalysisResponse) -> Tuple[str, float, str]:
+    """overall_sentiment, visibility and the summary projection of an analysis"""
+    summary = analysis.model_dump_json(
+        include={"brand_name", "url", "timestamp", "queries_analyzed", "summary", "usage", "partial"}
+    )
+    return analysis.summary.overall_sentiment, analysis.summary.visibility, summary
+
+
+class HistoryStore:
+    """
+    Analysis history stored in a local SQLite database (WAL mode)
+
+    Every API worker process opens its own connection; WAL lets readers
+    run alongside a writer and busy_timeout makes concurrent writers wait
+    for each other instead of failing. Each analysis is one row holding the
+    serialized AnalysisResponse, with the brand, URL and timestamp broken
+    out into indexed columns for lookups, plus the summary metrics as a
+    small separate projection so listings never read response text.
+
+    Alongside each write, per-brand daily rollups (runs, mentions,
+    sentiment counts, token usage, ...) are updated in the same
+    transaction, so trends are read from one small row per brand and day.
+
+    Response text is kept in a BlobStore: each stored QueryAnalysis holds
+    the response_hash of its text instead of the text itself, so identical
+    answers are stored once. Reads put the text back (hydrate) unless
+    asked not to.
+    """
+
+    def __init__(self, db_path: str, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize history store
+
+        Args:
+            db_path: Path of the SQLite database file
+            blob_store: Where response text is kept (defaults to a
+                <name>_blobs.sqlite3 database next to db_path)
+        """
+        self.db_path = db_path
+        self.blob_store = blob_store or BlobStore(str(Path(db_path).with_name(f"{Path(db_path).stem}_blobs.sqlite3")))
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; multi-statement operations use explicit transactions
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                brand_name TEXT NOT NULL,
+                brand_key TEXT NOT NULL,
+                url TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                data TEXT NOT NULL,
+                overall_sentiment TEXT,
+                visibility REAL,
+                summary TEXT
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_brand_ts ON analyses (brand_key, timestamp)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_url_ts ON analyses (url, timestamp)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_ts ON analyses (timestamp)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analyses_sentiment_ts ON analyses (overall_sentiment, timestamp)"
+        )
+
+    def _migrate(self):
+        """Add the summary columns and rollups to databases created before they existed, and fill them in"""
+        # Under the write lock, so two processes starting at once don't both migrate
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            has_rollups = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_rollups'"
+            ).fetchone()
+            if not has_rollups:
+                self._conn.execute(_ROLLUP_TABLE)
+
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(analyses)")}
+            missing = [name for name in _ADDED_COLUMNS if name not in existing]
+            for name in missing:
+                self._conn.execute(f"ALTER TABLE analyses ADD COLUMN {name} {_ADDED_COLUMNS[name]}")
+            last_id = 0
+            while missing:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM analyses WHERE id > ? ORDER BY id LIMIT 500", (last_id,)
+                ).fetchall()
+                if not rows:
+                    break
+                self._conn.executemany(
+                    "UPDATE analyses SET overall_sentiment = ?, visibility = ?, summary = ? WHERE id = ?",
+                    [(*_summary_columns(AnalysisResponse.model_validate_json(row["data"])), row["id"]) for row in rows]
+                )
+                last_id = rows[-1]["id"]
+            last_id = 0
+            while not has_rollups:
+                rows = self._conn.execute(
+                    "SELECT id, data FROM analyses WHERE id > ? ORDER BY id LIMIT 500", (last_id,)
+                ).fetchall()
+                if not rows:
+                    break
+                self._conn.executemany(
+                    _ROLLUP_UPSERT, [_rollup_row(AnalysisResponse.model_validate_json(row["data"])) for row in rows]
+                )
+                last_id = rows[-1]["id"]
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _where(
+        brand: Optional[str] = None,
+        url: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sentiment: Optional[str] = None,
+        min_visibility: Optional[float] = None
+    ) -> Tuple[List[str], List]:
+        clauses, params = [], []
+        if brand:
+            clauses.append("brand_key = ?")
+            params.append(brand.casefold())
+        if url:
+            clauses.append("url = ?")
+            params.append(url)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until.timestamp())
+        if sentiment:
+            clauses.append("overall_sentiment = ?")
+            params.append(sentiment.upper())
+        if min_visibility is not None:
+            clauses.append("visibility >= ?")
+            params.append(min_visibility)
+        return clauses, params
+
+    def add(self, analysis: AnalysisResponse) -> int:
+        """
+        Store a completed analysis
+
+        Returns:
+            The new record id
+        """
+        data = self._dehydrate(analysis)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO analyses "
+                    "(brand_name, brand_key, url, timestamp, data, overall_sentiment, visibility, summary) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        analysis.brand_name,
+                        analysis.brand_name.casefold(),
+                        analysis.url,
+                        analysis.timestamp.timestamp(),
+                        data,
+                        *_summary_columns(analysis)
+                    )
+                )
+                self._conn.execute(_ROLLUP_UPSERT, _rollup_row(analysis))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._release_new([data])
+                raise
+        return cursor.lastrowid
+
+    def _dehydrate(self, analysis: AnalysisResponse) -> str:
+        """Serialize an analysis with its response texts moved to the blob store"""
+        data = analysis.model_dump(mode="json")
+        items = data["analysis"]
+        for item in items:
+            if not item["response"] and item.get("response_hash") not in (None, EMPTY_HASH):
+                raise ValueError("Analysis was read without its responses; read it with hydrate=True to store it")
+        hashes = self.blob_store.put_many(item["response"] for item in items)
+        for item, response_hash in zip(items, hashes):
+            item["response"] = ""
+            item["response_hash"] = response_hash
+        return json.dumps(data)
+
+    def _release_new(self, datas: Iterable[str]):
+        """
+        Give back the blob references taken by _dehydrate for records that were never written
+
+        The blob store is a separate database, so its commit can't be undone
+        by rolling back the history transaction.
+        """
+        self.blob_store.release_many(h for data in datas for h in _response_hashes(data))
+
+    def _hydrate(self, datas: List[str]) -> List[Dict]:
+        """Decode stored analyses, filling in response texts with one blob lookup"""
+        decoded = [json.loads(data) for data in datas]
+        hashes = [item["response_hash"] for data in decoded for item in data["analysis"] if item.get("response_hash")]
+        texts = self.blob_store.get_many(hashes)
+        for data in decoded:
+            for item in data["analysis"]:
+                if item.get("response_hash"):
+                    if item["response_hash"] not in texts:
+                        print(f"⚠️  Response text {item['response_hash']} is missing from the blob store")
+                    item["response"] = texts.get(item["response_hash"], "")
+        return decoded
+
+    def _remove_rollups(self, datas: Iterable[str]):
+        """Take stored records out of their rollups (caller holds the lock, in a transaction)"""
+        rows = [_rollup_row(AnalysisResponse.model_validate_json(data), sign=-1) for data in datas]
+        self._conn.executemany(_ROLLUP_UPSERT, rows)
+        self._conn.executemany(
+            "DELETE FROM daily_rollups WHERE brand_key = ? AND day = ? AND runs <= 0",
+            {row[:2] for row in rows}
+        )
+
+    def _replace(self, analyses: List[Tuple[int, AnalysisResponse]]) -> int:
+        """Replace stored analyses and their rollup contributions in one transaction"""
+        rows = []
+        try:
+            for record_id, analysis in analyses:
+                rows.append((self._dehydrate(analysis), *_summary_columns(analysis), record_id))
+        except Exception:
+            self._release_new(data for data, *_ in rows)
+            raise
+        ids = [record_id for record_id, _ in analyses]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = {
+                    row["id"]: row["data"] for row in self._conn.execute(
+                        f"SELECT id, data FROM analyses WHERE id IN ({','.join('?' * len(ids))})", ids
+                    )
+                } if ids else {}
+                self._conn.executemany(
+                    "UPDATE analyses SET data = ?, overall_sentiment = ?, visibility = ?, summary = ? WHERE id = ?",
+                    rows
+                )
+                self._remove_rollups(old.values())
+                self._conn.executemany(
+                    _ROLLUP_UPSERT, [_rollup_row(analysis) for record_id, analysis in analyses if record_id in old]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                self._release_new(data for data, *_ in rows)
+                raise
+        # Released only after the records point at the new texts; texts
+        # stored for ids that don't exist are given back as well
+        released = [h for data in old.values() for h in _response_hashes(data)]
+        released += [h for (data, *_), record_id in zip(rows, ids) if record_id not in old for h in _response_hashes(data)]
+        self.blob_store.release_many(released)
+        return len(old)
+
+    def update(self, record_id: int, analysis: AnalysisResponse) -> bool:
+        """Replace a stored analysis (e.g. after re-scoring); returns whether it existed"""
+        return self._replace([(record_id, analysis)]) == 1
+
+    def update_many(self, records: Iterable[Tuple[int, str]]):
+        """Replace stored analyses in one transaction from (id, serialized AnalysisResponse) pairs"""
+        self._replace([(record_id, AnalysisResponse.model_validate_json(data)) for record_id, data in records])
+
+    def _load(self, datas: List[str], hydrate: bool) -> List[AnalysisResponse]:
+        if not hydrate:
+            return [AnalysisResponse.model_validate_json(data) for data in datas]
+        return [AnalysisResponse.model_validate(data) for data in self._hydrate(datas)]
+
+    def get(self, record_id: int, hydrate: bool = True) -> Optional[AnalysisResponse]:
+        """
+        Get one stored analysis by id
+
+        Args:
+            record_id: Record id
+            hydrate: Load the response texts (otherwise each response is ""
+                and only response_hash is set)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM analyses WHERE id = ?", (record_id,)).fetchone()
+        return self._load([row["data"]], hydrate)[0] if row else None
+
+    def get_response(self, response_hash: str) -> Optional[str]:
+        """Load one response text by its hash"""
+        return self.blob_store.get(response_hash)
+
+    def _page(self, column: str, limit: int, cursor: Optional[str], filters: Dict) -> Tuple[List[sqlite3.Row], Optional[str]]:
+        """
+        One page of rows, newest first, keyed on (timestamp, id)
+
+        The cursor is the key of the previous page's last row, so every page
+        is an index range scan no matter how deep it is (no OFFSET).
+        """
+        clauses, params = self._where(**filters)
+        if cursor:
+            timestamp, record_id = decode_cursor(cursor)
+            clauses.append("(timestamp < ? OR (timestamp = ? AND id < ?))")
+            params += [timestamp, timestamp, record_id]
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, timestamp, {column} FROM analyses{where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                params + [limit + 1]
+            ).fetchall()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+
+    def page(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        hydrate: bool = True,
+        **filters
+    ) -> Tuple[List[AnalysisResponse], Optional[str]]:
+        """
+        A page of full analyses, newest first
+
+        Args:
+            limit: Page size
+            cursor: next_cursor of the previous page (None for the first page)
+            hydrate: Load the response texts (as for get)
+            **filters: brand (case-insensitive), url, since / until (analysis
+                timestamp, until exclusive), sentiment (overall_sentiment),
+                min_visibility (percent)
+
+        Returns:
+            Tuple of (analyses, cursor of the next page or None on the last page)
+        """
+        rows, next_cursor = self._page("data", limit, cursor, filters)
+        return self._load([row["data"] for row in rows], hydrate), next_cursor
+
+    def page_summaries(self, limit: int = 50, cursor: Optional[str] = None, **filters) -> Tuple[List[HistorySummary], Optional[str]]:
+        """Like page, but only the summary projection of each analysis (no response text is read)"""
+        rows, next_cursor = self._page("summary", limit, cursor, filters)
+        return [HistorySummary(id=row["id"], **json.loads(row["summary"])) for row in rows], next_cursor
+
+    def recent(self, limit: int = 10, **filters) -> List[AnalysisResponse]:
+        """The most recent analyses, newest first (filters as for page)"""
+        return self.page(limit, **filters)[0]
+
+    def iter_records(
+        self,
+        batch_size: int = 100,
+        after_id: int = 0,
+        brand: Optional[str] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (id, serialized AnalysisResponse) for every stored analysis, oldest id first
+
+        Rows are read batch_size at a time (keyed on id), so memory use does
+        not grow with the history and no read transaction is held open
+        between batches. Response texts are filled in from the blob store.
+
+        Args:
+            batch_size: Rows fetched per query
+            after_id: Only records with a larger id (to resume a scan)
+            brand: Only analyses of this brand (case-insensitive)
+        """
+        clauses, params = self._where(brand=brand)
+        where = " WHERE " + " AND ".join(clauses + ["id > ?"])
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, data FROM analyses{where} ORDER BY id LIMIT ?",
+                    params + [after_id, batch_size]
+                ).fetchall()
+            if not rows:
+                return
+            for row, data in zip(rows, self._hydrate([row["data"] for row in rows])):
+                yield row["id"], json.dumps(data)
+            after_id = rows[-1]["id"]
+
+    def count(self, **filters) -> int:
+        """Number of stored analyses (matching the filters, as for page)"""
+        clauses, params = self._where(**filters)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM analyses{where}", params).fetchone()[0]
+
+    def clear(self) -> int:
+        """Delete every stored analysis (and the texts only they referenced); returns how many were deleted"""
+        deleted = 0
+        while True:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    rows = self._conn.execute("SELECT id, data FROM analyses ORDER BY id LIMIT 500").fetchall()
+                    self._conn.executemany("DELETE FROM analyses WHERE id = ?", [(row["id"],) for row in rows])
+                    self._remove_rollups(row["data"] for row in rows)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            if not rows:
+                return deleted
+            deleted += len(rows)
+            self.blob_store.release_many(h for row in rows for h in _response_hashes(row["data"]))
+
+    def daily_rollups(
+        self,
+        brand: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> List[Dict]:
+        """
+        Rollup counters per day, oldest first
+
+        Args:
+            brand: One brand (case-insensitive); all brands are summed if omitted
+            since: First day included
+            until: Last day included
+
+        Returns:
+            One dict per day: "day" (YYYY-MM-DD) and the ROLLUP_COLUMNS sums
+        """
+        clauses, params = [], []
+        if brand:
+            clauses.append("brand_key = ?")
+            params.append(brand.casefold())
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("day <= ?")
+            params.append(until.isoformat())
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        sums = ", ".join(f"SUM({c}) AS {c}" for c in ROLLUP_COLUMNS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT day, {sums} FROM daily_rollups{where} GROUP BY day ORDER BY day", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def daily_trends(
+        self,
+        brand: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> List[DailyTrend]:
+        """daily_rollups as rates and averages, one DailyTrend per day with analyses"""
+        trends = []
+        for row in self.daily_rollups(brand, since, until):
+            rated = row["positive"] + row["negative"] + row["neutral"]
+            trends.append(DailyTrend(
+                day=date.fromisoformat(row["day"]),
+                runs=row["runs"],
+                queries=row["queries"],
+                mentions=row["mentions"],
+                citations=row["citations"],
+                visibility=round(row["mentions"] / row["queries"] * 100, 2) if row["queries"] else 0.0,
+                positive=row["positive"],
+                negative=row["negative"],
+                neutral=row["neutral"],
+                net_sentiment=round((row["positive"] - row["negative"]) / rated, 2) if rated else 0.0,
+                average_confidence=round(row["confidence_sum"] / row["mentions"], 2) if row["mentions"] else 0.0,
+                total_tokens=row["total_tokens"],
+                estimated_cost=round(row["estimated_cost"], 6)
+            ))
+        return trends
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS analyses, COUNT(DISTINCT brand_key) AS brands, "
+                "MIN(timestamp) AS oldest, MAX(timestamp) AS newest FROM analyses"
+            ).fetchone()
+        return {**dict(row), "responses": self.blob_store.get_stats()}
+
+    def close(self):
+        """Close the database connections"""
+        with self._lock:
+            self._conn.close()
+        self.blob_store.close()
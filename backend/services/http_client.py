@@ -0,0 +1,154 @@
+"""
+HTTP Client
+Shared pooled async HTTP client for outbound page fetches
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from backend.config import config
+
+try:
+    import h2  # noqa: F401  (httpx only needs it importable to speak HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class AsyncHTTPClient:
+    """
+    Keep-alive connection pool with a global concurrency cap and a per-host limit
+
+    The underlying httpx.AsyncClient is bound to the event loop it was created
+    on, so one is created lazily per loop (the loop changes under TestClient,
+    where startup events don't run). Clients of loops that have since closed
+    are closed when the next loop takes over, and close() closes them all.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_connections_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize HTTP client
+
+        Args:
+            max_connections: Global cap on concurrent requests (defaults to config.HTTP_MAX_CONNECTIONS)
+            max_connections_per_host: Concurrent requests per host (defaults to config.HTTP_MAX_CONNECTIONS_PER_HOST)
+            timeout: Request timeout in seconds (defaults to config.BRAND_FETCH_TIMEOUT_SECONDS)
+            transport: Optional httpx transport (used by tests)
+        """
+        self.max_connections = max(1, max_connections or config.HTTP_MAX_CONNECTIONS)
+        self.max_connections_per_host = max(1, max_connections_per_host or config.HTTP_MAX_CONNECTIONS_PER_HOST)
+        self.timeout = timeout or config.BRAND_FETCH_TIMEOUT_SECONDS
+        self.transport = transport
+        self.http2 = HTTP2_AVAILABLE and transport is None
+
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._loop = None
+        self._global: Optional[asyncio.Semaphore] = None
+        # host -> [semaphore, number of requests using it]; dropped when idle
+        self._hosts: Dict[str, list] = {}
+        self.requests = 0
+
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        """Return the client for the current event loop, creating it if needed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A finished loop's client can't be used again; release its connections
+            for finished in [other for other in self._clients if other.is_closed()]:
+                await self._clients.pop(finished).aclose()
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_connections)
+            self._hosts = {}
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers=DEFAULT_HEADERS,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                transport=self.transport
+            )
+        return client
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        """Hold one of the host's connection slots"""
+        host = (urlsplit(url).hostname or "").lower()
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = [asyncio.Semaphore(self.max_connections_per_host), 0]
+            self._hosts[host] = entry
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and self._hosts.get(host) is entry:
+                # Bulk onboarding touches thousands of hosts; don't keep them all
+                del self._hosts[host]
+
+    async def start(self):
+        """Create the connection pool up front (app startup)"""
+        await self._ensure_client()
+        print(f"🌐 HTTP client pool ready (max {self.max_connections} connections, "
+              f"{self.max_connections_per_host} per host, HTTP/2 {'on' if self.http2 else 'off'})")
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streamed request within the global and per-host limits
+
+        The response body is not read; iterate response.aiter_bytes() inside
+        the context to consume as much of it as needed.
+        """
+        client = await self._ensure_client()
+        async with self._host_slot(url), self._global:
+            self.requests += 1
+            async with client.stream(method, url, headers=headers) as response:
+                yield response
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET a URL within the global and per-host limits, reading the whole body"""
+        async with self.stream("GET", url, headers=headers) as response:
+            await response.aread()
+            return response
+
+    def get_stats(self) -> Dict:
+        """Get pool settings and request counters"""
+        return {
+            "requests": self.requests,
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "http2": self.http2,
+            "active_hosts": len(self._hosts)
+        }
+
+    async def close(self):
+        """Close pooled connections of every loop's client (app shutdown)"""
+        clients, self._clients = self._clients, {}
+        self._loop = None
+        for client in clients.values():
+            await client.aclose()
@@ -0,0 +1,244 @@
+"""
+Job Queue Service
+Durable SQLite-backed queue for background brand analyses
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+JOB_STATUSES = ("queued", "running", "completed", "failed")
+
+
+class JobQueue:
+    """
+    Durable job queue stored in a local SQLite database (WAL mode)
+
+    Any number of worker processes on the same host can claim jobs (WAL
+    mode needs shared memory, so the database file must be on a local
+    filesystem, not a network share). A claimed job holds a lease; if its
+    worker dies the lease expires and the job is handed to another worker.
+    Only the worker holding the lease can complete, fail or requeue a job.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3):
+        """
+        Initialize job queue
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_attempts: How many times a job may be claimed (retries and
+                expired leases both count) before it is failed
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; multi-statement operations use explicit transactions
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)")
+
+    def enqueue(self, kind: str, payload: Dict) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            kind: Job type (e.g. "brand_analysis")
+            payload: JSON-serializable job arguments
+
+        Returns:
+            The new job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, kind, json.dumps(payload), now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float = 60) -> Optional[Dict]:
+        """
+        Claim the oldest runnable job: a queued one, or a running one whose lease expired
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            lease_seconds: How long the claim holds without a heartbeat
+
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so two workers can't claim the same row
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose workers died too often are given up on
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Worker lease expired too many times', "
+                    "finished_at = ?, updated_at = ? "
+                    "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, now, now, self.max_attempts)
+                )
+                # A requeued job keeps its retry time in lease_expires_at
+                row = self._conn.execute(
+                    "SELECT id FROM jobs "
+                    "WHERE (status = 'queued' AND COALESCE(lease_expires_at, 0) <= ?) "
+                    "OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', worker_id = ?, lease_expires_at = ?, "
+                    "attempts = attempts + 1, started_at = COALESCE(started_at, ?), updated_at = ? "
+                    "WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, now, row["id"])
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = 60) -> bool:
+        """Extend a job's lease; returns False if the worker no longer owns it"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (now + lease_seconds, now, job_id, worker_id)
+            )
+        return cursor.rowcount == 1
+
+    def update_progress(self, job_id: str, progress: int, total: int):
+        """Record how many units of work are done"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET progress = ?, total = ?, updated_at = ? WHERE id = ?",
+                (progress, total, time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict, worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a job as completed with its JSON-serializable result
+
+        With worker_id, only if that worker still holds the job; returns
+        whether the job was updated.
+        """
+        now = time.time()
+        ownership, params = self._ownership(worker_id)
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'completed', result = ?, error = NULL, progress = total, "
+                f"lease_expires_at = NULL, finished_at = ?, updated_at = ? WHERE id = ?{ownership}",
+                (json.dumps(result), now, now, job_id, *params)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, error: str, worker_id: Optional[str] = None) -> bool:
+        """Mark a job as failed (with worker_id, only if that worker still holds it)"""
+        now = time.time()
+        ownership, params = self._ownership(worker_id)
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_expires_at = NULL, "
+                f"finished_at = ?, updated_at = ? WHERE id = ?{ownership}",
+                (error, now, now, job_id, *params)
+            )
+        return cursor.rowcount == 1
+
+    def retry(self, job_id: str, worker_id: str, error: str, delay: float = 0) -> bool:
+        """
+        Put a job that failed with a transient error back in the queue
+
+        The job becomes claimable after delay seconds. Nothing changes if the
+        job has used up max_attempts or the worker no longer holds it.
+
+        Returns:
+            Whether the job was requeued
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, worker_id = NULL, lease_expires_at = ?, "
+                "updated_at = ? WHERE id = ? AND worker_id = ? AND status = 'running' AND attempts < ?",
+                (error, now + delay, now, job_id, worker_id, self.max_attempts)
+            )
+        return cursor.rowcount == 1
+
+    @staticmethod
+    def _ownership(worker_id: Optional[str]):
+        """Extra WHERE clause restricting an update to the job's current worker"""
+        if worker_id is None:
+            return "", ()
+        return " AND worker_id = ? AND status = 'running'", (worker_id,)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by id, with payload and result decoded"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """List recent jobs (without results), newest first"""
+        query = "SELECT id, kind, status, progress, total, error, attempts, created_at, updated_at FROM jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, params + (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of jobs in each status"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row["status"]: row["count"] for row in rows})
+        return counts
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,185 @@
+"""
+Job Worker
+Claims jobs from the durable queue and runs them through the analysis pipeline
+"""
+
+import asyncio
+import os
+import socket
+from typing import Dict, List, Optional
+
+from backend.config import config
+from backend.services.history_store import HistoryStore
+from backend.services.job_queue import JobQueue
+from backend.services.llm_service import LLMError, backoff_delay, is_retryable
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed job is worth running again (rate limits, server errors, timeouts)"""
+    if isinstance(error, LLMError):
+        return error.transient
+    return isinstance(error, TimeoutError) or is_retryable(error)
+
+
+class JobWorker:
+    """Worker loop that processes queued brand analyses"""
+
+    def __init__(
+        self,
+        job_queue: JobQueue,
+        analysis_service,
+        history_store: Optional[HistoryStore] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        """
+        Initialize job worker
+
+        Args:
+            job_queue: Queue to claim jobs from
+            analysis_service: AnalysisService used to run analyses
+            history_store: Where completed analyses are recorded (None: not recorded)
+            worker_id: Unique worker name (defaults to host-pid)
+            poll_interval: Seconds to sleep when the queue is empty
+            lease_seconds: Lease length; renewed by a heartbeat while a job runs
+        """
+        self.job_queue = job_queue
+        self.analysis_service = analysis_service
+        self.history_store = history_store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval or config.JOB_POLL_INTERVAL_SECONDS
+        self.lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        self._stopping = asyncio.Event()
+
+        self.handlers = {
+            "brand_analysis": self._run_brand_analysis,
+            "batch_analysis": self._run_batch_analysis
+        }
+
+    def stop(self):
+        """Ask the worker loop to exit after the current job"""
+        self._stopping.set()
+
+    async def run(self):
+        """Process jobs until stop() is called"""
+        print(f"👷 Worker {self.worker_id} started")
+        while not self._stopping.is_set():
+            processed = await self.run_once()
+            if not processed:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        print(f"👋 Worker {self.worker_id} stopped")
+
+    async def run_once(self) -> bool:
+        """
+        Claim and process a single job
+
+        Returns:
+            True if a job was processed, False if the queue was empty
+        """
+        job = await asyncio.to_thread(self.job_queue.claim, self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def process(self, job: Dict):
+        """Run a claimed job, keeping its lease alive, and record the outcome"""
+        handler = self.handlers.get(job["kind"])
+        if handler is None:
+            await asyncio.to_thread(self.job_queue.fail, job["id"], f"Unknown job kind: {job['kind']}", self.worker_id)
+            return
+
+        print(f"▶️  Worker {self.worker_id} running job {job['id']} ({job['kind']}, attempt {job['attempts']})")
+        lease_lost = asyncio.Event()
+        task = asyncio.ensure_future(handler(job))
+        heartbeat = asyncio.ensure_future(self._heartbeat(job["id"], task, lease_lost))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+            print(f"⚠️  Job {job['id']} lease lost, leaving it to its new worker")
+        except Exception as e:
+            if is_transient(e):
+                delay = backoff_delay(job["attempts"] - 1, config.JOB_RETRY_BASE_SECONDS, config.JOB_RETRY_MAX_SECONDS)
+                if await asyncio.to_thread(self.job_queue.retry, job["id"], self.worker_id, str(e), delay):
+                    print(f"🔁 Job {job['id']} failed ({e}), retrying in {delay:.0f}s")
+                    return
+            print(f"❌ Job {job['id']} failed: {e}")
+            await asyncio.to_thread(self.job_queue.fail, job["id"], str(e), self.worker_id)
+        else:
+            if await asyncio.to_thread(self.job_queue.complete, job["id"], result, self.worker_id):
+                print(f"✅ Job {job['id']} completed")
+            else:
+                print(f"⚠️  Job {job['id']} finished after its lease was lost; result discarded")
+        finally:
+            heartbeat.cancel()
+            task.cancel()
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Future, lease_lost: asyncio.Event):
+        """Renew the job lease periodically while it runs; stop the job if the lease was lost"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await asyncio.to_thread(self.job_queue.heartbeat, job_id, self.worker_id, self.lease_seconds):
+                lease_lost.set()
+                task.cancel()
+                return
+
+    async def _record(self, analysis_response):
+        """Store a finished analysis in history (and its daily rollups)"""
+        if self.history_store is not None:
+            await asyncio.to_thread(self.history_store.add, analysis_response)
+
+    async def _run_brand_analysis(self, job: Dict) -> Dict:
+        """Run a queued brand analysis and return the AnalysisResponse as JSON"""
+        payload = job["payload"]
+
+        async def on_progress(done: int, total: int):
+            await asyncio.to_thread(self.job_queue.update_progress, job["id"], done, total)
+
+        analysis_response = await self.analysis_service.analyze(
+            payload["url"],
+            queries=payload.get("queries"),
+            custom_keywords=payload.get("custom_keywords"),
+            on_progress=on_progress,
+            models=payload.get("models"),
+            deadline_ms=payload.get("deadline_ms"),
+            competitors=payload.get("competitors"),
+            brand_aliases=payload.get("brand_aliases")
+        )
+        await self._record(analysis_response)
+        return analysis_response.model_dump(mode="json")
+
+    async def _run_batch_analysis(self, job: Dict) -> Dict:
+        """Run a queued batch analysis and return a BatchAnalysisResult as JSON"""
+        payload = job["payload"]
+        urls = payload["urls"]
+
+        results: List[Optional[Dict]] = [None] * len(urls)
+        errors = []
+        done = 0
+        await asyncio.to_thread(self.job_queue.update_progress, job["id"], 0, len(urls))
+        async for index, url, analysis_response, error in self.analysis_service.iter_batch(
+            urls,
+            queries=payload.get("queries"),
+            custom_keywords=payload.get("custom_keywords"),
+            models=payload.get("models")
+        ):
+            if analysis_response is not None:
+                await self._record(analysis_response)
+                results[index] = analysis_response.model_dump(mode="json")
+            else:
+                errors.append({"url": url, "detail": error})
+            done += 1
+            await asyncio.to_thread(self.job_queue.update_progress, job["id"], done, len(urls))
+
+        return {
+            "brands_requested": len(urls),
+            "duplicates": payload.get("duplicates", []),
+            "results": [result for result in results if result is not None],
+            "errors": errors
+        }
@@ -0,0 +1,63 @@
+"""
+Latency Tracker
+Sliding window of recent call latencies per model, used to pick hedging thresholds
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+def nearest_rank(ordered: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list"""
+    rank = max(1, min(len(ordered), math.ceil(percentile / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class LatencyTracker:
+    """Keeps the most recent call latencies for each model"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Initialize latency tracker
+
+        Args:
+            window: Number of recent samples kept per model
+            min_samples: Samples needed before percentile() returns a value
+        """
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        """Record the latency of one call (for a cancelled call, the time it ran before cancellation)"""
+        samples = self._samples.get(model)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._samples[model] = samples
+        samples.append(seconds)
+
+    def percentile(self, model: str, percentile: float) -> Optional[float]:
+        """
+        Latency below which `percentile` % of recent calls finished
+
+        Returns:
+            Seconds, or None while the model has fewer than min_samples samples
+        """
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return nearest_rank(sorted(samples), percentile)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Get sample counts and p50/p95/p99 latencies per model"""
+        stats = {}
+        for model, samples in self._samples.items():
+            ordered = sorted(samples)
+            stats[model] = {
+                "samples": len(ordered),
+                "p50_seconds": round(nearest_rank(ordered, 50), 3),
+                "p95_seconds": round(nearest_rank(ordered, 95), 3),
+                "p99_seconds": round(nearest_rank(ordered, 99), 3)
+            }
+        return stats
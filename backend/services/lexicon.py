@@ -0,0 +1,210 @@
+"""
+Sentiment Lexicon
+Versioned positive/negative keyword sets, hot-reloadable from a JSON file
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional
+
+DEFAULT_POSITIVE = frozenset({
+    "excellent", "great", "amazing", "good", "best", "love", "perfect",
+    "recommend", "outstanding", "fantastic", "wonderful", "impressed",
+    "satisfied", "happy", "positive", "strong", "powerful", "effective",
+    "reliable", "innovative", "superior", "exceptional", "superb",
+    "awesome", "brilliant", "stellar", "top-notch", "high-quality",
+    "valuable", "useful", "helpful", "efficient", "seamless", "smooth",
+    "user-friendly", "intuitive", "robust", "comprehensive", "versatile"
+})
+
+DEFAULT_NEGATIVE = frozenset({
+    "terrible", "bad", "worst", "hate", "awful", "poor", "weak",
+    "disappointing", "not recommended", "issues", "problems", "difficult",
+    "expensive", "slow", "broken", "useless", "negative", "struggling",
+    "unreliable", "frustrating", "inadequate", "inferior", "ineffective",
+    "horrible", "pathetic", "dreadful", "mediocre", "subpar", "lacking",
+    "buggy", "clunky", "confusing", "complicated", "overpriced", "waste",
+    "limited", "restrictive", "outdated", "unstable"
+})
+
+
+def _clean(words: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(w.strip().lower() for w in words if w and w.strip())
+
+
+class Lexicon:
+    """
+    An immutable pair of keyword sets identified by a version
+
+    The version defaults to a fingerprint of the contents, so the same
+    word lists always get the same version, across restarts too.
+    """
+
+    def __init__(self, positive: Iterable[str], negative: Iterable[str], version: Optional[str] = None):
+        self.positive = _clean(positive)
+        self.negative = _clean(negative)
+        self.version = version or self.fingerprint()
+
+    @classmethod
+    def default(cls) -> "Lexicon":
+        """The built-in lexicon"""
+        return cls(DEFAULT_POSITIVE, DEFAULT_NEGATIVE)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Lexicon":
+        """Build from {"positive": [...], "negative": [...], "version": optional}"""
+        return cls(data.get("positive", []), data.get("negative", []), data.get("version"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "Lexicon":
+        """Load a lexicon JSON file"""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @property
+    def terms(self) -> FrozenSet[str]:
+        return self.positive | self.negative
+
+    def fingerprint(self) -> str:
+        payload = json.dumps([sorted(self.positive), sorted(self.negative)])
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+    def to_dict(self) -> Dict:
+        return {"version": self.version, "positive": sorted(self.positive), "negative": sorted(self.negative)}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Lexicon) and (self.positive, self.negative) == (other.positive, other.negative)
+
+    def __hash__(self) -> int:
+        return hash((self.positive, self.negative))
+
+
+class LexiconRegistry:
+    """
+    The current lexicon plus every version seen
+
+    With a path, the file is re-read when its modification time changes
+    (checked at most every reload_interval_seconds), so lexicon tweaks
+    take effect without a restart. When set or reload replaces the
+    lexicon, both the outgoing and the new version are archived to
+    archive_dir as <version>.json (constructing a registry writes nothing);
+    stored analyses record the version they were scored with, and
+    re-scoring needs that version's terms to work out which terms changed.
+    A version name can't be reused for different terms.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        archive_dir: Optional[str] = None,
+        reload_interval_seconds: float = 30.0,
+        lexicon: Optional[Lexicon] = None
+    ):
+        """
+        Initialize lexicon registry
+
+        Args:
+            path: Optional lexicon JSON file (built-in lexicon if omitted)
+            archive_dir: Optional directory where versions are archived
+            reload_interval_seconds: Minimum time between file checks (0 = every access)
+            lexicon: Optional initial lexicon (ignored if path is set)
+        """
+        self.path = path
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.reload_interval_seconds = reload_interval_seconds
+        self._versions: Dict[str, Lexicon] = {}
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.reloads = 0
+
+        self.current = lexicon or Lexicon.default()
+        if path:
+            self._mtime = os.path.getmtime(path)
+            self.current = Lexicon.from_file(path)
+        self._remember(self.current)
+
+    def _remember(self, lexicon: Lexicon):
+        """Register a version in memory, refusing a known version name with other terms"""
+        known = self.get(lexicon.version)
+        if known is not None and known != lexicon:
+            raise ValueError(
+                f"Lexicon version {lexicon.version} already names different terms; "
+                f"give the changed lexicon a new version (or drop the version to use a fingerprint)"
+            )
+        self._versions[lexicon.version] = lexicon
+
+    def _archive(self, lexicon: Lexicon):
+        if self.archive_dir is None:
+            return
+        archived = self.archive_dir / f"{lexicon.version}.json"
+        if not archived.exists():
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            archived.write_text(json.dumps(lexicon.to_dict()), encoding="utf-8")
+
+    def get(self, version: str) -> Optional[Lexicon]:
+        """Look up an earlier (or the current) version"""
+        lexicon = self._versions.get(version)
+        if lexicon is None and self.archive_dir is not None:
+            archived = self.archive_dir / f"{version}.json"
+            if archived.exists():
+                lexicon = Lexicon.from_file(str(archived))
+                self._versions[version] = lexicon
+        if lexicon is None:
+            # The built-in lexicon is always known, archived or not
+            default = Lexicon.default()
+            if default.version == version:
+                lexicon = self._versions[version] = default
+        return lexicon
+
+    def set(self, lexicon: Lexicon) -> bool:
+        """
+        Make lexicon current; returns whether the version changed
+
+        Raises:
+            ValueError: If lexicon reuses a known version name for other terms
+        """
+        self._remember(lexicon)
+        self._archive(lexicon)
+        if lexicon.version == self.current.version:
+            return False
+        self._archive(self.current)
+        self.current = lexicon
+        self.reloads += 1
+        print(f"📚 Sentiment lexicon now at version {lexicon.version} "
+              f"({len(lexicon.positive)} positive, {len(lexicon.negative)} negative)")
+        return True
+
+    def reload(self) -> bool:
+        """Re-read the lexicon file now; returns whether the version changed"""
+        if not self.path:
+            return False
+        self._checked_at = time.monotonic()
+        self._mtime = os.path.getmtime(self.path)
+        return self.set(Lexicon.from_file(self.path))
+
+    def maybe_reload(self) -> bool:
+        """Reload if the file changed since it was last read (rate limited)"""
+        if not self.path or time.monotonic() - self._checked_at < self.reload_interval_seconds:
+            return False
+        self._checked_at = time.monotonic()
+        try:
+            if os.path.getmtime(self.path) == self._mtime:
+                return False
+            return self.reload()
+        except (OSError, ValueError) as e:
+            # Keep serving the current lexicon if the file is missing or half-written
+            print(f"⚠️  Could not reload sentiment lexicon from {self.path}: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        return {
+            "version": self.current.version,
+            "positive_terms": len(self.current.positive),
+            "negative_terms": len(self.current.negative),
+            "path": self.path,
+            "known_versions": len(self._versions),
+            "reloads": self.reloads
+        }
@@ -0,0 +1,150 @@
+"""
+LLM Providers
+Provider interface and implementations used by LLMService
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+
+
+class LLMProvider(ABC):
+    """Abstract base class for LLM providers"""
+
+    name: str = ""
+
+    # USD per 1M (prompt, completion) tokens, by model name
+    pricing: Dict[str, Tuple[float, float]] = {}
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the provider can take calls"""
+        return True
+
+    @abstractmethod
+    async def complete(
+        self,
+        model: str,
+        query: str,
+        max_tokens: int,
+        temperature: float
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Send one prompt to the provider
+
+        Returns:
+            Tuple of (response_text, usage_data) with prompt/completion/total tokens
+
+        Raises:
+            The provider's own exceptions; LLMService decides what to retry
+        """
+        pass
+
+    def get_pricing(self, model: str) -> Tuple[float, float]:
+        """USD per 1M (prompt, completion) tokens for a model (0 if unknown)"""
+        return self.pricing.get(model, (0.0, 0.0))
+
+    async def close(self):
+        """Release any network resources"""
+        pass
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions (also works with OpenAI-compatible APIs via base_url)"""
+
+    pricing = {
+        "gpt-4o-mini": (0.150, 0.600),
+        "gpt-4o": (2.50, 10.00),
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-4.1": (2.00, 8.00),
+    }
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        name: str = "openai",
+        base_url: Optional[str] = None,
+        client=None,
+        pricing: Optional[Dict[str, Tuple[float, float]]] = None
+    ):
+        """
+        Initialize OpenAI provider
+
+        Args:
+            api_key: API key for the endpoint
+            name: Provider name used in model ids ("name:model")
+            base_url: Optional OpenAI-compatible endpoint (e.g. Perplexity)
+            client: Optional pre-built async client (used by tests)
+            pricing: Optional pricing table overriding the OpenAI defaults
+        """
+        self.name = name
+        self.client = client
+        if pricing is not None:
+            self.pricing = pricing
+        if self.client is None and AsyncOpenAI and api_key:
+            # Retries are handled by LLMService (rate-limit aware), not by the SDK
+            self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+
+    @property
+    def is_available(self) -> bool:
+        return self.client is not None
+
+    async def complete(self, model, query, max_tokens, temperature):
+        response = await self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+
+        usage_data = {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens
+        }
+        return response.choices[0].message.content or "", usage_data
+
+    async def close(self):
+        if self.client is not None and hasattr(self.client, "close"):
+            await self.client.close()
+
+
+class StubProvider(LLMProvider):
+    """
+    Deterministic local provider for tests and offline development
+
+    The same (model, query) always yields the same answer, and the answer
+    quotes the query so brand names in it are "mentioned".
+    """
+
+    name = "stub"
+
+    OPENINGS = [
+        "{query} Overall it is an excellent, reliable choice that many teams recommend.",
+        "{query} It is a solid option with useful features, though some users find it expensive.",
+        "{query} Opinions are mixed: it has a comprehensive feature set but a confusing setup.",
+        "{query} It is a well-known tool used by many companies.",
+    ]
+
+    async def complete(self, model, query, max_tokens, temperature):
+        digest = hashlib.sha256(f"{model}\n{query}".encode("utf-8")).digest()
+        response_text = self.OPENINGS[digest[0] % len(self.OPENINGS)].format(query=query.strip())
+
+        prompt_tokens = len(query.split()) + 8
+        completion_tokens = min(max_tokens, len(response_text.split()))
+        usage_data = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+        return response_text, usage_data
@@ -0,0 +1,538 @@
+"""
+LLM Service
+Async execution layer for sending monitoring queries to one or more LLM providers
+"""
+
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from backend.config import config
+from backend.services.completion_cache import CompletionCache
+from backend.services.latency_tracker import LatencyTracker
+from backend.services.llm_providers import LLMProvider, OpenAIProvider, StubProvider
+from backend.services.rate_limiter import RateLimiter, parse_model_limits
+from backend.services.single_flight import SingleFlight
+
+try:
+    from openai import AsyncOpenAI, APIConnectionError, APITimeoutError
+    TRANSIENT_ERRORS = (APIConnectionError, APITimeoutError, asyncio.TimeoutError)
+except ImportError:
+    print("Warning: OpenAI package not installed. Install with: pip install openai")
+    AsyncOpenAI = None
+    TRANSIENT_ERRORS = (asyncio.TimeoutError,)
+
+DEFAULT_PROVIDER = "openai"
+
+# Rough prompt size estimate used to size rate limiter reservations
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 8
+
+
+class LLMError(Exception):
+    """Raised when a query could not be answered by the LLM"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        transient: bool = False
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.transient = transient  # Rate limit, server error or connection problem
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Read the Retry-After (or retry-after-ms) header from an API error, in seconds"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Rate limits (429), server errors (5xx) and connection failures are worth retrying"""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter: a random delay in [d/2, d] for d = base * 2^attempt"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class LLMService:
+    """
+    Service for running LLM queries concurrently with a bounded fan-out
+
+    Providers are registered by name; models are addressed as
+    "provider:model" (e.g. "stub:stub-1"). A bare model name such as
+    "gpt-4o-mini" goes to the OpenAI provider.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        client=None,
+        cache: Optional[CompletionCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        providers: Optional[List[LLMProvider]] = None,
+        hedge: Optional[bool] = None
+    ):
+        """
+        Initialize the LLM service
+
+        Args:
+            api_key: OpenAI API key (defaults to config.OPENAI_API_KEY)
+            model: Default model id (defaults to config.OPENAI_MODEL)
+            max_concurrency: Maximum number of in-flight calls (defaults to config.LLM_MAX_CONCURRENCY)
+            client: Optional pre-built async OpenAI client (used by tests)
+            cache: Optional completion cache consulted before calling the API
+            rate_limiter: Optional per-model RPM/TPM limiter applied before every API call
+            providers: Additional providers to register
+            hedge: Send a duplicate request when a call is slower than the model's
+                recent LLM_HEDGE_PERCENTILE latency (defaults to config.LLM_HEDGE_ENABLED)
+        """
+        self.model = model or config.OPENAI_MODEL
+        self.max_concurrency = max(1, max_concurrency or config.LLM_MAX_CONCURRENCY)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retries = 0
+        self.providers: Dict[str, LLMProvider] = {}
+
+        # Hedging: per-model latency window and a budget of extra calls
+        self.hedge = config.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.latency = LatencyTracker(window=config.LLM_LATENCY_WINDOW, min_samples=config.LLM_HEDGE_MIN_SAMPLES)
+        self.calls = 0
+        self.hedges = 0
+        self.hedges_won = 0
+
+        # OpenAI is always registered first (unavailable without a key)
+        api_key = api_key if api_key is not None else config.OPENAI_API_KEY
+        self.register_provider(OpenAIProvider(api_key=api_key, client=client))
+        for provider in providers or []:
+            self.register_provider(provider)
+
+        # Identical queries already in flight are shared instead of re-sent
+        self._flight = SingleFlight()
+
+        # The semaphore is bound to the running event loop, so it is created lazily
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    def register_provider(self, provider: LLMProvider):
+        """Register (or replace) a provider under its name"""
+        self.providers[provider.name] = provider
+
+    def resolve_model(self, model: Optional[str] = None) -> Tuple[LLMProvider, str, str]:
+        """
+        Resolve a model id to its provider
+
+        Args:
+            model: "provider:model", a bare OpenAI model name, or None for the default
+
+        Returns:
+            Tuple of (provider, provider_model_name, model_id)
+
+        Raises:
+            LLMError: If the provider is not registered
+        """
+        model_id = model or self.model
+        provider_name, _, model_name = model_id.partition(":")
+        if not model_name:
+            provider_name, model_name = DEFAULT_PROVIDER, model_id
+        provider = self.providers.get(provider_name)
+        if provider is None:
+            raise LLMError(f"Unknown LLM provider '{provider_name}' for model '{model_id}'")
+        return provider, model_name, model_id
+
+    def is_model_available(self, model: Optional[str] = None) -> bool:
+        """Whether a model's provider is registered and configured"""
+        try:
+            provider, _, _ = self.resolve_model(model)
+        except LLMError:
+            return False
+        return provider.is_available
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the default model can take calls"""
+        return self.is_model_available(self.model)
+
+    @property
+    def available_models(self) -> List[str]:
+        """Registered providers that are configured, as "provider:*" patterns"""
+        return [f"{name}:*" for name, provider in self.providers.items() if provider.is_available]
+
+    def get_pricing(self, model: Optional[str] = None) -> Tuple[float, float]:
+        """USD per 1M (prompt, completion) tokens for a model"""
+        provider, model_name, _ = self.resolve_model(model)
+        return provider.get_pricing(model_name)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the current event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def complete(self, query: str, model: Optional[str] = None) -> Tuple[str, Dict]:
+        """
+        Get a response for a single query
+
+        Args:
+            query: The prompt to send
+            model: Model id (defaults to the service's default model)
+
+        Returns:
+            Tuple of (response_text, usage_data). usage_data["model"] is the
+            model id, usage_data["cached"] tells whether the completion was
+            served from the cache, and usage_data["coalesced"] whether it was
+            shared with a concurrent identical request
+
+        Raises:
+            LLMError: If the provider is not configured or the call fails
+        """
+        provider, model_name, model_id = self.resolve_model(model)
+
+        cache_key = CompletionCache.make_key(model_id, query, config.TEMPERATURE, config.MAX_TOKENS)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                response_text, usage_data = cached
+                usage_data.update({"model": model_id, "cached": True, "coalesced": False})
+                return response_text, usage_data
+
+        if not provider.is_available:
+            if provider.name == DEFAULT_PROVIDER:
+                raise LLMError("OpenAI client not initialized. Check OPENAI_API_KEY in .env file")
+            raise LLMError(f"LLM provider '{provider.name}' is not configured")
+
+        (response_text, usage_data), joined = await self._flight.do(
+            cache_key,
+            lambda: self._request(provider, model_name, model_id, query, cache_key)
+        )
+
+        usage_data = dict(usage_data)
+        usage_data.update({"model": model_id, "cached": False, "coalesced": joined})
+        return response_text, usage_data
+
+    async def _request(
+        self,
+        provider: LLMProvider,
+        model_name: str,
+        model_id: str,
+        query: str,
+        cache_key: str
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Send one query to a provider and store the completion in the cache
+
+        Rate limits (429), server errors (5xx) and connection failures are
+        retried with jittered exponential backoff, honoring Retry-After.
+        """
+        token_budget = len(query) // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS + config.MAX_TOKENS
+        max_retries = max(0, config.LLM_MAX_RETRIES)
+
+        for attempt in range(max_retries + 1):
+            reserved = token_budget
+            if self.rate_limiter is not None:
+                reserved = await self.rate_limiter.acquire(model_id, token_budget)
+
+            try:
+                response_text, usage_data = await self._hedged_call(provider, model_name, model_id, query, token_budget)
+            except Exception as e:
+                status_code = getattr(e, "status_code", None)
+                retry_after = get_retry_after(e)
+                transient = is_retryable(e)
+                if not transient or attempt == max_retries:
+                    raise LLMError(
+                        str(e),
+                        status_code=status_code,
+                        retry_after=retry_after,
+                        transient=transient
+                    ) from e
+
+                delay = retry_after if retry_after is not None else backoff_delay(
+                    attempt, config.LLM_BACKOFF_BASE_SECONDS, config.LLM_BACKOFF_MAX_SECONDS
+                )
+                if self.rate_limiter is not None and status_code == 429:
+                    # Hold back every caller of this model, not just this one
+                    self.rate_limiter.penalize(model_id, delay)
+                self.retries += 1
+                print(f"⏳ {model_id} call failed ({status_code or type(e).__name__}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.reconcile(model_id, reserved, usage_data["total_tokens"])
+
+            if self.cache is not None and response_text:
+                self.cache.set(cache_key, model_id, response_text, usage_data)
+
+            return response_text, usage_data
+
+    async def _timed_call(
+        self,
+        provider: LLMProvider,
+        model_name: str,
+        model_id: str,
+        query: str,
+        acquired: Optional[asyncio.Event] = None
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        One provider call inside the concurrency bound, recording its latency
+
+        acquired, if given, is set once the call holds a concurrency slot, so
+        time spent queued for a slot can be told apart from time at the provider.
+        """
+        async with self._get_semaphore():
+            if acquired is not None:
+                acquired.set()
+            started = time.monotonic()
+            self.calls += 1
+            try:
+                result = await provider.complete(
+                    model_name,
+                    query,
+                    max_tokens=config.MAX_TOKENS,
+                    temperature=config.TEMPERATURE
+                )
+            except asyncio.CancelledError:
+                # A cancelled straggler took at least this long; leaving it out would skew the window fast
+                self.latency.record(model_id, time.monotonic() - started)
+                raise
+            self.latency.record(model_id, time.monotonic() - started)
+            return result
+
+    def _hedge_delay(self, model_id: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None if hedging is off or unaffordable"""
+        if not self.hedge:
+            return None
+        threshold = self.latency.percentile(model_id, config.LLM_HEDGE_PERCENTILE)
+        if threshold is None:
+            return None
+        return max(threshold, config.LLM_HEDGE_MIN_DELAY_SECONDS)
+
+    def _can_hedge(self) -> bool:
+        """Whether another hedge keeps extra calls within LLM_HEDGE_BUDGET_RATIO of primary calls"""
+        return self.hedges + 1 <= config.LLM_HEDGE_BUDGET_RATIO * (self.calls - self.hedges)
+
+    async def _hedged_call(
+        self,
+        provider: LLMProvider,
+        model_name: str,
+        model_id: str,
+        query: str,
+        token_budget: int
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Call the provider, duplicating the call if it runs past the hedge delay
+
+        Whichever copy answers first wins and the other is cancelled. If one
+        copy fails, the other one is still awaited. No hedge is sent while
+        every concurrency slot is busy.
+        """
+        delay = self._hedge_delay(model_id)
+        if delay is None:
+            return await self._timed_call(provider, model_name, model_id, query)
+
+        acquired = asyncio.Event()
+        primary = asyncio.ensure_future(self._timed_call(provider, model_name, model_id, query, acquired))
+        tasks = [primary]
+        try:
+            # The hedge clock starts once the primary holds a slot, not while it is queued for one
+            slot = asyncio.ensure_future(acquired.wait())
+            try:
+                await asyncio.wait([primary, slot], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                slot.cancel()
+            done, _ = await asyncio.wait([primary], timeout=delay)
+            # With every slot taken a hedge would only queue behind other calls and add load
+            if not done and not self._get_semaphore().locked() and self._can_hedge():
+                # Only hedge with spare rate-limit capacity; never queue for it.
+                # The reservation is kept: the cancelled copy still counts at the provider
+                if self.rate_limiter is None or self.rate_limiter.try_acquire(model_id, token_budget) is not None:
+                    self.hedges += 1
+                    print(f"🔀 {model_id} call slower than p{config.LLM_HEDGE_PERCENTILE:g} ({delay:.1f}s), hedging")
+                    tasks.append(asyncio.ensure_future(self._timed_call(provider, model_name, model_id, query)))
+
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    if error is None or task is primary:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def complete_many(
+        self,
+        queries: List[str],
+        return_exceptions: bool = False,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> List:
+        """
+        Run several queries concurrently, keeping results in query order
+
+        Args:
+            queries: Prompts to send
+            return_exceptions: If True, failed queries yield their exception instead
+                of aborting the whole batch
+            model: Model id (defaults to the service's default model)
+            timeout: Optional budget in seconds; queries still running when it
+                expires are cancelled and reported as asyncio.TimeoutError
+
+        Returns:
+            List of (response_text, usage_data) tuples (or exceptions), one per query
+        """
+        tasks = [asyncio.ensure_future(self.complete(query, model=model)) for query in queries]
+        try:
+            if timeout is None:
+                return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+            return_when = asyncio.ALL_COMPLETED if return_exceptions else asyncio.FIRST_EXCEPTION
+            done, _ = await asyncio.wait(tasks, timeout=max(0.0, timeout), return_when=return_when) if tasks else (set(), set())
+            results = []
+            for task in tasks:
+                if task not in done:
+                    error = asyncio.TimeoutError(f"Query did not finish within {timeout:.2f}s")
+                elif task.exception() is not None:
+                    error = task.exception()
+                else:
+                    results.append(task.result())
+                    continue
+                if not return_exceptions:
+                    raise error
+                results.append(error)
+            return results
+        finally:
+            # On the first failure gather() returns early; don't leave siblings running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def get_stats(self) -> Dict:
+        """Get execution counters for the LLM layer"""
+        return {
+            "model": self.model,
+            "available": self.is_available,
+            "providers": {name: provider.is_available for name, provider in self.providers.items()},
+            "max_concurrency": self.max_concurrency,
+            "requests": self._flight.get_stats(),
+            "retries": self.retries,
+            "hedging": {
+                "enabled": self.hedge,
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedges_won": self.hedges_won,
+                "latency": self.latency.get_stats()
+            },
+            "rate_limits": self.rate_limiter.get_stats() if self.rate_limiter is not None else None
+        }
+
+    async def close(self):
+        """Close provider clients and the cache"""
+        for provider in self.providers.values():
+            await provider.close()
+        if self.cache is not None:
+            self.cache.close()
+
+
+def build_llm_service() -> LLMService:
+    """
+    Build the LLM service from config: completion cache, per-model rate
+    limiter, the OpenAI provider and any optional providers
+
+    Shared by the API process and background workers so both talk to the
+    providers the same way.
+    """
+    # LLM completion cache (in-process LRU + on-disk SQLite tier)
+    completion_cache = None
+    if config.LLM_CACHE_ENABLED:
+        try:
+            completion_cache = CompletionCache(
+                db_path=config.LLM_CACHE_PATH,
+                ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES
+            )
+            print(f"🗄️  LLM completion cache enabled (TTL {config.LLM_CACHE_TTL_SECONDS}s): {config.LLM_CACHE_PATH}")
+        except Exception as e:
+            print(f"⚠️  Failed to open LLM completion cache, continuing without it: {e}")
+
+    # Per-model RPM/TPM limiter around the provider clients
+    rate_limiter = RateLimiter(
+        requests_per_minute=config.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=config.LLM_TOKENS_PER_MINUTE,
+        model_limits=parse_model_limits(config.LLM_MODEL_RATE_LIMITS)
+    )
+
+    # Optional providers beyond OpenAI
+    providers: List[LLMProvider] = []
+    if config.PERPLEXITY_API_KEY:
+        providers.append(OpenAIProvider(
+            api_key=config.PERPLEXITY_API_KEY,
+            name="perplexity",
+            base_url="https://api.perplexity.ai",
+            pricing={}
+        ))
+        print("✅ Perplexity provider registered (models: perplexity:<model>)")
+    if config.LLM_STUB_PROVIDER_ENABLED:
+        providers.append(StubProvider())
+        print("🧪 Stub LLM provider registered (models: stub:<name>)")
+
+    try:
+        llm_service = LLMService(cache=completion_cache, rate_limiter=rate_limiter, providers=providers)
+    except Exception as e:
+        print(f"❌ Warning: Failed to initialize OpenAI client: {e}")
+        return LLMService(api_key="", cache=completion_cache, rate_limiter=rate_limiter, providers=providers)
+
+    if llm_service.is_available:
+        print(f"✅ OpenAI client initialized successfully with key: {config.OPENAI_API_KEY[:20]}...")
+        print(f"⚡ LLM concurrency limit: {llm_service.max_concurrency}")
+    else:
+        if not AsyncOpenAI:
+            print("❌ OpenAI package not installed")
+        if not config.OPENAI_API_KEY:
+            print(f"❌ OPENAI_API_KEY not found in environment (value: '{config.OPENAI_API_KEY}')")
+    return llm_service
@@ -0,0 +1,80 @@
+"""
+Politeness Scheduler
+Serializes requests per host and spaces them out by a minimum interval
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class _HostState:
+    """Lock, last request time and number of users for one host"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.last_request = 0.0
+        self.users = 0
+
+
+class PolitenessScheduler:
+    """
+    Per-host politeness for bulk crawling
+
+    At most one request per host runs at a time, and consecutive requests to
+    the same host start at least min_interval_seconds apart. Different hosts
+    don't wait for each other.
+    """
+
+    # Idle hosts are pruned once this many are tracked
+    MAX_IDLE_HOSTS = 1024
+
+    def __init__(self, min_interval_seconds: float = 1.0):
+        """
+        Initialize politeness scheduler
+
+        Args:
+            min_interval_seconds: Minimum delay between two requests to the same host
+        """
+        self.min_interval_seconds = max(0.0, min_interval_seconds)
+        self._hosts: Dict[str, _HostState] = {}
+        self.waits = 0
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Host part of a URL (scheme optional)"""
+        if "://" not in url:
+            url = "https://" + url
+        return (urlsplit(url).hostname or "").lower()
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold the host's turn for the duration of one request"""
+        host = self.host_of(url)
+        state = self._hosts.get(host)
+        if state is None:
+            if len(self._hosts) >= self.MAX_IDLE_HOSTS:
+                self._prune()
+            state = _HostState()
+            self._hosts[host] = state
+        state.users += 1
+        try:
+            async with state.lock:
+                wait = state.last_request + self.min_interval_seconds - time.monotonic()
+                if wait > 0:
+                    self.waits += 1
+                    await asyncio.sleep(wait)
+                try:
+                    yield
+                finally:
+                    state.last_request = time.monotonic()
+        finally:
+            state.users -= 1
+
+    def _prune(self):
+        """Forget hosts nobody is waiting on whose interval has already passed"""
+        cutoff = time.monotonic() - self.min_interval_seconds
+        for host in [h for h, s in self._hosts.items() if s.users == 0 and s.last_request <= cutoff]:
+            del self._hosts[host]
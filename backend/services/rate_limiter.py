@@ -0,0 +1,183 @@
+"""
+Rate Limiter
+Per-model token buckets for requests-per-minute and tokens-per-minute quotas
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at a fixed rate"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize token bucket
+
+        Args:
+            capacity: Maximum number of tokens the bucket holds (burst size)
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until amount tokens are available (0 if available now)"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def take(self, amount: float):
+        """Remove tokens (callers check wait_time first)"""
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Return unused tokens to the bucket"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _ModelLimits:
+    """Request and token buckets for one model"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self.blocked_until = 0.0
+        self.throttled = 0
+
+
+def parse_model_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse per-model limits from a "model=rpm:tpm,model=rpm:tpm" string
+
+    Example:
+        "gpt-4o-mini=500:200000,gpt-4o=500:30000"
+    """
+    limits = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item or "=" not in item:
+            continue
+        model, values = item.split("=", 1)
+        try:
+            rpm, tpm = values.split(":", 1)
+            limits[model.strip()] = (int(rpm), int(tpm))
+        except ValueError:
+            print(f"⚠️  Ignoring invalid rate limit spec: {item}")
+    return limits
+
+
+class RateLimiter:
+    """Async limiter enforcing requests-per-minute and tokens-per-minute per model"""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        model_limits: Optional[Dict[str, Tuple[int, int]]] = None
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Default RPM quota for models without an override
+            tokens_per_minute: Default TPM quota for models without an override
+            model_limits: Optional {model: (rpm, tpm)} overrides
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.model_limits = model_limits or {}
+        self._models: Dict[str, _ModelLimits] = {}
+
+    def _limits_for(self, model: str) -> _ModelLimits:
+        limits = self._models.get(model)
+        if limits is None:
+            rpm, tpm = self.model_limits.get(model, (self.requests_per_minute, self.tokens_per_minute))
+            limits = _ModelLimits(rpm, tpm)
+            self._models[model] = limits
+        return limits
+
+    async def acquire(self, model: str, tokens: int) -> int:
+        """
+        Wait until one request and `tokens` tokens fit in the model's quota
+
+        Args:
+            model: Model the call goes to
+            tokens: Token budget reserved for the call
+
+        Returns:
+            The number of tokens actually reserved (pass it to reconcile())
+        """
+        limits = self._limits_for(model)
+        tokens = int(min(tokens, limits.tokens.capacity))
+        throttled = False
+        while True:
+            now = time.monotonic()
+            wait = max(
+                limits.blocked_until - now,
+                limits.requests.wait_time(1, now),
+                limits.tokens.wait_time(tokens, now)
+            )
+            if wait <= 0:
+                # No await between the check and the take, so this is atomic on the loop
+                limits.requests.take(1)
+                limits.tokens.take(tokens)
+                return tokens
+            if not throttled:
+                limits.throttled += 1
+                throttled = True
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, model: str, tokens: int) -> Optional[int]:
+        """
+        Reserve one request and `tokens` tokens only if they are available now
+
+        Returns:
+            The number of tokens reserved, or None if the call would have to wait
+        """
+        limits = self._limits_for(model)
+        tokens = int(min(tokens, limits.tokens.capacity))
+        now = time.monotonic()
+        if limits.blocked_until > now or limits.requests.wait_time(1, now) > 0 or limits.tokens.wait_time(tokens, now) > 0:
+            return None
+        limits.requests.take(1)
+        limits.tokens.take(tokens)
+        return tokens
+
+    def reconcile(self, model: str, reserved: int, actual: int):
+        """Refund the part of a reservation the call didn't use"""
+        if actual < reserved:
+            self._limits_for(model).tokens.refund(reserved - actual)
+
+    def penalize(self, model: str, seconds: float):
+        """Pause all calls to a model, e.g. after the provider answered 429"""
+        limits = self._limits_for(model)
+        limits.blocked_until = max(limits.blocked_until, time.monotonic() + seconds)
+
+    def get_stats(self) -> Dict:
+        """Get remaining capacity and throttle counters per model"""
+        now = time.monotonic()
+        stats = {}
+        for model, limits in self._models.items():
+            limits.requests.wait_time(0, now)
+            limits.tokens.wait_time(0, now)
+            stats[model] = {
+                "requests_per_minute": int(limits.requests.capacity),
+                "tokens_per_minute": int(limits.tokens.capacity),
+                "available_requests": int(limits.requests.tokens),
+                "available_tokens": int(limits.tokens.tokens),
+                "throttled": limits.throttled,
+                "blocked_for_seconds": round(max(0.0, limits.blocked_until - now), 2)
+            }
+        return stats
@@ -3,37 +3,375 @@ Sentiment Analyzer Service
 Analyzes sentiment in text regarding specific brands using keyword-based approach
 """
 
-from typing import Dict
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from backend.config import config
+from backend.services.lexicon import Lexicon, LexiconRegistry
+from backend.utils.aho_corasick import AhoCorasick
+
+# Automaton keys for lexicon entries and the brand
+POSITIVE = "positive"
+NEGATIVE = "negative"
+BRAND = "brand"
+
+# Brands whose lexicon+brand automaton is kept around
+AUTOMATON_CACHE_SIZE = 256
+
+# Label codes used by the vectorized scorer
+LABELS = np.array(["NEUTRAL", "POSITIVE", "NEGATIVE", "NOT_MENTIONED"])
+
+# End of a sentence: terminal punctuation before whitespace/end of text, or a
+# line break, plus the whitespace that follows
+SENTENCE_END = re.compile(r"(?:[.!?]+(?=\s|$)|\n)\s*")
+
+
+def sentence_ends(text: str) -> List[int]:
+    """Offsets where each sentence of text ends (the next one starts)"""
+    return [match.end() for match in SENTENCE_END.finditer(text)]
+
+
+def sentiment_result(mentioned: bool, position: int, positive_count: int, negative_count: int) -> Dict:
+    """Build the analyze_sentiment dictionary from mention and indicator counts"""
+    if not mentioned:
+        return {
+            "mentioned": False,
+            "sentiment": "NOT_MENTIONED",
+            "confidence": 1.0,
+            "position": -1,
+            "positive_indicators": 0,
+            "negative_indicators": 0
+        }
+
+    # Determine sentiment
+    if positive_count > negative_count:
+        sentiment = "POSITIVE"
+    elif negative_count > positive_count:
+        sentiment = "NEGATIVE"
+    else:
+        sentiment = "NEUTRAL"
+
+    # Calculate confidence
+    total_indicators = positive_count + negative_count
+    if total_indicators > 0:
+        confidence = max(positive_count, negative_count) / total_indicators
+        confidence = min(confidence, 1.0)
+    else:
+        # No clear indicators, low confidence neutral
+        confidence = 0.5
+
+    return {
+        "mentioned": True,
+        "sentiment": sentiment,
+        "confidence": confidence,
+        "position": position,
+        "positive_indicators": positive_count,
+        "negative_indicators": negative_count
+    }
+
+
+class ResponseAnalysis:
+    """
+    One response normalized and scanned once for a brand and the lexicon
+
+    Holds the lowercased text, the offsets of every brand mention and
+    keyword, and the sentence boundaries. Citations, first position and
+    sentiment are all derived from this index without rescanning.
+    Sentiment can be scoped to the sentences around each mention, so
+    praise of something else further down the answer doesn't count for
+    the brand.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        brand_name: str,
+        mentions: List[int],
+        keywords: List[Tuple[int, str, str]],
+        mention_window: Optional[int] = None,
+        lexicon_version: Optional[str] = None
+    ):
+        """
+        Args:
+            text: Original response text
+            brand_name: Brand the mentions are of
+            mentions: Offsets of brand mentions in the lowercased text, ascending
+            keywords: (offset, POSITIVE/NEGATIVE, keyword) for every lexicon hit
+            mention_window: Default sentiment scope in sentences around a
+                mention (0 = the mention's own sentence); None = whole response
+            lexicon_version: Version of the lexicon the keywords come from
+        """
+        self.text = text
+        self.normalized = text.lower()
+        self.brand_name = brand_name
+        self.mentions = mentions
+        self.keywords = keywords
+        self.mention_window = mention_window
+        self.lexicon_version = lexicon_version
+        self.sentence_ends = sentence_ends(self.normalized)
+        self.mention_sentences = sorted({self.sentence_of(offset) for offset in mentions})
+
+    @property
+    def mentioned(self) -> bool:
+        return bool(self.mentions)
+
+    @property
+    def citations(self) -> int:
+        """Number of brand mentions"""
+        return len(self.mentions)
+
+    @property
+    def position(self) -> int:
+        """Offset of the first mention, -1 if not mentioned"""
+        return self.mentions[0] if self.mentions else -1
+
+    def sentence_of(self, offset: int) -> int:
+        """Index of the sentence containing offset"""
+        return bisect_right(self.sentence_ends, offset)
+
+    def near_mention(self, offset: int, window: int) -> bool:
+        """Whether offset lies within window sentences of a sentence mentioning the brand"""
+        sentence = self.sentence_of(offset)
+        i = bisect_left(self.mention_sentences, sentence)
+        return any(
+            abs(self.mention_sentences[j] - sentence) <= window
+            for j in (i - 1, i) if 0 <= j < len(self.mention_sentences)
+        )
+
+    def indicators(self, window: Optional[int] = -1) -> Tuple[Set[str], Set[str]]:
+        """
+        Distinct positive and negative keywords in scope
+
+        Args:
+            window: Sentences around each mention; None = whole response;
+                -1 (default) = this analysis' mention_window
+        """
+        if window == -1:
+            window = self.mention_window
+        found = {POSITIVE: set(), NEGATIVE: set()}
+        for offset, kind, word in self.keywords:
+            if window is None or self.near_mention(offset, window):
+                found[kind].add(word)
+        return found[POSITIVE], found[NEGATIVE]
+
+    def term_counts(self, window: Optional[int] = -1) -> Dict[str, int]:
+        """Occurrences of each lexicon keyword in scope (see indicators for window)"""
+        if window == -1:
+            window = self.mention_window
+        counts: Dict[str, int] = {}
+        for offset, _, word in self.keywords:
+            if window is None or self.near_mention(offset, window):
+                counts[word] = counts.get(word, 0) + 1
+        return counts
+
+    def sentiment(self, window: Optional[int] = -1) -> Dict:
+        """Sentiment in the analyze_sentiment format (see indicators for window)"""
+        positive_found, negative_found = self.indicators(window)
+        return sentiment_result(self.mentioned, self.position, len(positive_found), len(negative_found))
+
+
+def _in_mention(mentions: List[int], length: int, start: int, end: int) -> bool:
+    """Whether [start, end) overlaps one of the brand mentions (sorted offsets, each length long)"""
+    i = bisect_left(mentions, end) - 1
+    return i >= 0 and mentions[i] + length > start
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_regex(terms: Sequence[str]) -> str:
+    """
+    Regex alternation of terms factored into a prefix trie
+
+    "bad|buggy|b" becomes "b(?:ad|uggy)?". Python's re tries alternatives
+    one by one, so a flat alternation of the whole lexicon is tested at
+    every position; the trie form rejects most positions on the first
+    character.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: Dict) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        terminal = "" in node
+        body = alternatives[0] if len(alternatives) == 1 and not terminal else "(?:" + "|".join(alternatives) + ")"
+        return body + ("?" if terminal else "")
+
+    return build(trie)
+
+
+def _lexicon_regex(terms: Sequence[str]) -> "re.Pattern":
+    """
+    Compile terms into one regex with word boundaries on word-character edges,
+    matching the AhoCorasick(word_boundaries=True) rules
+    """
+    groups: Dict[Tuple[bool, bool], List[str]] = {}
+    for term in terms:
+        if term:
+            groups.setdefault((_is_word_char(term[0]), _is_word_char(term[-1])), []).append(term)
+    parts = []
+    for (word_start, word_end), group in sorted(groups.items(), reverse=True):
+        parts.append(
+            (r"(?<!\w)" if word_start else "") + "(?:" + _trie_regex(group) + ")" + (r"(?!\w)" if word_end else "")
+        )
+    return re.compile("|".join(parts))
+
+
+class DocumentTermMatrix:
+    """
+    Sparse document-term count matrix in coordinate form
+
+    Entry k says term cols[k] occurs counts[k] times in document rows[k];
+    each (row, col) pair appears once.
+    """
+
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, counts: np.ndarray, shape: Tuple[int, int]):
+        self.rows = rows
+        self.cols = cols
+        self.counts = counts
+        self.shape = shape
+
+    @classmethod
+    def from_pairs(cls, rows: Sequence[int], cols: Sequence[int], shape: Tuple[int, int]) -> "DocumentTermMatrix":
+        """Build from one (document, term) pair per occurrence"""
+        flat = np.asarray(rows, dtype=np.int64) * shape[1] + np.asarray(cols, dtype=np.int64)
+        keys, counts = np.unique(flat, return_counts=True)
+        return cls(keys // shape[1], keys % shape[1], counts, shape)
+
+    def row_sums(self, col_mask: np.ndarray, binary: bool = False) -> np.ndarray:
+        """Per-document sum over the columns selected by col_mask"""
+        keep = col_mask[self.cols]
+        weights = None if binary else self.counts[keep]
+        return np.bincount(self.rows[keep], weights=weights, minlength=self.shape[0]).astype(np.int64)
+
+    def toarray(self) -> np.ndarray:
+        """Dense copy (for small matrices and tests)"""
+        dense = np.zeros(self.shape, dtype=np.int64)
+        dense[self.rows, self.cols] = self.counts
+        return dense
 
 
 class SentimentAnalyzer:
     """Service for analyzing sentiment in text"""
     
-    def __init__(self):
-        """Initialize sentiment analyzer with keyword dictionaries"""
-        self.positive_keywords = {
-            "excellent", "great", "amazing", "good", "best", "love", "perfect",
-            "recommend", "outstanding", "fantastic", "wonderful", "impressed",
-            "satisfied", "happy", "positive", "strong", "powerful", "effective",
-            "reliable", "innovative", "superior", "exceptional", "superb",
-            "awesome", "brilliant", "stellar", "top-notch", "high-quality",
-            "valuable", "useful", "helpful", "efficient", "seamless", "smooth",
-            "user-friendly", "intuitive", "robust", "comprehensive", "versatile"
-        }
-        
-        self.negative_keywords = {
-            "terrible", "bad", "worst", "hate", "awful", "poor", "weak",
-            "disappointing", "not recommended", "issues", "problems", "difficult",
-            "expensive", "slow", "broken", "useless", "negative", "struggling",
-            "unreliable", "frustrating", "inadequate", "inferior", "ineffective",
-            "horrible", "pathetic", "dreadful", "mediocre", "subpar", "lacking",
-            "buggy", "clunky", "confusing", "complicated", "overpriced", "waste",
-            "limited", "restrictive", "outdated", "unstable", "disappointing"
-        }
+    def __init__(self, mention_window: Optional[int] = None, lexicon: Optional[LexiconRegistry] = None):
+        """
+        Initialize sentiment analyzer with keyword dictionaries
+
+        Args:
+            mention_window: Sentences around each brand mention whose keywords
+                count toward its sentiment (0 = the mention's own sentence).
+                Defaults to SENTIMENT_MENTION_WINDOW; negative = whole response
+            lexicon: Optional lexicon registry (defaults to SENTIMENT_LEXICON_PATH,
+                or the built-in lexicon)
+        """
+        if mention_window is None:
+            mention_window = config.SENTIMENT_MENTION_WINDOW
+        self.mention_window = mention_window if mention_window >= 0 else None
+        self.lexicons = lexicon or LexiconRegistry(
+            path=config.SENTIMENT_LEXICON_PATH or None,
+            archive_dir=str(config.DATA_DIR / "lexicons"),
+            reload_interval_seconds=config.SENTIMENT_LEXICON_RELOAD_SECONDS
+        )
+
+        # One automaton per brand and lexicon: the keywords plus the brand name,
+        # so a response is scanned once for everything. Built on first use
+        self._automaton_for = lru_cache(maxsize=AUTOMATON_CACHE_SIZE)(self._build_automaton)
+        self._batch_pattern_for = lru_cache(maxsize=AUTOMATON_CACHE_SIZE)(self._build_batch_pattern)
+
+    @property
+    def lexicon(self) -> Lexicon:
+        """The current lexicon (picking up changes to the lexicon file)"""
+        self.lexicons.maybe_reload()
+        return self.lexicons.current
+
+    @property
+    def positive_keywords(self) -> FrozenSet[str]:
+        return self.lexicon.positive
+
+    @positive_keywords.setter
+    def positive_keywords(self, words: Iterable[str]):
+        self.lexicons.set(Lexicon(words, self.lexicons.current.negative))
+
+    @property
+    def negative_keywords(self) -> FrozenSet[str]:
+        return self.lexicon.negative
+
+    @negative_keywords.setter
+    def negative_keywords(self, words: Iterable[str]):
+        self.lexicons.set(Lexicon(self.lexicons.current.positive, words))
+
+    def _build_automaton(self, brand_lower: str, positive: FrozenSet[str], negative: FrozenSet[str]) -> AhoCorasick:
+        """Compile keywords and one brand name into a word-boundary automaton"""
+        patterns = [(word, (POSITIVE, word)) for word in positive]
+        patterns += [(word, (NEGATIVE, word)) for word in negative]
+        patterns.append((brand_lower, (BRAND, brand_lower)))
+        return AhoCorasick(patterns, word_boundaries=True)
+
+    def analyze_response(
+        self,
+        text: str,
+        brand_name: str,
+        lexicon: Optional[Lexicon] = None
+    ) -> ResponseAnalysis:
+        """
+        Scan a response once and index its brand mentions and keywords
+
+        Matches are case-insensitive and must sit on word boundaries, so
+        "good" in "goodbye" or "Go" in "Google" don't count.
+
+        Args:
+            text: The response text
+            brand_name: The brand name to look for
+            lexicon: Optional keywords to look for instead of the current lexicon
+
+        Returns:
+            ResponseAnalysis scoped to this analyzer's mention window
+        """
+        lexicon = lexicon or self.lexicon
+        automaton = self._automaton_for(brand_name.lower(), lexicon.positive, lexicon.negative)
+        mentions: List[int] = []
+        keywords: List[Tuple[int, str, str]] = []
+        for start, (kind, word) in automaton.iter_matches(text.lower()):
+            if kind == BRAND:
+                mentions.append(start)
+            else:
+                keywords.append((start, kind, word))
+        mentions.sort()
+        # Words of the brand's own name ("best" in "Best Buy") say nothing about it
+        brand_length = len(brand_name)
+        keywords = [
+            keyword for keyword in keywords
+            if not _in_mention(mentions, brand_length, keyword[0], keyword[0] + len(keyword[2]))
+        ]
+        return ResponseAnalysis(text, brand_name, mentions, keywords, self.mention_window, lexicon.version)
+
+    def scan(self, text: str, brand_name: str) -> Tuple[List[int], Set[str], Set[str]]:
+        """
+        Find brand mentions and sentiment keywords in a single pass
+
+        Returns:
+            Tuple of (brand mention positions, positive keywords found, negative
+            keywords found), keywords over the whole text
+        """
+        analysis = self.analyze_response(text, brand_name)
+        positive_found, negative_found = analysis.indicators(window=None)
+        return analysis.mentions, positive_found, negative_found
     
     def count_brand_occurrences(self, text: str, brand_name: str) -> int:
         """
-        Count total occurrences of brand name in text (case-insensitive)
+        Count total occurrences of brand name in text (case-insensitive, whole words)
 
         Args:
             text: The text to search in
@@ -42,25 +380,15 @@ class SentimentAnalyzer:
         Returns:
             int: Total number of times brand appears in text
         """
-        text_lower = text.lower()
-        brand_lower = brand_name.lower()
-
-        # Count overlapping occurrences
-        count = 0
-        start = 0
-        while True:
-            pos = text_lower.find(brand_lower, start)
-            if pos == -1:
-                break
-            count += 1
-            start = pos + 1
-
-        return count
+        return self.analyze_response(text, brand_name).citations
 
     def analyze_sentiment(self, text: str, brand_name: str) -> Dict:
         """
         Analyze sentiment of text regarding a brand
 
+        Only keywords within mention_window sentences of a brand mention
+        are counted (all of them if the window is disabled).
+
         Args:
             text: The text to analyze
             brand_name: The brand name to search for
@@ -74,55 +402,275 @@ class SentimentAnalyzer:
             - positive_indicators: int (count of positive keywords)
             - negative_indicators: int (count of negative keywords)
         """
-        text_lower = text.lower()
+        return self.analyze_response(text, brand_name).sentiment()
+
+    def rescore(
+        self,
+        text: str,
+        brand_name: str,
+        sentiment: Dict,
+        term_counts: Optional[Dict[str, int]] = None,
+        lexicon_version: Optional[str] = None
+    ) -> Tuple[Dict, Dict[str, int], bool]:
+        """
+        Re-score a stored response against the current lexicon
+
+        With the keyword counts stored for the response and the lexicon
+        version they were taken with, only terms that are new since that
+        version are looked for in the text; removed terms are dropped from
+        the counts and terms that changed polarity are simply re-labelled.
+        Without them (or for an unknown version) the response is rescanned.
+
+        Args:
+            text: The response text
+            brand_name: The brand name
+            sentiment: The stored analyze_sentiment result
+            term_counts: Stored in-window keyword counts, if any
+            lexicon_version: Version of the lexicon the counts were taken with
+
+        Returns:
+            Tuple of (sentiment, term_counts, scanned) where scanned says
+            whether the text had to be read at all
+        """
+        lexicon = self.lexicon
+        if term_counts is not None and lexicon_version == lexicon.version:
+            return sentiment, term_counts, False
+        if not sentiment.get("mentioned") and term_counts is not None:
+            # Keywords never count without a mention, whatever the lexicon
+            return sentiment, {}, False
+
+        previous = self.lexicons.get(lexicon_version) if term_counts is not None and lexicon_version else None
+        if previous is None:
+            analysis = self.analyze_response(text, brand_name, lexicon)
+            return analysis.sentiment(), analysis.term_counts(), True
+
+        counts = {term: count for term, count in term_counts.items() if term in lexicon.terms}
+        added = lexicon.terms - previous.terms
+        if added:
+            delta = Lexicon(lexicon.positive & added, lexicon.negative & added, version=f"{lexicon.version}-delta")
+            counts.update(self.analyze_response(text, brand_name, delta).term_counts())
+
+        result = sentiment_result(
+            True,
+            sentiment["position"],
+            len(lexicon.positive.intersection(counts)),
+            len(lexicon.negative.intersection(counts))
+        )
+        return result, counts, bool(added)
+
+    def _build_batch_pattern(
+        self,
+        brand_lower: str,
+        lexicon: Lexicon
+    ) -> Tuple["re.Pattern", Optional["re.Pattern"], Dict[str, List[int]], List[str]]:
+        """
+        Compile the lexicon and a brand into regexes for batch tokenizing
+
+        The brand gets its own pattern so its mentions are found even where
+        they overlap a keyword, as with the automaton of analyze_response.
+
+        Returns:
+            Tuple of (keyword pattern, brand pattern or None, columns of each
+            matched keyword, vocabulary); column i of the document-term matrix
+            is vocabulary[i] and the brand is the last column
+        """
+        vocabulary = sorted(lexicon.terms) + [brand_lower]
+        columns: Dict[str, List[int]] = {}
+        for i, term in enumerate(vocabulary[:-1]):
+            if term:
+                columns.setdefault(term, []).append(i)
+        brand_pattern = _lexicon_regex([brand_lower]) if brand_lower else None
+        return _lexicon_regex(list(columns)), brand_pattern, columns, vocabulary
+
+    def term_matrix(
+        self,
+        texts: Sequence[str],
+        brand_name: str,
+        window: Optional[int] = -1,
+        lexicon: Optional[Lexicon] = None
+    ) -> Tuple[DocumentTermMatrix, List[str], np.ndarray]:
+        """
+        Tokenize texts against the lexicon and brand into a sparse count matrix
+
+        All texts are lowercased and joined with newlines (no term spans a
+        newline) and matched in one regex pass for the keywords and one for
+        the brand; match offsets are then mapped back to documents with a
+        binary search. Keywords inside a brand mention or outside the
+        mention window are left out, as in analyze_sentiment.
+
+        Args:
+            texts: Documents to tokenize
+            brand_name: The brand name (last column of the matrix)
+            window: Sentences around each mention whose keywords are kept;
+                None = whole document; -1 (default) = this analyzer's mention_window
+            lexicon: Optional lexicon to use instead of the current one
+
+        Returns:
+            Tuple of (matrix, vocabulary, first brand position per document or -1)
+        """
+        if window == -1:
+            window = self.mention_window
         brand_lower = brand_name.lower()
-        
-        # Check if brand is mentioned
-        mentioned = brand_lower in text_lower
-        
-        if not mentioned:
-            return {
-                "mentioned": False,
-                "sentiment": "NOT_MENTIONED",
-                "confidence": 1.0,
-                "position": -1,
-                "positive_indicators": 0,
-                "negative_indicators": 0
-            }
-        
-        # Find position of first mention
-        position = text_lower.find(brand_lower)
-        
-        # Count sentiment indicators
-        positive_count = sum(1 for word in self.positive_keywords if word in text_lower)
-        negative_count = sum(1 for word in self.negative_keywords if word in text_lower)
-        
-        # Determine sentiment
-        if positive_count > negative_count:
-            sentiment = "POSITIVE"
-        elif negative_count > positive_count:
-            sentiment = "NEGATIVE"
-        else:
-            sentiment = "NEUTRAL"
-        
-        # Calculate confidence
-        total_indicators = positive_count + negative_count
-        if total_indicators > 0:
-            confidence = max(positive_count, negative_count) / total_indicators
-            confidence = min(confidence, 1.0)
-        else:
-            # No clear indicators, low confidence neutral
-            confidence = 0.5
-        
+        pattern, brand_pattern, columns, vocabulary = self._batch_pattern_for(brand_lower, lexicon or self.lexicon)
+        brand_col = len(vocabulary) - 1
+
+        lowered = [text.lower() for text in texts]
+        lengths = np.fromiter((len(text) + 1 for text in lowered), dtype=np.int64, count=len(lowered))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lowered) else np.zeros(0, dtype=np.int64)
+        corpus = "\n".join(lowered)
+
+        mentions = np.asarray(
+            [match.start() for match in brand_pattern.finditer(corpus)] if brand_pattern else [],
+            dtype=np.int64
+        )
+        starts: List[int] = []
+        ends: List[int] = []
+        cols: List[int] = []
+        for match in pattern.finditer(corpus):
+            for col in columns[match.group()]:
+                starts.append(match.start())
+                ends.append(match.end())
+                cols.append(col)
+        start_arr = np.asarray(starts, dtype=np.int64)
+        col_arr = np.asarray(cols, dtype=np.int64)
+
+        # Drop keywords overlapping a brand mention (the last mention starting before the keyword ends)
+        if len(mentions) and len(start_arr):
+            before = np.searchsorted(mentions, np.asarray(ends, dtype=np.int64)) - 1
+            inside = (before >= 0) & (mentions[np.maximum(before, 0)] + len(brand_lower) > start_arr)
+            start_arr, col_arr = start_arr[~inside], col_arr[~inside]
+
+        # Brand mentions and keywords merged back into text order
+        start_arr = np.concatenate((start_arr, mentions))
+        col_arr = np.concatenate((col_arr, np.full(len(mentions), brand_col, dtype=np.int64)))
+        order = np.argsort(start_arr, kind="stable")
+        start_arr, col_arr = start_arr[order], col_arr[order]
+
+        rows = np.searchsorted(offsets, start_arr, side="right") - 1
+        brand_hits = col_arr == brand_col
+
+        # Matches are in text order, so the first brand match per row is its first mention
+        first_position = np.full(len(texts), -1, dtype=np.int64)
+        hit_rows, first = np.unique(rows[brand_hits], return_index=True)
+        first_position[hit_rows] = start_arr[brand_hits][first] - offsets[hit_rows]
+
+        if window is not None and len(start_arr):
+            keep = brand_hits | self._near_mentions(corpus, rows, start_arr, brand_hits, window)
+            rows, col_arr = rows[keep], col_arr[keep]
+
+        matrix = DocumentTermMatrix.from_pairs(rows, col_arr, (len(texts), len(vocabulary)))
+        return matrix, vocabulary, first_position
+
+    @staticmethod
+    def _near_mentions(
+        corpus: str,
+        rows: np.ndarray,
+        starts: np.ndarray,
+        brand_hits: np.ndarray,
+        window: int
+    ) -> np.ndarray:
+        """
+        For each match, whether a brand mention in the same document lies
+        within window sentences of it
+
+        Sentence numbers are global over the joined corpus (the newline
+        between documents always ends a sentence), so the nearest mention
+        sentence on either side is found with one binary search and then
+        checked to be in the same document.
+        """
+        ends = np.fromiter((m.end() for m in SENTENCE_END.finditer(corpus)), dtype=np.int64)
+        sentence = np.searchsorted(ends, starts, side="right")
+        mention_sentence = sentence[brand_hits]
+        mention_row = rows[brand_hits]
+        if not len(mention_sentence):
+            return np.zeros(len(starts), dtype=bool)
+
+        right = np.searchsorted(mention_sentence, sentence)
+        near = np.zeros(len(starts), dtype=bool)
+        for side in (np.maximum(right - 1, 0), np.minimum(right, len(mention_sentence) - 1)):
+            near |= (np.abs(mention_sentence[side] - sentence) <= window) & (mention_row[side] == rows)
+        return near
+
+    def score_batch(
+        self,
+        texts: Sequence[str],
+        brand_name: str,
+        window: Optional[int] = -1
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score many documents at once with array operations
+
+        Equivalent to calling analyze_sentiment on each text, but the
+        lexicon is matched with one regex pass over all documents and all
+        counting, windowing, labelling and confidence math runs on NumPy
+        arrays.
+
+        Args:
+            texts: Documents to score
+            brand_name: The brand name to search for
+            window: Mention window (see term_matrix)
+
+        Returns:
+            Dictionary of arrays, one entry per document: mentioned,
+            sentiment, confidence, position, positive_indicators,
+            negative_indicators, brand_occurrences
+        """
+        lexicon = self.lexicon
+        matrix, vocabulary, position = self.term_matrix(texts, brand_name, window, lexicon)
+        brand_col = len(vocabulary) - 1
+        is_positive = np.array([t in lexicon.positive for t in vocabulary], dtype=bool)
+        is_negative = np.array([t in lexicon.negative for t in vocabulary], dtype=bool)
+        is_positive[brand_col] = is_negative[brand_col] = False
+
+        brand_mask = np.zeros(len(vocabulary), dtype=bool)
+        brand_mask[brand_col] = True
+        occurrences = matrix.row_sums(brand_mask)
+        mentioned = occurrences > 0
+
+        # Indicators count distinct keywords present, not occurrences
+        positive = np.where(mentioned, matrix.row_sums(is_positive, binary=True), 0)
+        negative = np.where(mentioned, matrix.row_sums(is_negative, binary=True), 0)
+
+        total = positive + negative
+        with np.errstate(divide="ignore", invalid="ignore"):
+            confidence = np.where(total > 0, np.maximum(positive, negative) / total, 0.5)
+        confidence = np.where(mentioned, confidence, 1.0)
+
+        label = np.select(
+            [~mentioned, positive > negative, negative > positive],
+            [3, 1, 2],
+            default=0
+        )
         return {
-            "mentioned": True,
-            "sentiment": sentiment,
+            "mentioned": mentioned,
+            "sentiment": LABELS[label],
             "confidence": confidence,
             "position": position,
-            "positive_indicators": positive_count,
-            "negative_indicators": negative_count
+            "positive_indicators": positive,
+            "negative_indicators": negative,
+            "brand_occurrences": occurrences
         }
-    
+
+    def analyze_batch(self, texts: Sequence[str], brand_name: str) -> List[Dict]:
+        """
+        Analyze many texts at once
+
+        Returns:
+            One analyze_sentiment-shaped dictionary per text
+        """
+        scores = self.score_batch(texts, brand_name)
+        return [
+            {
+                "mentioned": bool(scores["mentioned"][i]),
+                "sentiment": str(scores["sentiment"][i]),
+                "confidence": float(scores["confidence"][i]),
+                "position": int(scores["position"][i]),
+                "positive_indicators": int(scores["positive_indicators"][i]),
+                "negative_indicators": int(scores["negative_indicators"][i])
+            }
+            for i in range(len(texts))
+        ]
+
     def analyze_multiple_responses(self, responses: list, brand_name: str) -> Dict:
         """
         Analyze sentiment across multiple responses and aggregate results
@@ -134,7 +682,7 @@ class SentimentAnalyzer:
         Returns:
             Aggregated sentiment analysis
         """
-        analyses = [self.analyze_sentiment(response, brand_name) for response in responses]
+        analyses = self.analyze_batch(responses, brand_name)
         
         mentioned_count = sum(1 for a in analyses if a["mentioned"])
         positive_count = sum(1 for a in analyses if a["sentiment"] == "POSITIVE")
@@ -0,0 +1,177 @@
+"""
+Share of Voice
+Scans LLM responses once for a brand, its aliases and its competitors
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+from backend.models.schemas import BrandVoice, ShareOfVoiceMetrics
+from backend.utils.aho_corasick import AhoCorasick
+
+# Numbered or bulleted list item: "1. **Microsoft Teams** - ...", "- Discord: ..."
+LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+(.+)$", re.MULTILINE)
+
+# Where a list item's name ends and its description starts
+NAME_END = re.compile(r"\s*(?::|\s[-–—]\s|\(|,|\.\s)")
+
+MAX_COMPETITOR_WORDS = 4
+MAX_COMPETITOR_LENGTH = 40
+
+
+def extract_competitors(text: str, brand_name: str, limit: int = 10) -> List[str]:
+    """
+    Read competitor names from an answer to "Who are the main competitors of {brand}?"
+
+    Takes the leading name of each list item ("1. **Microsoft Teams**: ..."
+    -> "Microsoft Teams"), skipping the brand itself and items that look
+    like sentences rather than names.
+
+    Args:
+        text: LLM response text
+        brand_name: The brand whose competitors were asked for
+        limit: Maximum number of names returned
+
+    Returns:
+        Competitor names in the order they were listed
+    """
+    names: List[str] = []
+    seen = {brand_name.casefold()}
+    for item in LIST_ITEM.findall(text):
+        name = NAME_END.split(item.replace("**", "").replace("__", "").strip(), maxsplit=1)[0]
+        name = name.strip(" *_`\"'.")
+        if (
+            not name
+            or not name[0].isupper() and not name[0].isdigit()
+            or len(name) > MAX_COMPETITOR_LENGTH
+            or len(name.split()) > MAX_COMPETITOR_WORDS
+            or name.casefold() in seen
+        ):
+            continue
+        seen.add(name.casefold())
+        names.append(name)
+        if len(names) >= limit:
+            break
+    return names
+
+
+class BrandScanner:
+    """
+    One automaton for a set of brands and their aliases
+
+    Each response is scanned in a single pass. Overlapping matches resolve
+    leftmost-longest, so "Microsoft Teams" is one mention of that brand and
+    not also a mention of an alias "Teams".
+    """
+
+    def __init__(self, brands: Dict[str, Iterable[str]]):
+        """
+        Build the scanner
+
+        Args:
+            brands: Canonical brand name -> aliases (the name itself is always included)
+        """
+        self.brands = list(brands)
+        patterns = []
+        for name, aliases in brands.items():
+            for alias in {name, *aliases}:
+                if alias.strip():
+                    patterns.append((alias.strip().lower(), name))
+        self._automaton = AhoCorasick(((alias, (name, len(alias))) for alias, name in patterns), word_boundaries=True)
+
+    def scan(self, text: str) -> Dict[str, Dict[str, int]]:
+        """
+        Find every brand in a text
+
+        Returns:
+            Brand name -> {"occurrences", "first_position"}, ordered by first
+            position (the mention order); brands not mentioned are left out
+        """
+        matches = sorted(
+            (start, -length, name)
+            for start, (name, length) in self._automaton.iter_matches(text.lower())
+        )
+        found: Dict[str, Dict[str, int]] = {}
+        end = 0
+        for start, neg_length, name in matches:
+            if start < end:
+                continue
+            end = start - neg_length
+            if name in found:
+                found[name]["occurrences"] += 1
+            else:
+                found[name] = {"occurrences": 1, "first_position": start}
+        return found
+
+
+class ShareOfVoiceAnalyzer:
+    """Computes share-of-voice and mention-rank metrics over a set of responses"""
+
+    def analyze(
+        self,
+        responses: List[str],
+        brand_name: str,
+        competitors: List[str],
+        brand_aliases: Optional[List[str]] = None,
+        competitors_source: str = "request"
+    ) -> Optional[ShareOfVoiceMetrics]:
+        """
+        Measure how the brand's mentions compare to its competitors'
+
+        Args:
+            responses: LLM response texts
+            brand_name: The brand being analyzed
+            competitors: Competitor names
+            brand_aliases: Other names that count as mentions of the brand
+            competitors_source: Where the competitor names came from
+
+        Returns:
+            ShareOfVoiceMetrics, or None if there are no competitors to compare with
+        """
+        competitors = [c for c in dict.fromkeys(c.strip() for c in competitors) if c and c.casefold() != brand_name.casefold()]
+        if not competitors:
+            return None
+
+        brands = {brand_name: brand_aliases or [], **{c: [] for c in competitors}}
+        scanner = BrandScanner(brands)
+
+        mentions = {name: 0 for name in brands}
+        responses_mentioned = {name: 0 for name in brands}
+        rank_sums = {name: 0 for name in brands}
+        responses_with_brands = 0
+        brand_first = 0
+
+        for response in responses:
+            found = scanner.scan(response)
+            if not found:
+                continue
+            responses_with_brands += 1
+            for rank, (name, hits) in enumerate(found.items(), start=1):
+                mentions[name] += hits["occurrences"]
+                responses_mentioned[name] += 1
+                rank_sums[name] += rank
+            if next(iter(found)) == brand_name:
+                brand_first += 1
+
+        total_mentions = sum(mentions.values())
+        voices = [
+            BrandVoice(
+                name=name,
+                mentions=mentions[name],
+                responses_mentioned=responses_mentioned[name],
+                share_of_voice=round(mentions[name] / total_mentions * 100, 2) if total_mentions else 0.0,
+                average_rank=round(rank_sums[name] / responses_mentioned[name], 2) if responses_mentioned[name] else None
+            )
+            for name in brands
+        ]
+        target = voices[0]
+        voices.sort(key=lambda v: -v.mentions)
+
+        return ShareOfVoiceMetrics(
+            brand=brand_name,
+            share_of_voice=target.share_of_voice,
+            average_rank=target.average_rank,
+            first_mention_rate=round(brand_first / responses_with_brands * 100, 2) if responses_with_brands else 0.0,
+            competitors_source=competitors_source,
+            brands=voices
+        )
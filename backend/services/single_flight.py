@@ -0,0 +1,84 @@
+"""
+Single Flight
+Coalesces concurrent identical async calls into one shared in-flight task
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it"""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct keys currently being executed"""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run func() for key, or join the call already in flight for that key
+
+        Args:
+            key: Identity of the call
+            func: Zero-argument coroutine factory, only invoked if no call is in flight
+
+        Returns:
+            Tuple of (result, joined) where joined is True if this caller shared
+            a call started by someone else
+
+        Raises:
+            Whatever the shared call raised; every waiter sees the same exception
+        """
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        joined = call is not None and call.task.get_loop() is loop and not call.task.done()
+
+        if joined:
+            self.coalesced += 1
+        else:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.executed += 1
+
+        call.waiters += 1
+        try:
+            # Shield so one waiter being cancelled doesn't cancel the others' call
+            return await asyncio.shield(call.task), joined
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is interested in the result any more
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call):
+        """Drop a finished call so the next caller starts a fresh one"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled():
+            # Mark the exception as retrieved even if every waiter was cancelled
+            call.task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get executed/coalesced counters"""
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight
+        }
@@ -1,8 +1,13 @@
 import json
 import os
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List
+
+# Start of a top-level entry in the file written by _save_waitlist (indent=2)
+ENTRY_START = re.compile(r"\n  \{")
+
 
 class WaitlistService:
     """Service to manage waitlist submissions with JSON file storage"""
@@ -28,8 +33,11 @@ class WaitlistService:
 
     def _save_waitlist(self, waitlist: List[Dict]):
         """Save waitlist data to file"""
-        with open(self.waitlist_file, 'w') as f:
+        # Write a new file and swap it in, so readers never see a half-written list
+        tmp_file = self.waitlist_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
             json.dump(waitlist, f, indent=2)
+        os.replace(tmp_file, self.waitlist_file)
 
     def add_to_waitlist(self, email: str, brand_url: str, preview_data: Dict = None) -> Dict:
         """
@@ -72,6 +80,48 @@ class WaitlistService:
         """Get all waitlist entries"""
         return self._load_waitlist()
 
+    def iter_waitlist(self, chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+        """
+        Yield waitlist entries one at a time
+
+        The file is decoded incrementally, chunk_size characters at a time,
+        so memory use doesn't grow with the size of the waitlist. A malformed
+        entry is logged and skipped: decoding resumes at the next entry, which
+        _save_waitlist always starts on a line indented by two spaces.
+        """
+        decoder = json.JSONDecoder()
+        try:
+            f = open(self.waitlist_file, 'r')
+        except FileNotFoundError:
+            return
+        with f:
+            buffer = ""
+            offset = 0  # Characters of the file before the buffer
+            eof = False
+            while not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                pos = 0
+                while True:
+                    # Skip the list punctuation between entries
+                    while pos < len(buffer) and buffer[pos] in " \t\r\n[],":
+                        pos += 1
+                    if pos == len(buffer):
+                        break
+                    try:
+                        entry, pos = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        next_entry = ENTRY_START.search(buffer, pos + 1)
+                        if next_entry is None and not eof:
+                            break  # Entry continues in the next chunk
+                        print(f"⚠️  Skipping malformed waitlist entry at offset {offset + pos} of {self.waitlist_file}")
+                        pos = next_entry.start() if next_entry else len(buffer)
+                        continue
+                    yield entry
+                buffer = buffer[pos:]
+                offset += pos
+
     def get_entry_by_email(self, email: str) -> Dict | None:
         """Get a specific waitlist entry by email"""
         waitlist = self._load_waitlist()
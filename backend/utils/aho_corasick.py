@@ -0,0 +1,94 @@
+"""
+Aho-Corasick Automaton
+Finds every occurrence of many patterns in one left-to-right pass over a text
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher built once and reused for any number of texts
+
+    Patterns are added with a key (several patterns may share one key).
+    Scanning costs O(len(text) + matches) regardless of how many patterns
+    there are. With word_boundaries, a match whose first or last character
+    is a word character only counts if it isn't glued to another word
+    character, so "good" doesn't match inside "goodbye" while "top-notch"
+    and "C++" still match as written.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Hashable]] = (), word_boundaries: bool = True):
+        """
+        Build the automaton
+
+        Args:
+            patterns: (pattern, key) pairs; patterns are matched as given, so
+                lowercase both patterns and text for case-insensitive matching
+            word_boundaries: Only report matches that start and end on word boundaries
+        """
+        self.word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Patterns ending at each state, including those reached through fail links
+        self._out: List[List[Tuple[int, Hashable]]] = [[]]
+        for pattern, key in patterns:
+            self._add(pattern, key)
+        self._build()
+
+    def _add(self, pattern: str, key: Hashable):
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), key))
+
+    def _build(self):
+        """Compute fail links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, Hashable]]:
+        """
+        Yield (start, key) for every match, in order of where matches end
+
+        Overlapping matches are all reported.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        boundaries = self.word_boundaries
+        last = len(text) - 1
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, key in out[state]:
+                start = i - length + 1
+                if boundaries:
+                    if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+                        continue
+                    if i < last and _is_word_char(ch) and _is_word_char(text[i + 1]):
+                        continue
+                yield start, key
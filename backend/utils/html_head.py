@@ -0,0 +1,190 @@
+"""
+HTML Head Extraction
+Streaming parser that reads only a page's <head> for brand metadata
+"""
+
+import codecs
+import json
+import re
+from html.parser import HTMLParser
+from typing import AsyncIterator, Dict, Optional
+
+ORGANIZATION_TYPES = {"organization", "corporation", "localbusiness", "onlinebusiness", "onlinestore"}
+
+# Tags that can only appear once the head is over
+BODY_TAGS = {"body", "main", "header", "nav", "div", "section", "article", "footer", "h1", "p"}
+
+# Without a charset in the Content-Type header, this much of the page is
+# searched for a declaration before decoding starts (as browsers do)
+PRESCAN_BYTES = 1024
+
+# <meta charset="..."> and <meta http-equiv="Content-Type" content="...; charset=...">;
+# the lookahead keeps a name cut off at the end of a chunk from matching
+META_CHARSET = re.compile(rb"""<meta\s[^>]*?charset\s*=\s*["']?\s*([-\w.:]+)(?=[\s"'/>;])""", re.IGNORECASE)
+HEAD_END = re.compile(rb"</head|<body", re.IGNORECASE)
+
+
+def find_organization_name(data) -> Optional[str]:
+    """Find the name of the first Organization-like node in a JSON-LD document"""
+    if isinstance(data, list):
+        for item in data:
+            name = find_organization_name(item)
+            if name:
+                return name
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    types = data.get("@type", [])
+    types = [types] if isinstance(types, str) else types
+    if any(str(t).lower() in ORGANIZATION_TYPES for t in types):
+        name = data.get("name")
+        if isinstance(name, str) and name.strip():
+            return name.strip()
+
+    for key in ("@graph", "publisher", "author", "brand", "provider"):
+        if key in data:
+            name = find_organization_name(data[key])
+            if name:
+                return name
+    return None
+
+
+class HeadMetadataParser(HTMLParser):
+    """
+    Incremental parser collecting <head> metadata
+
+    Feed it chunks as they arrive; `done` becomes True at </head> (or the
+    first body-level tag), after which the rest of the page can be skipped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.description: Optional[str] = None
+        self.og_site_name: Optional[str] = None
+        self.og_title: Optional[str] = None
+        self.organization_name: Optional[str] = None
+        self._json_ld: Optional[list] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in BODY_TAGS:
+            self.done = True
+            return
+        attributes = {name.lower(): (value or "") for name, value in attrs}
+
+        if tag == "meta":
+            content = attributes.get("content", "").strip()
+            if not content:
+                return
+            name = attributes.get("name", "").lower()
+            prop = attributes.get("property", "").lower()
+            if name == "description" and self.description is None:
+                self.description = content
+            elif prop == "og:site_name" and self.og_site_name is None:
+                self.og_site_name = content
+            elif prop == "og:title" and self.og_title is None:
+                self.og_title = content
+        elif tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._json_ld = []
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            self._json_ld.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._json_ld is not None:
+            text, self._json_ld = "".join(self._json_ld), None
+            if self.organization_name is None:
+                try:
+                    self.organization_name = find_organization_name(json.loads(text))
+                except ValueError:
+                    pass
+        elif tag == "head":
+            self.done = True
+
+    def metadata(self) -> Dict[str, Optional[str]]:
+        """Extracted fields (None when absent)"""
+        return {
+            "description": self.description,
+            "og_site_name": self.og_site_name,
+            "og_title": self.og_title,
+            "organization_name": self.organization_name
+        }
+
+
+async def extract_head_metadata(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int,
+    encoding: Optional[str] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Parse head metadata from a stream of body chunks, stopping early
+
+    Reading stops at the end of the <head> or after max_bytes, whichever
+    comes first; the caller closes the response to drop the rest.
+
+    Args:
+        chunks: Async iterator of raw body bytes (e.g. response.aiter_bytes())
+        max_bytes: Maximum number of bytes to read
+        encoding: Charset from the Content-Type header. Without one, the
+            charset comes from a byte order mark or a <meta> declaration in
+            the first PRESCAN_BYTES, and defaults to UTF-8
+
+    Returns:
+        Dictionary with description, og_site_name, og_title, organization_name
+        and bytes_read
+    """
+    parser = HeadMetadataParser()
+    decoder = _decoder(encoding) if encoding else None
+    pending = b""  # Bytes held back until the charset is known
+    bytes_read = 0
+
+    async for chunk in chunks:
+        if bytes_read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - bytes_read]
+        bytes_read += len(chunk)
+        if decoder is None:
+            pending += chunk
+            if (
+                len(pending) < PRESCAN_BYTES and bytes_read < max_bytes
+                and not META_CHARSET.search(pending) and not HEAD_END.search(pending)
+            ):
+                continue
+            decoder = _decoder(sniff_charset(pending[:PRESCAN_BYTES]))
+            chunk, pending = pending, b""
+        parser.feed(decoder.decode(chunk))
+        if parser.done or bytes_read >= max_bytes:
+            break
+
+    if decoder is None:
+        # The page ended inside the prescan window
+        parser.feed(_decoder(sniff_charset(pending)).decode(pending, final=True))
+
+    metadata = parser.metadata()
+    metadata["bytes_read"] = bytes_read
+    return metadata
+
+
+def sniff_charset(head: bytes) -> Optional[str]:
+    """Charset from a byte order mark or a <meta> declaration at the start of a page"""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = META_CHARSET.search(head)
+    if match is None:
+        return None
+    charset = match.group(1).decode("ascii").lower()
+    # A UTF-16 declaration readable as ASCII can't be true; browsers use UTF-8
+    return "utf-8" if charset.startswith("utf-16") else charset
+
+
+def _decoder(encoding: Optional[str]):
+    """Incremental decoder for the page charset, falling back to UTF-8"""
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
@@ -0,0 +1,194 @@
+"""
+Public Suffix Lookup
+Registrable-domain extraction from a bundled Public Suffix List compiled into a trie
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from backend.config import config
+
+DEFAULT_LIST_PATH = os.path.join(os.path.dirname(__file__), "public_suffix_list.dat")
+
+# Distinct hosts memoized by split_host()
+LOOKUP_CACHE_SIZE = 65536
+
+
+class _Node:
+    """One label of a suffix rule, keyed by the label to its left"""
+
+    __slots__ = ("children", "rule", "exception")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.rule = False
+        self.exception = False
+
+
+def _to_ascii(label: str) -> str:
+    """Punycode one label (rules and hosts are compared in ASCII form)"""
+    if label.isascii():
+        return label
+    try:
+        return label.encode("idna").decode("ascii")
+    except UnicodeError:
+        return label
+
+
+class PublicSuffixTrie:
+    """
+    Public Suffix List rules stored as a trie of reversed labels
+
+    "co.uk" is stored as uk -> co, so looking up a host walks its labels
+    right to left and visits at most one node per label. Wildcard rules
+    ("*.ck") and exception rules ("!www.ck") follow the PSL algorithm;
+    hosts matching no rule fall back to the implicit "*" rule (the TLD).
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self.root = _Node()
+        self.size = 0
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_LIST_PATH) -> "PublicSuffixTrie":
+        """Compile a list in public_suffix_list.dat format"""
+        with open(path, encoding="utf-8") as f:
+            return cls(f)
+
+    def add(self, rule: str):
+        """Add one list line; comments and blank lines are ignored"""
+        rule = rule.strip().split()[0] if rule.strip() else ""
+        if not rule or rule.startswith("//"):
+            return
+
+        exception = rule.startswith("!")
+        labels = rule.lstrip("!").lower().split(".")
+        node = self.root
+        for label in reversed(labels):
+            node = node.children.setdefault(_to_ascii(label), _Node())
+        if exception:
+            node.exception = True
+        else:
+            node.rule = True
+        self.size += 1
+
+    def suffix_length(self, labels: List[str]) -> int:
+        """
+        Number of trailing labels that form the public suffix
+
+        Args:
+            labels: Host labels, left to right, in ASCII form
+        """
+        node = self.root
+        length = 1  # implicit "*" rule
+        depth = 0
+        for label in reversed(labels):
+            wildcard = node.children.get("*")
+            child = node.children.get(label)
+            if child is not None and child.exception:
+                # Exception rules win outright; the suffix is the rule minus its leftmost label
+                return depth
+            if wildcard is not None and wildcard.rule:
+                length = max(length, depth + 1)
+            if child is None:
+                break
+            if child.rule:
+                length = max(length, depth + 1)
+            node = child
+            depth += 1
+        return length
+
+
+_default_trie: Optional[PublicSuffixTrie] = None
+
+
+def get_trie() -> PublicSuffixTrie:
+    """The process-wide trie, compiled from PUBLIC_SUFFIX_LIST_PATH or the bundled list"""
+    global _default_trie
+    if _default_trie is None:
+        _default_trie = PublicSuffixTrie.from_file(config.PUBLIC_SUFFIX_LIST_PATH or DEFAULT_LIST_PATH)
+    return _default_trie
+
+
+def normalize_host(url: str) -> str:
+    """
+    Host of a URL in lowercase ASCII (punycode) form
+
+    The scheme is optional; userinfo, port, path and a trailing dot are
+    dropped. Returns "" if there is no host.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    host = host.rstrip(".").lower()
+    return ".".join(_to_ascii(label) for label in host.split(".")) if host else ""
+
+
+@lru_cache(maxsize=LOOKUP_CACHE_SIZE)
+def split_host(host: str) -> Tuple[str, str, str]:
+    """
+    Split a normalized host into (subdomain, registrable label, public suffix)
+
+    "shop.brand.com.au" -> ("shop", "brand", "com.au"). A host that is itself
+    a public suffix, an IP address or a single label has an empty
+    registrable label.
+    """
+    if not host:
+        return "", "", ""
+    labels = host.split(".")
+    if all(label.isdigit() for label in labels) or ":" in host:
+        return "", "", ""
+
+    n = get_trie().suffix_length(labels)
+    if n >= len(labels):
+        return "", "", host
+    return ".".join(labels[:-n - 1]), labels[-n - 1], ".".join(labels[-n:])
+
+
+def registrable_domain(url: str) -> Optional[str]:
+    """
+    Registrable domain (eTLD+1) of a URL
+
+    Examples:
+        "https://shop.brand.com" -> "brand.com"
+        "brand.com.au:8443/path" -> "brand.com.au"
+        "https://co.uk" -> None
+    """
+    _, label, suffix = split_host(normalize_host(url))
+    return f"{label}.{suffix}" if label else None
+
+
+def map_registrable_domains(urls: Iterable[str]) -> List[Optional[str]]:
+    """
+    registrable_domain() for each URL, in order
+
+    A plain loop that resolves each distinct host once, so long lists with
+    many URLs per site cost one trie walk per site.
+    """
+    resolved: Dict[str, Optional[str]] = {}
+    results = []
+    for url in urls:
+        host = normalize_host(url)
+        if host not in resolved:
+            _, label, suffix = split_host(host)
+            resolved[host] = f"{label}.{suffix}" if label else None
+        results.append(resolved[host])
+    return results
+
+
+def to_unicode(label: str) -> str:
+    """Decode a punycode label for display ("xn--bcher-kva" -> "bücher")"""
+    if not label.startswith("xn--"):
+        return label
+    try:
+        return label.encode("ascii").decode("idna")
+    except UnicodeError:
+        return label
@@ -0,0 +1,92 @@
+"""
+VISIBI - Background Worker
+Pulls brand analysis jobs from the durable job queue and runs them
+
+Usage:
+    python -m backend.worker                  # single worker process
+    python -m backend.worker --processes 4    # one worker per core
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import signal
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import config
+from backend.services.analysis_service import AnalysisService
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.history_store import HistoryStore
+from backend.services.job_queue import JobQueue
+from backend.services.job_worker import JobWorker
+from backend.services.llm_service import build_llm_service
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+
+
+async def run_worker():
+    """Build the services and process jobs until SIGINT/SIGTERM"""
+    llm_service = build_llm_service()
+    brand_analyzer = BrandAnalyzer()
+    analysis_service = AnalysisService(brand_analyzer, SentimentAnalyzer(), llm_service)
+    job_queue = JobQueue(config.JOB_QUEUE_PATH, max_attempts=config.JOB_MAX_ATTEMPTS)
+    history_store = HistoryStore(config.HISTORY_DB_PATH)
+    worker = JobWorker(job_queue, analysis_service, history_store)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass  # Windows
+
+    try:
+        await brand_analyzer.http_client.start()
+        await worker.run()
+    finally:
+        await brand_analyzer.http_client.close()
+        await llm_service.close()
+        job_queue.close()
+        history_store.close()
+
+
+def worker_process_main():
+    """Entry point of a single worker process"""
+    asyncio.run(run_worker())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run VISIBI background analysis workers")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of worker processes to start (default: 1)"
+    )
+    args = parser.parse_args()
+
+    print(f"🚀 Starting {args.processes} worker process(es) on {config.JOB_QUEUE_PATH}")
+    if args.processes <= 1:
+        worker_process_main()
+        return
+
+    processes = [
+        multiprocessing.Process(target=worker_process_main, name=f"visibi-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Children received SIGINT too and finish their current job
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Shared fixtures for the VISIBI test suite
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Keep the SQLite databases created by the app out of backend/data during tests
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="visibi-tests-"))
+
+
+class FakeCompletions:
+    """Fake chat.completions endpoint of the async OpenAI client"""
+
+    def __init__(self, delay=0.02, fail_on=None, responder=None, slow_on=None):
+        self.delay = delay
+        self.fail_on = fail_on or set()
+        self.slow_on = slow_on or {}  # query -> seconds, overriding the default delay
+        self.responder = responder or (lambda query: f"Answer to {query}")
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    async def create(self, model, messages, max_tokens, temperature):
+        query = messages[0]["content"]
+        self.calls.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Later queries finish first, so ordering is actually exercised
+            await asyncio.sleep(self.slow_on.get(query, self.delay / len(self.calls)))
+            if query in self.fail_on:
+                raise RuntimeError(f"boom: {query}")
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=self.responder(query)))],
+                usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20, total_tokens=30)
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def make_fake_client(completions: FakeCompletions):
+    """Wrap fake completions in an object shaped like AsyncOpenAI"""
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """
+    Point the app's LLM service at a fake client and skip homepage fetches
+
+    Returns the FakeCompletions instance so tests can inspect the calls
+    """
+    from backend import main
+    from backend.services.llm_providers import OpenAIProvider
+
+    completions = FakeCompletions(responder=lambda query: f"Slack is excellent. {query}")
+    monkeypatch.setitem(main.llm_service.providers, "openai", OpenAIProvider(client=make_fake_client(completions)))
+    monkeypatch.setattr(main.llm_service, "cache", None)
+
+    async def fake_fetch_brand_info(url):
+        return {
+            "brand_name": main.brand_analyzer.extract_brand_name(url),
+            "url": url,
+            "description": None
+        }
+
+    monkeypatch.setattr(main.brand_analyzer, "fetch_brand_info", fake_fetch_brand_info)
+    return completions
@@ -0,0 +1,38 @@
+"""
+Test suite for the Aho-Corasick automaton
+Tests overlapping matches, shared keys and word boundaries
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.utils.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick:
+    """Test suite for AhoCorasick"""
+
+    def test_overlapping_matches(self):
+        """Test the classic he/she/his/hers example without word boundaries"""
+        automaton = AhoCorasick([(p, p) for p in ["he", "she", "his", "hers"]], word_boundaries=False)
+
+        assert sorted(automaton.iter_matches("ushers")) == [(1, "she"), (2, "he"), (2, "hers")]
+
+    def test_word_boundaries(self):
+        """Test that matches glued to word characters are dropped"""
+        automaton = AhoCorasick([("good", "good"), ("go", "go")])
+
+        assert list(automaton.iter_matches("goodbye, go good")) == [(9, "go"), (12, "good")]
+
+    def test_non_word_edges_need_no_boundary(self):
+        """Test that patterns ending in punctuation match next to letters"""
+        automaton = AhoCorasick([("c++", "cpp")])
+
+        assert list(automaton.iter_matches("c++x")) == [(0, "cpp")]
+
+    def test_empty_automaton(self):
+        """Test that an automaton without patterns matches nothing"""
+        assert list(AhoCorasick().iter_matches("anything")) == []
@@ -0,0 +1,186 @@
+"""
+Test suite for AnalysisService
+Tests the concurrent query pipeline and summary metrics
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.analysis_service import AnalysisService
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.llm_service import LLMService, LLMError
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+@pytest.fixture
+def completions():
+    return FakeCompletions(responder=lambda query: f"Slack is great. {query}")
+
+
+@pytest.fixture
+def service(completions):
+    llm_service = LLMService(model="test-model", client=make_fake_client(completions))
+    return AnalysisService(BrandAnalyzer(), SentimentAnalyzer(), llm_service)
+
+
+class TestQueryPipeline:
+    """Test suite for running queries through the pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_iter_query_analyses_yields_every_query(self, service):
+        """Test that every query is yielded exactly once with its index"""
+        queries = [f"Query {i}" for i in range(5)]
+        results = [item async for item in service.iter_query_analyses(queries, "Slack")]
+
+        assert sorted(index for index, _, _ in results) == list(range(5))
+        for index, query_result, _ in results:
+            assert query_result.query == queries[index]
+
+    @pytest.mark.asyncio
+    async def test_iter_query_analyses_yields_in_completion_order(self, service):
+        """Test that faster queries are yielded before slower ones"""
+        queries = [f"Query {i}" for i in range(4)]
+        results = [item async for item in service.iter_query_analyses(queries, "Slack")]
+
+        # The fake client answers later calls faster
+        assert results[0][0] == 3
+
+    @pytest.mark.asyncio
+    async def test_iter_query_analyses_raises_on_failure(self, completions, service):
+        """Test that a failed query aborts the stream with LLMError"""
+        completions.fail_on = {"Query 1"}
+
+        with pytest.raises(LLMError):
+            async for _ in service.iter_query_analyses(["Query 0", "Query 1"], "Slack"):
+                pass
+
+
+class TestDeadline:
+    """Test suite for latency budgets"""
+
+    @pytest.fixture
+    def offline_service(self, service):
+        async def fetch_brand_info(url):
+            return {"brand_name": "Slack", "url": url, "description": None}
+
+        service.brand_analyzer.fetch_brand_info = fetch_brand_info
+        return service
+
+    @pytest.mark.asyncio
+    async def test_deadline_drops_slow_queries(self, completions, offline_service):
+        """Test that queries still running at the deadline are dropped, not awaited"""
+        completions.slow_on = {"Query 1": 5.0}
+        queries = ["Query 0", "Query 1", "Query 2"]
+
+        response = await offline_service.analyze("https://slack.com", queries=queries, deadline_ms=200)
+
+        assert response.partial is True
+        assert [a.query for a in response.analysis] == ["Query 0", "Query 2"]
+        assert [(d.index, d.query) for d in response.dropped_queries] == [(1, "Query 1")]
+        assert response.summary.total_queries == 2
+        assert response.queries_analyzed == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_outstanding_calls(self, completions, offline_service):
+        """Test that the dropped call is cancelled instead of left running"""
+        completions.slow_on = {"Query 1": 5.0}
+
+        await offline_service.analyze("https://slack.com", queries=["Query 0", "Query 1"], deadline_ms=100)
+        await asyncio.sleep(0.01)
+
+        assert completions.in_flight == 0
+        assert offline_service.llm_service.get_stats()["requests"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_generous_deadline_is_complete(self, offline_service):
+        """Test that a deadline that is not hit changes nothing"""
+        response = await offline_service.analyze("https://slack.com", queries=["Query 0"], deadline_ms=5000)
+
+        assert response.partial is False
+        assert response.dropped_queries is None
+
+
+class TestBatch:
+    """Test suite for batch analyses"""
+
+    def test_dedupe_urls_by_brand(self, service):
+        """Test that URLs of an already-seen brand are skipped"""
+        urls = ["https://www.slack.com", "https://notion.so", "http://slack.com/pricing", " "]
+        unique, duplicates = service.dedupe_urls(urls)
+
+        assert unique == ["https://www.slack.com", "https://notion.so"]
+        assert duplicates == ["http://slack.com/pricing"]
+
+    @pytest.mark.asyncio
+    async def test_iter_batch_reports_failures_per_brand(self, completions, service):
+        """Test that one failing brand doesn't stop the others"""
+        async def fetch_brand_info(url):
+            return {"brand_name": service.brand_analyzer.extract_brand_name(url), "url": url, "description": None}
+
+        service.brand_analyzer.fetch_brand_info = fetch_brand_info
+        completions.fail_on = {"Would you recommend Notion?"}
+
+        results = {}
+        async for index, url, analysis_response, error in service.iter_batch(["https://slack.com", "https://notion.so"]):
+            results[index] = (url, analysis_response, error)
+
+        assert results[0][1].brand_name == "Slack"
+        assert results[0][2] is None
+        assert results[1][1] is None
+        assert "Would you recommend Notion?" in results[1][2]
+
+
+class TestBuildResponse:
+    """Test suite for assembling analysis responses"""
+
+    @pytest.mark.asyncio
+    async def test_build_response_keeps_query_order(self, service):
+        """Test that the final response lists analyses in query order"""
+        queries = ["What is Slack?", "Is Slack good?"]
+        results = [None] * len(queries)
+        usages = []
+        async for index, query_result, usage_data in service.iter_query_analyses(queries, "Slack"):
+            results[index] = query_result
+            usages.append(usage_data)
+
+        response = service.build_response("https://slack.com", "Slack", results, usages)
+
+        assert [a.query for a in response.analysis] == queries
+        assert response.summary.mentions_count == 2
+        assert response.summary.citations >= 2
+        assert response.usage.total_tokens == 60
+
+    @pytest.mark.asyncio
+    async def test_build_response_reads_competitors_from_answers(self, completions, service):
+        """Test that share of voice uses competitors listed in the competitors query's answer"""
+        completions.responder = lambda query: (
+            "1. **Discord**: chat for communities\n2. **Zoom** - video" if "competitors" in query
+            else "Slack beats Discord."
+        )
+        queries = ["Who are the main competitors of Slack?", "Is Slack good?"]
+        results = [None] * len(queries)
+        usages = []
+        async for index, query_result, usage_data in service.iter_query_analyses(queries, "Slack"):
+            results[index] = query_result
+            usages.append(usage_data)
+
+        response = service.build_response("https://slack.com", "Slack", results, usages)
+
+        assert response.share_of_voice.competitors_source == "responses"
+        assert {b.name for b in response.share_of_voice.brands} == {"Slack", "Discord", "Zoom"}
+        assert response.share_of_voice.first_mention_rate == 50.0
+
+    @pytest.mark.asyncio
+    async def test_citations_come_from_the_query_scan(self, completions, service):
+        """Test that each analysis carries its citation count and the summary sums them"""
+        completions.responder = lambda query: "Slack, Slack and Slack."
+        results = [item[1] async for item in service.iter_query_analyses(["Q1", "Q2"], "Slack")]
+
+        assert [a.citations for a in results] == [3, 3]
+        assert service.build_summary(results, "Slack").citations == 6
@@ -3,6 +3,8 @@ Test suite for API endpoints
 Tests FastAPI routes and responses
 """
 
+import asyncio
+import json
 import pytest
 from fastapi.testclient import TestClient
 import sys
@@ -185,6 +187,91 @@ class TestHistoryEndpoint:
             assert data["total_count"] >= 1
 
 
+class TestHistoryPagination:
+    """Test suite for history cursors, filters and the summary projection"""
+    
+    @pytest.fixture
+    def three_runs(self, client, fake_llm):
+        client.delete("/api/brands/history")
+        for url in ("https://slack.com", "https://notion.so", "https://www.slack.com"):
+            client.post("/api/brands/analyze", json={"url": url, "queries": ["What is it?"]})
+    
+    def test_cursor_walks_every_page(self, client, three_runs):
+        """Test that following next_cursor visits each analysis once"""
+        first = client.get("/api/brands/history?limit=2").json()
+        second = client.get(f"/api/brands/history?limit=2&cursor={first['next_cursor']}").json()
+        
+        assert first["total_count"] == 3
+        assert [a["url"] for a in first["analyses"] + second["analyses"]] == [
+            "https://www.slack.com", "https://notion.so", "https://slack.com"
+        ]
+        assert second["next_cursor"] is None
+    
+    def test_filters(self, client, three_runs):
+        """Test brand and visibility filters"""
+        data = client.get("/api/brands/history?brand=slack").json()
+        assert data["total_count"] == 2
+        assert {a["brand_name"] for a in data["analyses"]} == {"Slack"}
+        
+        assert client.get("/api/brands/history?min_visibility=101").json()["total_count"] == 0
+    
+    def test_summary_projection_has_no_responses(self, client, three_runs):
+        """Test that summaries carry metrics but no LLM response text"""
+        response = client.get("/api/brands/history/summary?sentiment=positive&brand=Slack")
+        
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert len(items) == 2
+        assert items[0]["summary"]["overall_sentiment"] == "POSITIVE"
+        assert items[0]["usage"]["total_tokens"] > 0
+        assert "analysis" not in items[0]
+        assert "Slack is excellent" not in response.text
+    
+    def test_responses_loaded_on_demand(self, client, three_runs):
+        """Test include_responses=false and fetching a response by hash"""
+        item = client.get("/api/brands/history?limit=1&include_responses=false").json()["analyses"][0]["analysis"][0]
+        
+        assert item["response"] == ""
+        response = client.get(f"/api/brands/history/responses/{item['response_hash']}")
+        assert response.status_code == 200
+        assert response.json()["response"].startswith("Slack is excellent")
+        assert client.get("/api/brands/history/responses/unknown").status_code == 404
+    
+    def test_trends_from_rollups(self, client, three_runs):
+        """Test that today's trend counts every stored run of the brand"""
+        data = client.get("/api/brands/trends?brand=slack").json()
+        
+        assert data["until"] == data["days"][-1]["day"]
+        assert data["days"][-1]["runs"] == 2
+        assert data["days"][-1]["visibility"] == 100.0
+        assert client.get("/api/brands/trends?since=2024-02-01&until=2024-01-01").status_code == 400
+    
+    def test_export_streams_ndjson_and_csv(self, client, three_runs):
+        """Test the history export in both formats"""
+        response = client.get("/api/brands/history/export?brand=slack")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        lines = response.text.splitlines()
+        assert [json.loads(line)["url"] for line in lines] == ["https://www.slack.com", "https://slack.com"]
+
+        response = client.get("/api/brands/history/export?format=csv&view=summary")
+        assert response.headers["content-type"].startswith("text/csv")
+        assert len(response.text.strip().splitlines()) == 4
+
+    def test_export_rejects_unknown_format(self, client):
+        """Test that unsupported export formats get a 400"""
+        assert client.get("/api/brands/history/export?format=xml").status_code == 400
+        assert client.get("/api/brands/history/export?view=everything").status_code == 400
+        assert client.get("/api/waitlist/export?format=xml").status_code == 400
+
+    def test_bad_cursor_and_sentiment_are_rejected(self, client):
+        """Test that malformed parameters get a 400"""
+        assert client.get("/api/brands/history?cursor=not-a-cursor").status_code == 400
+        assert client.get("/api/brands/history/summary?sentiment=great").status_code == 400
+
+
 class TestClearHistoryEndpoint:
     """Test suite for clear history endpoint"""
     
@@ -236,3 +323,186 @@ class TestAPIDocumentation:
         assert "openapi" in schema
         assert "info" in schema
         assert "paths" in schema
+
+
+class TestAnalyzeStreamEndpoint:
+    """Test suite for the streaming analyze endpoint"""
+    
+    def test_stream_emits_query_frames_then_summary(self, client, fake_llm):
+        """Test that each query is streamed and a summary closes the stream"""
+        payload = {
+            "url": "https://www.slack.com",
+            "queries": ["What is Slack?", "Is Slack good?", "Would you recommend Slack?"]
+        }
+        response = client.post("/api/brands/analyze/stream", json=payload)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        assert frames[0]["type"] == "start"
+        assert frames[-1]["type"] == "summary"
+        
+        query_frames = [f for f in frames if f["type"] == "query"]
+        assert sorted(f["index"] for f in query_frames) == [0, 1, 2]
+        assert all("sentiment_analysis" in f["analysis"] for f in query_frames)
+        assert frames[-1]["summary"]["total_queries"] == 3
+        assert frames[-1]["usage"]["total_tokens"] == 90
+    
+    def test_stream_reports_llm_errors_in_band(self, client, fake_llm):
+        """Test that an LLM failure after streaming started is sent as an error frame"""
+        fake_llm.fail_on = {"Is Slack good?"}
+        payload = {"url": "https://www.slack.com", "queries": ["What is Slack?", "Is Slack good?"]}
+        response = client.post("/api/brands/analyze/stream", json=payload)
+        
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        assert frames[-1]["type"] == "error"
+
+
+class TestLexiconEndpoints:
+    """Test suite for the sentiment lexicon and history re-scoring endpoints"""
+    
+    def test_lexicon_endpoint_reports_version(self, client):
+        """Test that the current lexicon and its version are returned"""
+        data = client.get("/api/sentiment/lexicon").json()
+        
+        assert data["version"]
+        assert "great" in data["positive"]
+    
+    def test_reload_without_file_is_rejected(self, client):
+        """Test that reloading needs SENTIMENT_LEXICON_PATH"""
+        assert client.post("/api/sentiment/lexicon/reload").status_code == 400
+    
+    def test_rescore_history_uses_stored_counts(self, client, fake_llm):
+        """Test that freshly scored history needs no rescanning"""
+        client.delete("/api/brands/history")
+        client.post("/api/brands/analyze", json={"url": "https://www.slack.com", "queries": ["What is Slack?"]})
+        
+        data = client.post("/api/brands/history/rescore").json()
+        
+        assert data["analyses"] == 1
+        assert data["updated"] == 0
+        assert data["responses_scanned"] == 0
+    
+    def test_rescore_history_rewrites_stale_analyses(self, client, fake_llm):
+        """Test that only analyses scored with another lexicon are rewritten"""
+        from backend import main
+        
+        client.delete("/api/brands/history")
+        for url in ("https://www.slack.com", "https://notion.so"):
+            client.post("/api/brands/analyze", json={"url": url, "queries": ["What is it?"]})
+        record_id, data = next(main.history_store.iter_records())
+        stale = json.loads(data)
+        stale["analysis"][0]["lexicon_version"] = "old"
+        main.history_store.update_many([(record_id, json.dumps(stale))])
+        
+        data = client.post("/api/brands/history/rescore").json()
+        
+        assert data["analyses"] == 2
+        assert data["updated"] == 1
+        assert main.history_store.get(record_id).analysis[0].lexicon_version == data["lexicon_version"]
+
+
+class TestAnalyzeDeadline:
+    """Test suite for latency budgets on the analyze endpoint"""
+    
+    def test_deadline_returns_partial_results(self, client, fake_llm):
+        """Test that a query slower than deadline_ms is dropped from the response"""
+        fake_llm.slow_on = {"Is Slack good?": 5.0}
+        payload = {
+            "url": "https://www.slack.com",
+            "queries": ["What is Slack?", "Is Slack good?"],
+            "deadline_ms": 300
+        }
+        response = client.post("/api/brands/analyze", json=payload)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["partial"] is True
+        assert [a["query"] for a in data["analysis"]] == ["What is Slack?"]
+        assert data["dropped_queries"][0]["query"] == "Is Slack good?"
+        assert data["summary"]["total_queries"] == 1
+
+
+class TestBatchAnalyzeEndpoint:
+    """Test suite for the batch analyze endpoint"""
+    
+    def test_batch_streams_one_result_per_brand(self, client, fake_llm):
+        """Test that duplicate brands are skipped and each brand is streamed"""
+        payload = {
+            "urls": ["https://www.slack.com", "https://notion.so", "https://slack.com/pricing"],
+            "queries": ["Is it good?"]
+        }
+        response = client.post("/api/brands/analyze/batch", json=payload)
+        
+        assert response.status_code == 200
+        frames = [json.loads(line) for line in response.text.splitlines() if line]
+        assert frames[0] == {
+            "type": "start",
+            "urls": ["https://www.slack.com", "https://notion.so"],
+            "duplicates": ["https://slack.com/pricing"]
+        }
+        results = [f for f in frames if f["type"] == "result"]
+        assert sorted(f["analysis"]["brand_name"] for f in results) == ["Notion", "Slack"]
+        assert frames[-1] == {"type": "done", "analyzed": 2, "failed": 0}
+        # Both brands asked the same query: one shared LLM call
+        assert fake_llm.calls == ["Is it good?"]
+    
+    def test_batch_async_job(self, client, fake_llm):
+        """Test that ?async_job=true queues a batch_analysis job"""
+        payload = {"urls": ["https://www.slack.com"]}
+        response = client.post("/api/brands/analyze/batch?async_job=true", json=payload)
+        
+        assert response.status_code == 202
+        job = client.get(response.json()["status_url"]).json()
+        assert job["kind"] == "batch_analysis"
+    
+    def test_batch_rejects_empty_list(self, client, fake_llm):
+        """Test that a batch without URLs is a 400"""
+        response = client.post("/api/brands/analyze/batch", json={"urls": []})
+        assert response.status_code == 400
+
+
+class TestAsyncAnalyzeJobs:
+    """Test suite for queued (async) analyses"""
+    
+    def test_async_analyze_returns_job_handle(self, client, fake_llm):
+        """Test that ?async_job=true returns 202 with a pollable job id"""
+        payload = {"url": "https://www.slack.com", "queries": ["What is Slack?"]}
+        response = client.post("/api/brands/analyze?async_job=true", json=payload)
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "queued"
+        
+        job_response = client.get(data["status_url"])
+        assert job_response.status_code == 200
+        assert job_response.json()["status"] in ["queued", "running", "completed"]
+    
+    def test_job_result_is_added_to_history(self, client, fake_llm):
+        """Test that an analysis run by the job worker shows up in the history"""
+        from backend import main
+        from backend.services.job_worker import JobWorker
+        
+        client.delete("/api/brands/history")
+        payload = {"url": "https://www.slack.com", "queries": ["What is Slack?"]}
+        job_id = client.post("/api/brands/analyze?async_job=true", json=payload).json()["job_id"]
+        
+        worker = JobWorker(main.job_queue, main.analysis_service, main.history_store, poll_interval=0.01)
+        
+        async def drain():
+            while await worker.run_once():
+                pass
+        
+        asyncio.run(drain())
+        
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["status"] == "completed"
+        # Jobs queued by earlier tests are drained too, so look for this one's result
+        analyses = client.get("/api/brands/history?brand=slack&limit=100").json()["analyses"]
+        assert job["result"]["timestamp"] in [a["timestamp"] for a in analyses]
+    
+    def test_unknown_job_returns_404(self, client):
+        """Test that unknown job ids return 404"""
+        response = client.get("/api/jobs/does-not-exist")
+        assert response.status_code == 404
@@ -0,0 +1,62 @@
+"""
+Test suite for the content-addressed blob store
+Tests deduplication, compression and reference counting
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.blob_store import BlobStore, content_hash
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    store = BlobStore(str(tmp_path / "blobs.sqlite3"))
+    yield store
+    store.close()
+
+
+class TestBlobStore:
+    """Test suite for BlobStore"""
+
+    def test_round_trip(self, blobs):
+        """Test that texts come back unchanged, keyed by content hash"""
+        text = "Slack is an excellent team collaboration tool. 日本語もOK."
+        key = blobs.put(text)
+
+        assert key == content_hash(text)
+        assert blobs.get(key) == text
+        assert blobs.get(content_hash("something else")) is None
+
+    def test_identical_texts_are_stored_once(self, blobs):
+        """Test that repeated answers share one compressed copy"""
+        answer = "Slack is a messaging platform for teams. " * 50
+        hashes = blobs.put_many([answer, answer, "Other answer"])
+        blobs.put(answer)
+
+        stats = blobs.get_stats()
+        assert hashes[0] == hashes[1]
+        assert stats["blobs"] == 2
+        assert stats["references_count"] == 4
+        assert stats["stored_bytes"] < stats["raw_bytes"] / 5
+
+    def test_blob_deleted_with_last_reference(self, blobs):
+        """Test that releasing drops a blob only when nothing references it"""
+        key = blobs.put("shared")
+        blobs.put("shared")
+
+        blobs.release_many([key])
+        assert blobs.get(key) == "shared"
+        blobs.release_many([key])
+        assert blobs.get(key) is None
+
+    def test_get_many_beyond_parameter_chunk(self, blobs):
+        """Test lookups of more hashes than fit in one IN (...) query"""
+        texts = [f"answer {i}" for i in range(1200)]
+        hashes = blobs.put_many(texts)
+
+        assert blobs.get_many(hashes) == dict(zip(hashes, texts))
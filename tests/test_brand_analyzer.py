@@ -63,7 +63,16 @@ class TestBrandNameExtraction:
         """Test extraction from URL with subdomain"""
         url = "https://app.notion.so"
         brand = analyzer.extract_brand_name(url)
-        assert brand.lower() == "app"
+        assert brand.lower() == "notion"
+
+    def test_extract_brand_with_multi_label_suffix(self, analyzer):
+        """Test extraction when the public suffix has more than one label"""
+        assert analyzer.extract_brand_name("https://shop.brand.com.au:8443/path") == "Brand"
+
+    def test_map_brand_names(self, analyzer):
+        """Test that mapping many URLs keeps input order and survives a malformed one"""
+        urls = ["https://slack.com", "notion.so", "http://x.com:99999", "https://www.slack.com/pricing"]
+        assert analyzer.map_brand_names(urls) == ["Slack", "Notion", "X", "Slack"]
 
 
 class TestBrandInfoFetching:
@@ -0,0 +1,129 @@
+"""
+Test suite for the brand info cache
+Tests URL normalization, revalidation, negative caching and coalescing
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.brand_info_cache import BrandInfoCache, normalize_url
+from backend.services.http_client import AsyncHTTPClient
+
+PAGE = b'<html><head><meta name="description" content="Team chat"></head><body></body></html>'
+
+
+class Homepage:
+    """Mock transport handler serving a page with an ETag, honoring If-None-Match"""
+
+    def __init__(self, etag='"v1"', fail=None, delay=0.0):
+        self.etag = etag
+        self.fail = fail
+        self.delay = delay
+        self.requests = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        if self.fail is not None:
+            raise self.fail
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"etag": self.etag})
+        return httpx.Response(200, content=PAGE, headers={"etag": self.etag, "content-type": "text/html"})
+
+
+def make_analyzer(handler, **cache_kwargs):
+    client = AsyncHTTPClient(transport=httpx.MockTransport(handler))
+    return BrandAnalyzer(http_client=client, cache=BrandInfoCache(**cache_kwargs))
+
+
+class TestNormalizeUrl:
+    """Test suite for normalize_url"""
+
+    def test_equivalent_urls_share_a_key(self):
+        """Test that case, default ports, fragments and trailing slashes don't matter"""
+        assert normalize_url("HTTPS://Slack.com:443/#top") == normalize_url("https://slack.com")
+        assert normalize_url("slack.com/") == "https://slack.com"
+
+    def test_distinct_urls_differ(self):
+        """Test that paths and non-default ports are kept"""
+        assert normalize_url("https://slack.com/pricing") != normalize_url("https://slack.com")
+        assert normalize_url("http://localhost:8080") == "http://localhost:8080"
+
+    def test_invalid_port_does_not_raise(self):
+        """Test that an out-of-range port gives a key instead of a ValueError"""
+        assert normalize_url("http://X.com:99999/") == "http://x.com:99999/"
+
+
+class TestBrandInfoCache:
+    """Test suite for cached fetch_brand_info"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_fetch(self):
+        """Test that a second lookup within the TTL doesn't hit the network"""
+        handler = Homepage()
+        analyzer = make_analyzer(handler)
+
+        first = await analyzer.fetch_brand_info("https://slack.com")
+        second = await analyzer.fetch_brand_info("https://Slack.com/")
+
+        assert len(handler.requests) == 1
+        assert second["description"] == first["description"] == "Team chat"
+        assert second["url"] == "https://Slack.com/"
+        assert analyzer.cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated(self):
+        """Test that an expired entry sends If-None-Match and reuses the cached info on 304"""
+        handler = Homepage()
+        analyzer = make_analyzer(handler, ttl_seconds=0)
+
+        await analyzer.fetch_brand_info("https://slack.com")
+        result = await analyzer.fetch_brand_info("https://slack.com")
+
+        assert handler.requests[1].headers["if-none-match"] == '"v1"'
+        assert result["description"] == "Team chat"
+        assert analyzer.cache.get_stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_host_is_negatively_cached(self):
+        """Test that a host that timed out is not retried until the negative TTL passes"""
+        handler = Homepage(fail=httpx.ReadTimeout("slow"))
+        analyzer = make_analyzer(handler)
+
+        first = await analyzer.fetch_brand_info("https://slow.example")
+        second = await analyzer.fetch_brand_info("https://slow.example")
+
+        assert len(handler.requests) == 1
+        assert first["brand_name"] == second["brand_name"] == "Slow"
+        assert analyzer.cache.get_stats()["negative_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_revalidation_serves_stale_info(self):
+        """Test that a host failing on revalidation keeps its last known info"""
+        handler = Homepage()
+        analyzer = make_analyzer(handler, ttl_seconds=0)
+
+        await analyzer.fetch_brand_info("https://slack.com")
+        handler.fail = httpx.ConnectError("down")
+        result = await analyzer.fetch_brand_info("https://slack.com")
+
+        assert result["description"] == "Team chat"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_are_coalesced(self):
+        """Test that simultaneous lookups of one URL share a single request"""
+        handler = Homepage(delay=0.02)
+        analyzer = make_analyzer(handler)
+
+        results = await asyncio.gather(*(analyzer.fetch_brand_info("https://slack.com") for _ in range(5)))
+
+        assert len(handler.requests) == 1
+        assert all(r["description"] == "Team chat" for r in results)
@@ -0,0 +1,94 @@
+"""
+Test suite for CompletionCache
+Tests key normalization, LRU/TTL behaviour and the on-disk tier
+"""
+
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.completion_cache import CompletionCache
+from backend.services.llm_service import LLMService
+from tests.conftest import FakeCompletions, make_fake_client
+
+USAGE = {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+
+
+class TestCompletionCache:
+    """Test suite for the two-tier completion cache"""
+
+    def test_key_normalizes_whitespace_and_case(self):
+        """Test that trivially different queries share a key"""
+        key1 = CompletionCache.make_key("gpt-4o-mini", "What is  Slack?", 0.7, 500)
+        key2 = CompletionCache.make_key("gpt-4o-mini", " what is slack? ", 0.7, 500)
+        assert key1 == key2
+
+    def test_key_depends_on_model_and_parameters(self):
+        """Test that model, temperature and max_tokens are part of the key"""
+        base = CompletionCache.make_key("gpt-4o-mini", "q", 0.7, 500)
+        assert base != CompletionCache.make_key("gpt-4o", "q", 0.7, 500)
+        assert base != CompletionCache.make_key("gpt-4o-mini", "q", 0.2, 500)
+        assert base != CompletionCache.make_key("gpt-4o-mini", "q", 0.7, 100)
+
+    def test_get_and_set_count_hits_and_misses(self):
+        """Test round trip and hit/miss counters"""
+        cache = CompletionCache()
+        assert cache.get("k") is None
+        cache.set("k", "gpt-4o-mini", "answer", USAGE)
+
+        assert cache.get("k") == ("answer", USAGE)
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted from memory"""
+        cache = CompletionCache(max_entries=2)
+        cache.set("a", "m", "A", USAGE)
+        cache.set("b", "m", "B", USAGE)
+        cache.get("a")
+        cache.set("c", "m", "C", USAGE)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not served"""
+        cache = CompletionCache(ttl_seconds=0.01)
+        cache.set("k", "m", "answer", USAGE)
+        time.sleep(0.02)
+        assert cache.get("k") is None
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that the SQLite tier serves entries to a fresh instance"""
+        db_path = str(tmp_path / "cache.sqlite3")
+        cache = CompletionCache(db_path=db_path)
+        cache.set("k", "m", "answer", USAGE)
+        cache.close()
+
+        reopened = CompletionCache(db_path=db_path)
+        assert reopened.get("k") == ("answer", USAGE)
+        assert reopened.get_stats()["disk_hits"] == 1
+
+
+class TestCachedLLMService:
+    """Test suite for LLMService with a completion cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_served_from_cache(self):
+        """Test that a repeated query skips the API and is flagged as cached"""
+        completions = FakeCompletions()
+        service = LLMService(model="m", client=make_fake_client(completions), cache=CompletionCache())
+
+        _, first_usage = await service.complete("What is Slack?")
+        text, usage = await service.complete("what is slack?")
+
+        assert len(completions.calls) == 1
+        assert first_usage["cached"] is False
+        assert usage["cached"] is True
+        assert usage["total_tokens"] == 30
+        assert text == "Answer to What is Slack?"
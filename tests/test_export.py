@@ -0,0 +1,171 @@
+"""
+Test suite for the export service
+Tests NDJSON/CSV streaming of history and the incremental waitlist reader
+"""
+
+import csv
+import io
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.models.schemas import AnalysisResponse
+from backend.services.export_service import (
+    QUERY_COLUMNS,
+    SUMMARY_COLUMNS,
+    export_history,
+    export_waitlist,
+    iter_history,
+    to_chunks
+)
+from backend.services.history_store import HistoryStore
+from backend.services.waitlist_service import WaitlistService
+from tests.test_history_store import make_analysis
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def waitlist(tmp_path):
+    service = WaitlistService(str(tmp_path / "waitlist"))
+    for i in range(5):
+        service.add_to_waitlist(f"user{i}@example.com", f"https://brand{i}.com", {"note": "x" * 50})
+    return service
+
+
+def body(chunks) -> str:
+    return b"".join(chunks).decode("utf-8")
+
+
+class TestHistoryExport:
+    """Test suite for streaming history exports"""
+
+    def test_iter_history_crosses_pages(self, store):
+        """Test that the page cursor is followed to the last analysis"""
+        for i in range(7):
+            store.add(make_analysis(minutes_ago=i))
+
+        assert len(list(iter_history(store, batch_size=3))) == 7
+
+    def test_ndjson_round_trips(self, store):
+        """Test that each NDJSON line parses back to the stored analysis"""
+        store.add(make_analysis(brand="Slack", minutes_ago=1, responses=("Slack is great",)))
+        store.add(make_analysis(brand="Notion", responses=("Notion is fine",)))
+
+        lines = body(export_history(store, "ndjson")).splitlines()
+        analyses = [AnalysisResponse.model_validate_json(line) for line in lines]
+
+        assert [a.brand_name for a in analyses] == ["Notion", "Slack"]
+        assert analyses[1].analysis[0].response == "Slack is great"
+
+    def test_ndjson_without_responses(self, store):
+        """Test that include_responses=False leaves the texts out"""
+        store.add(make_analysis(responses=("Slack is great",)))
+
+        assert "Slack is great" not in body(export_history(store, "ndjson", include_responses=False))
+
+    def test_csv_has_one_row_per_query(self, store):
+        """Test the full CSV view, including quoting of commas and newlines"""
+        store.add(make_analysis(responses=("Fast, reliable\nand cheap", "Fine")))
+
+        rows = list(csv.DictReader(io.StringIO(body(export_history(store, "csv")))))
+
+        assert len(rows) == 2
+        assert list(rows[0]) == QUERY_COLUMNS
+        assert rows[0]["response"] == "Fast, reliable\nand cheap"
+
+    def test_summary_csv_and_filters(self, store):
+        """Test the summary view with a brand filter"""
+        store.add(make_analysis(brand="Slack", visibility=50.0))
+        store.add(make_analysis(brand="Notion"))
+
+        rows = list(csv.DictReader(io.StringIO(body(export_history(store, "csv", "summary", brand="slack")))))
+
+        assert len(rows) == 1
+        assert list(rows[0]) == SUMMARY_COLUMNS
+        assert rows[0]["brand_name"] == "Slack"
+        assert float(rows[0]["visibility"]) == 50.0
+
+    def test_empty_csv_has_header(self, store):
+        """Test that an empty export is still a valid CSV"""
+        assert body(export_history(store, "csv", "summary")).strip() == ",".join(SUMMARY_COLUMNS)
+
+    def test_unknown_format_rejected(self, store):
+        """Test that bad formats and views fail before streaming starts"""
+        with pytest.raises(ValueError):
+            export_history(store, "xml")
+        with pytest.raises(ValueError):
+            export_history(store, "csv", "everything")
+
+    def test_export_is_lazy(self, store):
+        """Test that nothing is read until the consumer pulls the first chunk"""
+        chunks = export_history(store, "ndjson")
+        store.add(make_analysis())
+
+        assert len(body(chunks).splitlines()) == 1
+
+
+class TestChunks:
+    """Test suite for grouping lines into write-sized chunks"""
+
+    def test_lines_are_grouped(self):
+        """Test that small lines are batched and nothing is lost"""
+        chunks = list(to_chunks((f"line {i}\n" for i in range(100)), chunk_bytes=64))
+
+        assert 1 < len(chunks) < 100
+        assert b"".join(chunks).decode().splitlines() == [f"line {i}" for i in range(100)]
+
+
+class TestWaitlistExport:
+    """Test suite for the incremental waitlist reader and its exports"""
+
+    def test_iter_matches_load(self, waitlist):
+        """Test that reading across chunk boundaries yields every entry intact"""
+        assert list(waitlist.iter_waitlist(chunk_size=16)) == waitlist.get_waitlist()
+
+    def test_iter_empty_and_missing(self, waitlist):
+        """Test an empty list and a missing file"""
+        waitlist.waitlist_file.write_text("[]")
+        assert list(waitlist.iter_waitlist()) == []
+
+        waitlist.waitlist_file.unlink()
+        assert list(waitlist.iter_waitlist()) == []
+
+    def test_iter_stops_at_malformed_data(self, waitlist):
+        """Test that a truncated file yields the complete entries before the damage"""
+        text = waitlist.waitlist_file.read_text()
+        waitlist.waitlist_file.write_text(text[:len(text) // 2])
+
+        entries = list(waitlist.iter_waitlist(chunk_size=32))
+
+        assert 0 < len(entries) < 5
+        assert [entry["email"] for entry in entries] == [f"user{i}@example.com" for i in range(len(entries))]
+
+    def test_iter_skips_corrupt_entry(self, waitlist, capsys):
+        """Test that a malformed entry in the middle is skipped and the rest still read"""
+        text = waitlist.waitlist_file.read_text()
+        waitlist.waitlist_file.write_text(text.replace('"https://brand2.com"', 'https://brand2.com"'))
+
+        entries = list(waitlist.iter_waitlist(chunk_size=16))
+
+        assert [entry["email"] for entry in entries] == [f"user{i}@example.com" for i in (0, 1, 3, 4)]
+        assert "Skipping malformed waitlist entry at offset" in capsys.readouterr().out
+
+    def test_ndjson_and_csv(self, waitlist):
+        """Test both waitlist export formats"""
+        lines = body(export_waitlist(waitlist, "ndjson")).splitlines()
+        assert [json.loads(line)["email"] for line in lines] == [f"user{i}@example.com" for i in range(5)]
+
+        rows = list(csv.DictReader(io.StringIO(body(export_waitlist(waitlist, "csv")))))
+        assert [row["brand_url"] for row in rows] == [f"https://brand{i}.com" for i in range(5)]
+        assert rows[0]["status"] == "pending"
+        assert "preview_data" not in rows[0]
@@ -0,0 +1,163 @@
+"""
+Test suite for hedged LLM requests
+Tests the per-model latency tracker and duplicate requests for stragglers
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import config
+from backend.services.latency_tracker import LatencyTracker
+from backend.services.llm_service import LLMService
+from tests.conftest import make_fake_client
+
+
+class StragglerCompletions:
+    """Fake completions where the first call for each query is a straggler"""
+
+    def __init__(self, straggler_delay=5.0, delay=0.01):
+        self.straggler_delay = straggler_delay
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, model, messages, max_tokens, temperature):
+        query = messages[0]["content"]
+        first = query not in self.calls
+        self.calls.append(query)
+        await asyncio.sleep(self.straggler_delay if first else self.delay)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"Answer to {query}"))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20, total_tokens=30)
+        )
+
+
+@pytest.fixture
+def hedge_config(monkeypatch):
+    monkeypatch.setattr(config, "LLM_HEDGE_MIN_DELAY_SECONDS", 0.0)
+    monkeypatch.setattr(config, "LLM_HEDGE_PERCENTILE", 95.0)
+    monkeypatch.setattr(config, "LLM_HEDGE_BUDGET_RATIO", 0.1)
+
+
+def make_service(completions, samples=20, hedge=True):
+    service = LLMService(model="m", client=make_fake_client(completions), hedge=hedge)
+    for _ in range(samples):
+        service.latency.record("m", 0.05)
+    # Pretend enough primary calls were made to afford hedges
+    service.calls = 100
+    return service
+
+
+class TestLatencyTracker:
+    """Test suite for LatencyTracker"""
+
+    def test_percentile_needs_min_samples(self):
+        """Test that no threshold is given until enough samples exist"""
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record("m", 1.0)
+        tracker.record("m", 2.0)
+
+        assert tracker.percentile("m", 95) is None
+        tracker.record("m", 3.0)
+        assert tracker.percentile("m", 95) == 3.0
+
+    def test_percentile_is_per_model(self):
+        """Test that models keep separate windows"""
+        tracker = LatencyTracker(min_samples=1)
+        for i in range(1, 101):
+            tracker.record("fast", i / 100)
+        tracker.record("slow", 10.0)
+
+        assert tracker.percentile("fast", 50) == 0.5
+        assert tracker.percentile("fast", 99) == 0.99
+        assert tracker.percentile("slow", 50) == 10.0
+
+    def test_window_drops_old_samples(self):
+        """Test that only the most recent samples count"""
+        tracker = LatencyTracker(window=2, min_samples=1)
+        for seconds in [9.0, 1.0, 1.0]:
+            tracker.record("m", seconds)
+
+        assert tracker.percentile("m", 100) == 1.0
+
+
+class TestHedging:
+    """Test suite for hedged requests in LLMService"""
+
+    @pytest.mark.asyncio
+    async def test_straggler_is_hedged(self, hedge_config):
+        """Test that a call slower than the percentile is duplicated and the fast copy wins"""
+        completions = StragglerCompletions()
+        service = make_service(completions)
+
+        text, _ = await asyncio.wait_for(service.complete("What is Slack?"), timeout=2)
+
+        assert text == "Answer to What is Slack?"
+        assert completions.calls == ["What is Slack?", "What is Slack?"]
+        assert service.hedges == 1
+        assert service.hedges_won == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_samples(self, hedge_config):
+        """Test that hedging waits until the model has a latency baseline"""
+        completions = StragglerCompletions(straggler_delay=0.1)
+        service = make_service(completions, samples=0)
+
+        await service.complete("What is Slack?")
+
+        assert service.hedges == 0
+        assert len(completions.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_budget_caps_extra_calls(self, hedge_config):
+        """Test that hedges stop once they exceed the budget ratio"""
+        completions = StragglerCompletions(straggler_delay=0.2)
+        service = make_service(completions)
+        service.calls = 0
+
+        await service.complete("What is Slack?")
+
+        assert service.hedges == 0
+
+    @pytest.mark.asyncio
+    async def test_hedging_disabled(self, hedge_config):
+        """Test that hedging is off unless enabled"""
+        completions = StragglerCompletions(straggler_delay=0.1)
+        service = make_service(completions, hedge=False)
+
+        await service.complete("What is Slack?")
+
+        assert len(completions.calls) == 1
+        assert service.get_stats()["hedging"]["hedges"] == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_while_slots_are_busy(self, hedge_config):
+        """Test that time queued for a slot doesn't count and saturation doesn't trigger hedges"""
+        completions = StragglerCompletions(straggler_delay=0.2)
+        service = LLMService(model="m", client=make_fake_client(completions), hedge=True, max_concurrency=1)
+        for _ in range(20):
+            service.latency.record("m", 0.05)
+        service.calls = 100
+
+        await asyncio.gather(service.complete("What is Slack?"), service.complete("Is Slack good?"))
+
+        assert service.hedges == 0
+        assert len(completions.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_straggler_is_recorded(self, hedge_config):
+        """Test that the cancelled slow copy still adds a (lower-bound) latency sample"""
+        completions = StragglerCompletions()
+        service = make_service(completions)
+
+        await service.complete("What is Slack?")
+        await asyncio.sleep(0)
+
+        samples = list(service.latency._samples["m"])
+        assert len(samples) == 22
+        assert max(samples) >= 0.05
@@ -0,0 +1,340 @@
+"""
+Test suite for the analysis history store
+Tests persistence, filtering, batched reads and concurrent writers
+"""
+
+import multiprocessing
+import pytest
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.models.schemas import AnalysisResponse, QueryAnalysis, SentimentResult, SummaryMetrics, UsageMetrics
+from backend.services.history_store import HistoryStore
+
+
+def make_analysis(
+    brand: str = "Slack",
+    url: str = "https://slack.com",
+    minutes_ago: int = 0,
+    visibility: float = 0.0,
+    sentiment: str = "NEUTRAL",
+    responses: tuple = ()
+) -> AnalysisResponse:
+    return AnalysisResponse(
+        url=url,
+        brand_name=brand,
+        timestamp=datetime.now() - timedelta(minutes=minutes_ago),
+        queries_analyzed=len(responses),
+        analysis=[
+            QueryAnalysis(
+                query=f"Query {i}",
+                response=response,
+                sentiment_analysis=SentimentResult(
+                    mentioned=False,
+                    sentiment="NOT_MENTIONED",
+                    confidence=0.0,
+                    position=-1,
+                    positive_indicators=0,
+                    negative_indicators=0
+                )
+            )
+            for i, response in enumerate(responses)
+        ],
+        summary=SummaryMetrics(
+            total_queries=0,
+            mentions_count=0,
+            citations=0,
+            visibility=visibility,
+            positive=0,
+            negative=0,
+            neutral=0,
+            overall_sentiment=sentiment,
+            average_confidence=0.0
+        )
+    )
+
+
+def with_metrics(analysis: AnalysisResponse, tokens: int = 0, **summary) -> AnalysisResponse:
+    """An analysis with the given summary fields and token usage"""
+    return analysis.model_copy(update={
+        "summary": analysis.summary.model_copy(update=summary),
+        "usage": UsageMetrics(
+            model="gpt-4o-mini",
+            total_tokens=tokens,
+            prompt_tokens=tokens // 2,
+            completion_tokens=tokens - tokens // 2,
+            estimated_cost=tokens / 1_000_000
+        )
+    })
+
+
+def add_many(db_path: str, brand: str, n: int):
+    store = HistoryStore(db_path)
+    for _ in range(n):
+        store.add(make_analysis(brand=brand))
+    store.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield store
+    store.close()
+
+
+class TestHistoryStore:
+    """Test suite for HistoryStore"""
+
+    def test_persists_across_connections(self, tmp_path):
+        """Test that history survives reopening the database"""
+        db_path = str(tmp_path / "history.sqlite3")
+        first = HistoryStore(db_path)
+        record_id = first.add(make_analysis())
+        first.close()
+
+        second = HistoryStore(db_path)
+        assert second.count() == 1
+        assert second.get(record_id).brand_name == "Slack"
+        second.close()
+
+    def test_recent_is_newest_first(self, store):
+        """Test ordering by analysis timestamp and the limit"""
+        store.add(make_analysis(url="https://old.com", minutes_ago=10))
+        store.add(make_analysis(url="https://new.com", minutes_ago=0))
+        store.add(make_analysis(url="https://mid.com", minutes_ago=5))
+
+        assert [a.url for a in store.recent(2)] == ["https://new.com", "https://mid.com"]
+
+    def test_filters_by_brand_and_url(self, store):
+        """Test case-insensitive brand filter and URL filter"""
+        store.add(make_analysis(brand="Slack", url="https://slack.com"))
+        store.add(make_analysis(brand="Slack", url="https://slack.com/pricing"))
+        store.add(make_analysis(brand="Notion", url="https://notion.so"))
+
+        assert len(store.recent(10, brand="slack")) == 2
+        assert store.count(brand="SLACK", url="https://slack.com") == 1
+        assert store.count(brand="Discord") == 0
+
+    def test_iter_records_reads_in_batches(self, store):
+        """Test that a scan covers every record across batch boundaries and resumes after an id"""
+        ids = [store.add(make_analysis()) for _ in range(7)]
+
+        assert [record_id for record_id, _ in store.iter_records(batch_size=3)] == ids
+        assert [record_id for record_id, _ in store.iter_records(batch_size=3, after_id=ids[4])] == ids[5:]
+
+    def test_update_and_clear(self, store):
+        """Test replacing a record and clearing the store"""
+        record_id = store.add(make_analysis())
+        store.update_many([(record_id, make_analysis(brand="Renamed").model_dump_json())])
+
+        assert store.get(record_id).brand_name == "Renamed"
+        assert store.clear() == 1
+        assert store.count() == 0
+
+    def test_cursor_pages_are_disjoint(self, store):
+        """Test keyset pagination, including rows sharing a timestamp"""
+        same_time = make_analysis()
+        ids = [store.add(same_time) for _ in range(3)] + [store.add(make_analysis(minutes_ago=5))]
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.page(limit=3, cursor=cursor)
+            seen += page
+            if cursor is None:
+                break
+        assert len(seen) == len(ids) == 4
+        assert seen[-1].timestamp < seen[0].timestamp
+
+    def test_filters_on_summary_columns(self, store):
+        """Test date range, sentiment and visibility filters"""
+        store.add(make_analysis(minutes_ago=60, visibility=20.0, sentiment="NEGATIVE"))
+        store.add(make_analysis(minutes_ago=30, visibility=80.0, sentiment="POSITIVE"))
+        store.add(make_analysis(minutes_ago=0, visibility=100.0, sentiment="POSITIVE"))
+        cutoff = datetime.now() - timedelta(minutes=45)
+
+        assert store.count(since=cutoff) == 2
+        assert store.count(until=cutoff) == 1
+        assert store.count(sentiment="positive", min_visibility=90) == 1
+
+    def test_page_summaries(self, store):
+        """Test that summaries come from the projection column"""
+        record_id = store.add(make_analysis(visibility=80.0))
+        items, cursor = store.page_summaries(limit=10)
+
+        assert cursor is None
+        assert items[0].id == record_id
+        assert items[0].summary.visibility == 80.0
+
+    def test_invalid_cursor(self, store):
+        """Test that a malformed cursor raises ValueError"""
+        with pytest.raises(ValueError):
+            store.page(cursor="garbage")
+
+    def test_migrates_databases_without_summary_columns(self, tmp_path):
+        """Test that a database from before the summary columns is upgraded and backfilled"""
+        db_path = str(tmp_path / "history.sqlite3")
+        analysis = make_analysis(visibility=60.0, sentiment="POSITIVE")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE analyses (id INTEGER PRIMARY KEY AUTOINCREMENT, brand_name TEXT NOT NULL, "
+            "brand_key TEXT NOT NULL, url TEXT NOT NULL, timestamp REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO analyses (brand_name, brand_key, url, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+            ("Slack", "slack", analysis.url, analysis.timestamp.timestamp(), analysis.model_dump_json())
+        )
+        conn.commit()
+        conn.close()
+
+        store = HistoryStore(db_path)
+        assert store.count(sentiment="POSITIVE", min_visibility=50) == 1
+        assert store.page_summaries()[0][0].summary.visibility == 60.0
+        assert store.daily_rollups("slack")[0]["runs"] == 1
+        store.close()
+
+    def test_concurrent_writer_processes(self, tmp_path):
+        """Test that several processes can write to the same database"""
+        db_path = str(tmp_path / "history.sqlite3")
+        HistoryStore(db_path).close()
+        processes = [
+            multiprocessing.Process(target=add_many, args=(db_path, f"Brand{i}", 25))
+            for i in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        store = HistoryStore(db_path)
+        assert store.count() == 100
+        assert store.get_stats()["brands"] == 4
+        store.close()
+
+
+class TestResponseBlobs:
+    """Test suite for response text kept in the blob store"""
+
+    ANSWER = "Slack is a popular messaging platform for teams. " * 20
+
+    def test_identical_responses_stored_once(self, store):
+        """Test that history rows reference the text instead of holding it"""
+        for _ in range(3):
+            store.add(make_analysis(responses=(self.ANSWER, "Short answer")))
+
+        stats = store.get_stats()["responses"]
+        assert stats["blobs"] == 2
+        assert stats["references_count"] == 6
+        raw = store._conn.execute("SELECT data FROM analyses").fetchone()["data"]
+        assert self.ANSWER not in raw
+
+    def test_failed_writes_release_their_blobs(self, store):
+        """Test that a rolled-back history write gives back the blob references it took"""
+        record_id = store.add(make_analysis(responses=("Kept",)))
+        store._conn.execute("CREATE TRIGGER no_writes BEFORE INSERT ON analyses BEGIN SELECT RAISE(ABORT, 'boom'); END")
+        store._conn.execute("CREATE TRIGGER no_updates BEFORE UPDATE ON analyses BEGIN SELECT RAISE(ABORT, 'boom'); END")
+
+        with pytest.raises(sqlite3.DatabaseError):
+            store.add(make_analysis(responses=(self.ANSWER, "Kept")))
+        with pytest.raises(sqlite3.DatabaseError):
+            store.update(record_id, make_analysis(responses=(self.ANSWER,)))
+
+        stats = store.get_stats()["responses"]
+        assert stats["blobs"] == 1
+        assert stats["references_count"] == 1
+
+    def test_reads_are_hydrated(self, store):
+        """Test that full reads put the text back"""
+        record_id = store.add(make_analysis(responses=(self.ANSWER,)))
+
+        item = store.get(record_id).analysis[0]
+        assert item.response == self.ANSWER
+        assert item.response_hash is not None
+        assert store.recent(1)[0].analysis[0].response == self.ANSWER
+        assert AnalysisResponse.model_validate_json(next(store.iter_records())[1]).analysis[0].response == self.ANSWER
+
+    def test_lazy_reads(self, store):
+        """Test that unhydrated reads skip the text but can load it by hash"""
+        record_id = store.add(make_analysis(responses=(self.ANSWER,)))
+
+        item = store.get(record_id, hydrate=False).analysis[0]
+        assert item.response == ""
+        assert store.get_response(item.response_hash) == self.ANSWER
+
+    def test_unhydrated_analysis_cannot_be_stored(self, store):
+        """Test that writing back a lazily read analysis doesn't lose its text"""
+        record_id = store.add(make_analysis(responses=(self.ANSWER,)))
+
+        with pytest.raises(ValueError):
+            store.update(record_id, store.get(record_id, hydrate=False))
+
+    def test_update_and_clear_release_texts(self, store):
+        """Test that replaced and deleted records give their texts up"""
+        record_id = store.add(make_analysis(responses=("Old answer",)))
+        store.add(make_analysis(responses=(self.ANSWER,)))
+
+        store.update(record_id, make_analysis(responses=("New answer",)))
+        assert store.get_response(store.get(record_id).analysis[0].response_hash) == "New answer"
+        assert store.get_stats()["responses"]["blobs"] == 2
+
+        store.clear()
+        assert store.get_stats()["responses"]["blobs"] == 0
+
+    def test_inline_records_still_load(self, store):
+        """Test that records written before the blob store keep their inline text"""
+        analysis = make_analysis(responses=("Inline answer",))
+        store._conn.execute(
+            "INSERT INTO analyses (brand_name, brand_key, url, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+            ("Slack", "slack", analysis.url, analysis.timestamp.timestamp(), analysis.model_dump_json())
+        )
+
+        assert store.recent(1)[0].analysis[0].response == "Inline answer"
+
+
+class TestDailyRollups:
+    """Test suite for the per-brand daily rollups"""
+
+    def test_rollups_follow_writes(self, store):
+        """Test that rollups are summed per brand and day as analyses are stored"""
+        store.add(with_metrics(make_analysis(), tokens=100, total_queries=5, mentions_count=4, positive=3, negative=1))
+        store.add(with_metrics(make_analysis(), tokens=50, total_queries=5, mentions_count=2, positive=1, neutral=1))
+        store.add(with_metrics(make_analysis(minutes_ago=60 * 24), total_queries=5, mentions_count=5, negative=5))
+        store.add(with_metrics(make_analysis(brand="Notion"), total_queries=5, mentions_count=1, positive=1))
+
+        yesterday, today = store.daily_rollups("SLACK")
+        assert (yesterday["runs"], yesterday["negative"]) == (1, 5)
+        assert today["runs"] == 2
+        assert today["queries"] == 10
+        assert today["mentions"] == 6
+        assert (today["positive"], today["negative"], today["neutral"]) == (4, 1, 1)
+        assert today["total_tokens"] == 150
+        assert store.daily_rollups()[-1]["runs"] == 3
+
+    def test_trends_are_rates(self, store):
+        """Test visibility, net sentiment and date bounds of daily_trends"""
+        store.add(with_metrics(make_analysis(), total_queries=4, mentions_count=3, positive=2, negative=1))
+        store.add(with_metrics(make_analysis(minutes_ago=60 * 24 * 3), total_queries=4, mentions_count=1, positive=1))
+        today = datetime.now().date()
+
+        trend = store.daily_trends("Slack", since=today, until=today)
+        assert len(trend) == 1
+        assert trend[0].visibility == 75.0
+        assert trend[0].net_sentiment == round(1 / 3, 2)
+        assert len(store.daily_trends("Slack")) == 2
+
+    def test_update_and_clear_adjust_rollups(self, store):
+        """Test that re-scored analyses replace their contribution and cleared ones remove it"""
+        analysis = make_analysis()
+        record_id = store.add(with_metrics(analysis, total_queries=5, mentions_count=5, negative=5))
+        store.update(record_id, with_metrics(analysis, total_queries=5, mentions_count=5, positive=5))
+
+        (day,) = store.daily_rollups("Slack")
+        assert (day["runs"], day["positive"], day["negative"]) == (1, 5, 0)
+
+        store.clear()
+        assert store.daily_rollups() == []
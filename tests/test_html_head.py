@@ -0,0 +1,117 @@
+"""
+Test suite for streaming <head> metadata extraction
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.utils.html_head import extract_head_metadata, find_organization_name
+
+
+async def chunked(data: bytes, size: int = 7):
+    """Yield data in small chunks, like a network stream"""
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+PAGE = b"""<!doctype html>
+<html>
+<head>
+  <title>Slack | Where work happens</title>
+  <meta name="description" content="Slack is a messaging app &amp; more">
+  <meta property="og:site_name" content="Slack">
+  <meta property="og:title" content="Slack is your productivity platform">
+  <script type="application/ld+json">
+    {"@context": "https://schema.org", "@graph": [
+      {"@type": "WebSite", "name": "Slack website"},
+      {"@type": "Organization", "name": "Slack Technologies"}
+    ]}
+  </script>
+</head>
+<body>""" + b"<p>filler</p>" * 10000 + b"</body></html>"
+
+
+class TestHeadExtraction:
+    """Test suite for extract_head_metadata"""
+
+    @pytest.mark.asyncio
+    async def test_extracts_all_fields(self):
+        """Test that description, og tags and JSON-LD organization are found in one pass"""
+        metadata = await extract_head_metadata(chunked(PAGE), max_bytes=1_000_000)
+
+        assert metadata["description"] == "Slack is a messaging app & more"
+        assert metadata["og_site_name"] == "Slack"
+        assert metadata["og_title"] == "Slack is your productivity platform"
+        assert metadata["organization_name"] == "Slack Technologies"
+
+    @pytest.mark.asyncio
+    async def test_stops_at_end_of_head(self):
+        """Test that the body is not read"""
+        metadata = await extract_head_metadata(chunked(PAGE), max_bytes=1_000_000)
+
+        assert metadata["bytes_read"] < PAGE.index(b"<body>") + 64
+
+    @pytest.mark.asyncio
+    async def test_byte_cap(self):
+        """Test that reading stops at max_bytes even without </head>"""
+        page = b"<html><head>" + b"<!-- padding -->" * 1000 + b'<meta name="description" content="late">'
+        metadata = await extract_head_metadata(chunked(page, size=100), max_bytes=500)
+
+        assert metadata["bytes_read"] == 500
+        assert metadata["description"] is None
+
+    @pytest.mark.asyncio
+    async def test_multibyte_characters_split_across_chunks(self):
+        """Test that UTF-8 sequences split between chunks decode correctly"""
+        page = '<head><meta name="description" content="Café ünïcode"></head>'.encode("utf-8")
+        metadata = await extract_head_metadata(chunked(page, size=3), max_bytes=10_000)
+
+        assert metadata["description"] == "Café ünïcode"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("declaration", [
+        '<meta charset="windows-1252">',
+        '<meta http-equiv="Content-Type" content="text/html; charset=windows-1252">',
+    ])
+    async def test_meta_charset_without_header(self, declaration):
+        """Test that a <meta> charset declaration is used when the header has none"""
+        page = f'<html><head>{declaration}<meta name="description" content="Café crème"></head><body>'
+        metadata = await extract_head_metadata(chunked(page.encode("cp1252"), size=5), max_bytes=10_000)
+
+        assert metadata["description"] == "Café crème"
+
+    @pytest.mark.asyncio
+    async def test_header_charset_wins_over_meta(self):
+        """Test that the Content-Type header charset overrides the page's declaration"""
+        page = '<head><meta charset="windows-1252"><meta name="description" content="Café"></head>'.encode("utf-8")
+        metadata = await extract_head_metadata(chunked(page), max_bytes=10_000, encoding="utf-8")
+
+        assert metadata["description"] == "Café"
+
+    @pytest.mark.asyncio
+    async def test_late_meta_charset_is_ignored(self):
+        """Test that only the prescan window is searched for a declaration"""
+        page = ("<head>" + "<!-- padding -->" * 100 + '<meta charset="windows-1252">'
+                '<meta name="description" content="Café"></head>').encode("utf-8")
+        metadata = await extract_head_metadata(chunked(page, size=100), max_bytes=10_000)
+
+        assert metadata["description"] == "Café"
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_ld_is_ignored(self):
+        """Test that malformed JSON-LD does not break extraction"""
+        page = b'<head><script type="application/ld+json">{not json</script><meta property="og:site_name" content="X"></head>'
+        metadata = await extract_head_metadata(chunked(page), max_bytes=10_000)
+
+        assert metadata["organization_name"] is None
+        assert metadata["og_site_name"] == "X"
+
+    def test_find_organization_name_in_publisher(self):
+        """Test that nested Organization nodes are found"""
+        data = {"@type": "WebPage", "publisher": {"@type": ["Organization"], "name": " Notion "}}
+
+        assert find_organization_name(data) == "Notion"
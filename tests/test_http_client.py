@@ -0,0 +1,127 @@
+"""
+Test suite for the pooled async HTTP client
+Tests per-host and global limits and homepage fetches through the pool
+"""
+
+import asyncio
+import pytest
+import sys
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.http_client import AsyncHTTPClient
+
+
+class ConcurrencyProbe:
+    """Mock transport handler that records concurrent requests per host"""
+
+    def __init__(self, body=b"<html><head></head></html>", delay=0.02):
+        self.body = body
+        self.delay = delay
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self.total_in_flight = 0
+        self.max_total_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.in_flight[host] += 1
+        self.total_in_flight += 1
+        self.max_in_flight[host] = max(self.max_in_flight[host], self.in_flight[host])
+        self.max_total_in_flight = max(self.max_total_in_flight, self.total_in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return httpx.Response(200, content=self.body, headers={"content-type": "text/html"})
+        finally:
+            self.in_flight[host] -= 1
+            self.total_in_flight -= 1
+
+
+class TestAsyncHTTPClient:
+    """Test suite for AsyncHTTPClient"""
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        """Test that no host sees more than max_connections_per_host requests at once"""
+        probe = ConcurrencyProbe()
+        client = AsyncHTTPClient(max_connections=50, max_connections_per_host=2, transport=httpx.MockTransport(probe))
+
+        urls = [f"https://{host}.com/" for host in ["a", "b"] for _ in range(6)]
+        await asyncio.gather(*(client.get(url) for url in urls))
+        await client.close()
+
+        assert probe.max_in_flight["a.com"] == 2
+        assert probe.max_in_flight["b.com"] == 2
+        assert client.get_stats()["requests"] == 12
+
+    @pytest.mark.asyncio
+    async def test_global_limit(self):
+        """Test that the global cap bounds requests across hosts"""
+        probe = ConcurrencyProbe()
+        client = AsyncHTTPClient(max_connections=3, max_connections_per_host=4, transport=httpx.MockTransport(probe))
+
+        await asyncio.gather(*(client.get(f"https://host{i}.com/") for i in range(10)))
+        await client.close()
+
+        assert probe.max_total_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_idle_hosts_are_forgotten(self):
+        """Test that per-host slots are dropped once a host has no requests"""
+        client = AsyncHTTPClient(transport=httpx.MockTransport(ConcurrencyProbe(delay=0)))
+
+        await client.get("https://a.com/")
+        await client.close()
+
+        assert client.get_stats()["active_hosts"] == 0
+
+    def test_client_of_finished_loop_is_closed(self):
+        """Test that a new event loop closes the client left by a finished one"""
+        client = AsyncHTTPClient(transport=httpx.MockTransport(ConcurrencyProbe(delay=0)))
+
+        asyncio.run(client.get("https://a.com/"))
+        [first] = client._clients.values()
+        asyncio.run(client.get("https://a.com/"))
+        [second] = client._clients.values()
+
+        assert first.is_closed and not second.is_closed
+        asyncio.run(client.close())
+        assert second.is_closed
+
+
+class TestFetchBrandInfoPooled:
+    """Test suite for fetch_brand_info through the pooled client"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_reads_description(self):
+        """Test that the homepage description is extracted"""
+        body = b'<html><head><meta name="description" content="Team chat"></head><body></body></html>'
+        client = AsyncHTTPClient(transport=httpx.MockTransport(ConcurrencyProbe(body=body, delay=0)))
+        analyzer = BrandAnalyzer(http_client=client)
+
+        result = await analyzer.fetch_brand_info("https://www.slack.com")
+        await client.close()
+
+        assert result["brand_name"] == "Slack"
+        assert result["description"] == "Team chat"
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_falls_back_to_domain(self):
+        """Test that HTTP errors fall back to the domain-derived brand name"""
+        def handler(request):
+            return httpx.Response(500)
+
+        client = AsyncHTTPClient(transport=httpx.MockTransport(handler))
+        analyzer = BrandAnalyzer(http_client=client)
+
+        result = await analyzer.fetch_brand_info("https://www.slack.com")
+        await client.close()
+
+        assert result["brand_name"] == "Slack"
+        assert result["description"] is None
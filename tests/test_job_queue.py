@@ -0,0 +1,271 @@
+"""
+Test suite for JobQueue and JobWorker
+Tests durable job storage, claiming, leases and the worker loop
+"""
+
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.analysis_service import AnalysisService
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.history_store import HistoryStore
+from backend.services.job_queue import JobQueue
+from backend.services.job_worker import JobWorker
+from backend.services.llm_service import LLMError, LLMService
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+
+
+class TestJobQueue:
+    """Test suite for the SQLite job queue"""
+
+    def test_enqueue_and_get(self, queue):
+        """Test that an enqueued job can be read back"""
+        job_id = queue.enqueue("brand_analysis", {"url": "https://slack.com"})
+        job = queue.get(job_id)
+
+        assert job["status"] == "queued"
+        assert job["payload"] == {"url": "https://slack.com"}
+        assert job["result"] is None
+
+    def test_jobs_survive_reopen(self, tmp_path):
+        """Test that queued jobs persist across restarts"""
+        db_path = str(tmp_path / "jobs.sqlite3")
+        job_id = JobQueue(db_path).enqueue("brand_analysis", {"url": "https://slack.com"})
+
+        assert JobQueue(db_path).get(job_id)["status"] == "queued"
+
+    def test_claim_is_fifo_and_exclusive(self, queue):
+        """Test that jobs are claimed oldest first and only once"""
+        first = queue.enqueue("brand_analysis", {"n": 1})
+        second = queue.enqueue("brand_analysis", {"n": 2})
+
+        assert queue.claim("worker-a")["id"] == first
+        assert queue.claim("worker-b")["id"] == second
+        assert queue.claim("worker-c") is None
+
+    def test_expired_lease_is_reclaimed(self, queue):
+        """Test that a job whose worker died is handed to another worker"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a", lease_seconds=0.01)
+        time.sleep(0.02)
+
+        job = queue.claim("worker-b")
+        assert job["id"] == job_id
+        assert job["worker_id"] == "worker-b"
+        assert job["attempts"] == 2
+
+    def test_job_failed_after_max_attempts(self, queue):
+        """Test that a job is failed once its lease expired max_attempts times"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a", lease_seconds=0.01)
+        time.sleep(0.02)
+        queue.claim("worker-b", lease_seconds=0.01)
+        time.sleep(0.02)
+
+        assert queue.claim("worker-c") is None
+        assert queue.get(job_id)["status"] == "failed"
+
+    def test_heartbeat_requires_ownership(self, queue):
+        """Test that only the owning worker can extend a lease"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a")
+
+        assert queue.heartbeat(job_id, "worker-a") is True
+        assert queue.heartbeat(job_id, "worker-b") is False
+
+    def test_complete_and_stats(self, queue):
+        """Test completing a job and status counters"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a")
+        queue.update_progress(job_id, 1, 2)
+        queue.complete(job_id, {"ok": True})
+
+        job = queue.get(job_id)
+        assert job["status"] == "completed"
+        assert job["result"] == {"ok": True}
+        assert job["progress"] == 2
+        assert queue.get_stats()["completed"] == 1
+
+    def test_stale_worker_cannot_finish_job(self, queue):
+        """Test that a worker whose lease was taken over can't overwrite the outcome"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a", lease_seconds=0.01)
+        time.sleep(0.02)
+        queue.claim("worker-b")
+
+        assert queue.complete(job_id, {"by": "a"}, "worker-a") is False
+        assert queue.fail(job_id, "late", "worker-a") is False
+        assert queue.complete(job_id, {"by": "b"}, "worker-b") is True
+        assert queue.get(job_id)["result"] == {"by": "b"}
+
+    def test_retry_requeues_until_max_attempts(self, queue):
+        """Test that transient failures are retried after the delay, up to max_attempts"""
+        job_id = queue.enqueue("brand_analysis", {})
+        queue.claim("worker-a")
+
+        assert queue.retry(job_id, "worker-a", "rate limited", delay=0.05) is True
+        assert queue.get(job_id)["status"] == "queued"
+        assert queue.claim("worker-a") is None
+        time.sleep(0.06)
+        assert queue.claim("worker-b")["attempts"] == 2
+
+        assert queue.retry(job_id, "worker-b", "rate limited") is False
+        assert queue.get(job_id)["status"] == "running"
+
+
+class TestJobWorker:
+    """Test suite for the worker loop"""
+
+    @pytest.fixture
+    def history_store(self, tmp_path):
+        store = HistoryStore(str(tmp_path / "history.sqlite3"))
+        yield store
+        store.close()
+
+    @pytest.fixture
+    def worker(self, queue, history_store):
+        completions = FakeCompletions(responder=lambda query: f"Slack is great. {query}")
+        llm_service = LLMService(model="m", client=make_fake_client(completions))
+        analysis_service = AnalysisService(BrandAnalyzer(), SentimentAnalyzer(), llm_service)
+
+        async def fake_fetch_brand_info(url):
+            return {"brand_name": "Slack", "url": url, "description": None}
+
+        analysis_service.brand_analyzer.fetch_brand_info = fake_fetch_brand_info
+        return JobWorker(queue, analysis_service, history_store, worker_id="test-worker", poll_interval=0.01)
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_brand_analysis(self, queue, worker):
+        """Test that a queued analysis is completed with an AnalysisResponse"""
+        job_id = queue.enqueue("brand_analysis", {
+            "url": "https://slack.com",
+            "queries": ["What is Slack?", "Is Slack good?"]
+        })
+
+        assert await worker.run_once() is True
+
+        job = queue.get(job_id)
+        assert job["status"] == "completed"
+        assert job["progress"] == job["total"] == 2
+        assert job["result"]["brand_name"] == "Slack"
+        assert len(job["result"]["analysis"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_batch_analysis(self, queue, worker):
+        """Test that a queued batch reports per-brand results and brand progress"""
+        job_id = queue.enqueue("batch_analysis", {
+            "urls": ["https://slack.com", "https://notion.so"],
+            "duplicates": ["https://slack.com/pricing"],
+            "queries": ["Is it good?"]
+        })
+
+        assert await worker.run_once() is True
+
+        job = queue.get(job_id)
+        assert job["status"] == "completed"
+        assert job["progress"] == job["total"] == 2
+        assert len(job["result"]["results"]) == 2
+        assert job["result"]["duplicates"] == ["https://slack.com/pricing"]
+        assert job["result"]["errors"] == []
+
+    @pytest.mark.asyncio
+    async def test_completed_jobs_are_added_to_history(self, queue, worker, history_store):
+        """Test that single and batch job results are recorded in the history store"""
+        queue.enqueue("brand_analysis", {"url": "https://slack.com", "queries": ["What is Slack?"]})
+        queue.enqueue("batch_analysis", {"urls": ["https://slack.com", "https://notion.so"], "queries": ["Is it good?"]})
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is True
+
+        assert history_store.count() == 3
+        assert history_store.recent(1)[0].analysis[0].query == "Is it good?"
+
+    @pytest.mark.asyncio
+    async def test_job_results_count_in_trends(self, queue, worker, history_store):
+        """Test that daily rollups include analyses run by jobs and batches"""
+        queue.enqueue("brand_analysis", {"url": "https://slack.com", "queries": ["What is Slack?", "Is Slack good?"]})
+        queue.enqueue("batch_analysis", {"urls": ["https://slack.com", "https://notion.so"], "queries": ["Is it good?"]})
+        await worker.run_once()
+        await worker.run_once()
+
+        # The fake homepage fetch names every brand "Slack"
+        [slack] = history_store.daily_trends("slack")
+        assert slack.runs == 3
+        assert slack.queries == 4
+        assert slack.mentions == 4
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried(self, queue, worker):
+        """Test that a transient LLM failure requeues the job instead of failing it"""
+        async def flaky(job):
+            raise LLMError("rate limited", status_code=429, transient=True)
+
+        worker.handlers["brand_analysis"] = flaky
+        job_id = queue.enqueue("brand_analysis", {})
+        await worker.run_once()
+
+        job = queue.get(job_id)
+        assert job["status"] == "queued"
+        assert job["error"] == "rate limited"
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_fails_job(self, queue, worker):
+        """Test that a non-transient failure fails the job right away"""
+        async def broken(job):
+            raise LLMError("Unknown LLM provider 'x'")
+
+        worker.handlers["brand_analysis"] = broken
+        job_id = queue.enqueue("brand_analysis", {})
+        await worker.run_once()
+
+        assert queue.get(job_id)["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_stops_job(self, queue, worker):
+        """Test that the job is cancelled once its heartbeat finds another worker owns it"""
+        cancelled = asyncio.Event()
+
+        async def slow(job):
+            # Another worker takes the job over while this one is still running
+            with queue._lock:
+                queue._conn.execute("UPDATE jobs SET worker_id = 'other-worker' WHERE id = ?", (job["id"],))
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        worker.lease_seconds = 0.03
+        worker.handlers["brand_analysis"] = slow
+        job_id = queue.enqueue("brand_analysis", {})
+        await asyncio.wait_for(worker.run_once(), timeout=2)
+
+        assert cancelled.is_set()
+        job = queue.get(job_id)
+        assert job["status"] == "running"
+        assert job["worker_id"] == "other-worker"
+
+    @pytest.mark.asyncio
+    async def test_worker_fails_unknown_job_kind(self, queue, worker):
+        """Test that unknown job kinds are failed rather than retried forever"""
+        job_id = queue.enqueue("mystery", {})
+        await worker.run_once()
+
+        assert queue.get(job_id)["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_worker_idle_on_empty_queue(self, worker):
+        """Test that run_once reports an empty queue"""
+        assert await worker.run_once() is False
@@ -0,0 +1,150 @@
+"""
+Test suite for versioned sentiment lexicons
+Tests hot reload, version archiving and incremental re-scoring
+"""
+
+import json
+import os
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.lexicon import Lexicon, LexiconRegistry
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+
+TEXT = "Slack is great but pricey. Slack is clunky."
+
+
+def write_lexicon(path, positive, negative, mtime=None):
+    path.write_text(json.dumps({"positive": positive, "negative": negative}))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+class TestLexicon:
+    """Test suite for Lexicon"""
+
+    def test_version_is_content_fingerprint(self):
+        """Test that equal word lists share a version regardless of order and case"""
+        assert Lexicon(["Good", "great"], ["bad"]).version == Lexicon(["great", "good"], ["bad "]).version
+        assert Lexicon(["good"], ["bad"]).version != Lexicon(["good"], ["awful"]).version
+
+    def test_explicit_version(self):
+        """Test that a file can name its version"""
+        assert Lexicon.from_dict({"positive": ["good"], "version": "v7"}).version == "v7"
+
+
+class TestLexiconRegistry:
+    """Test suite for LexiconRegistry"""
+
+    def test_file_change_is_picked_up(self, tmp_path):
+        """Test that a modified lexicon file is reloaded without a restart"""
+        path = tmp_path / "lexicon.json"
+        write_lexicon(path, ["good"], ["bad"], mtime=1000)
+        registry = LexiconRegistry(path=str(path), reload_interval_seconds=0)
+        first = registry.current.version
+
+        assert registry.maybe_reload() is False
+
+        write_lexicon(path, ["good", "great"], ["bad"], mtime=2000)
+        assert registry.maybe_reload() is True
+        assert "great" in registry.current.positive
+        assert registry.get(first).positive == {"good"}
+
+    def test_broken_file_keeps_current_lexicon(self, tmp_path):
+        """Test that an unreadable file doesn't replace the lexicon in use"""
+        path = tmp_path / "lexicon.json"
+        write_lexicon(path, ["good"], ["bad"], mtime=1000)
+        registry = LexiconRegistry(path=str(path), reload_interval_seconds=0)
+
+        path.write_text("{not json")
+        os.utime(path, (2000, 2000))
+
+        assert registry.maybe_reload() is False
+        assert registry.current.positive == {"good"}
+
+    def test_versions_are_archived(self, tmp_path):
+        """Test that a fresh registry can look up versions archived by another"""
+        archive = tmp_path / "archive"
+        old = Lexicon(["good"], ["bad"])
+        registry = LexiconRegistry(archive_dir=str(archive), lexicon=old)
+        registry.set(Lexicon(["good", "great"], ["bad"]))
+
+        assert LexiconRegistry(archive_dir=str(archive)).get(old.version) == old
+
+    def test_construction_writes_nothing(self, tmp_path):
+        """Test that only set/reload archive, and the built-in lexicon needs no archive"""
+        archive = tmp_path / "archive"
+        LexiconRegistry(archive_dir=str(archive), lexicon=Lexicon(["good"], ["bad"]))
+
+        assert not archive.exists()
+        assert LexiconRegistry(archive_dir=str(archive)).get(Lexicon.default().version) == Lexicon.default()
+
+    def test_reused_version_is_rejected(self, tmp_path):
+        """Test that a file changing its terms under the same version isn't loaded"""
+        path = tmp_path / "lexicon.json"
+        path.write_text(json.dumps({"version": "v1", "positive": ["good"], "negative": ["bad"]}))
+        os.utime(path, (1000, 1000))
+        registry = LexiconRegistry(path=str(path), archive_dir=str(tmp_path / "archive"), reload_interval_seconds=0)
+
+        path.write_text(json.dumps({"version": "v1", "positive": ["good", "great"], "negative": ["bad"]}))
+        os.utime(path, (2000, 2000))
+
+        assert registry.maybe_reload() is False
+        assert registry.current.positive == {"good"}
+        with pytest.raises(ValueError):
+            registry.reload()
+
+
+class TestIncrementalRescore:
+    """Test suite for SentimentAnalyzer.rescore"""
+
+    @pytest.fixture
+    def analyzer(self, tmp_path):
+        registry = LexiconRegistry(archive_dir=str(tmp_path), lexicon=Lexicon(["great"], ["clunky"]))
+        return SentimentAnalyzer(mention_window=-1, lexicon=registry)
+
+    def stored(self, analyzer):
+        analysis = analyzer.analyze_response(TEXT, "Slack")
+        return analysis.sentiment(), analysis.term_counts(), analysis.lexicon_version
+
+    def test_unchanged_lexicon_skips_text(self, analyzer):
+        """Test that nothing is scanned when the version is current"""
+        sentiment, counts, version = self.stored(analyzer)
+
+        assert analyzer.rescore(TEXT, "Slack", sentiment, counts, version)[2] is False
+
+    def test_added_term_is_found(self, analyzer):
+        """Test that a new negative term flips the label"""
+        sentiment, counts, version = self.stored(analyzer)
+        analyzer.negative_keywords = {"clunky", "pricey"}
+
+        result, new_counts, scanned = analyzer.rescore(TEXT, "Slack", sentiment, counts, version)
+
+        assert scanned is True
+        assert new_counts == {"great": 1, "clunky": 1, "pricey": 1}
+        assert result["sentiment"] == "NEGATIVE"
+        assert result == analyzer.analyze_sentiment(TEXT, "Slack")
+
+    def test_removed_and_moved_terms_need_no_scan(self, analyzer):
+        """Test that removing a term or changing its polarity uses the stored counts only"""
+        sentiment, counts, version = self.stored(analyzer)
+        analyzer.lexicons.set(Lexicon(["great", "clunky"], []))
+
+        result, new_counts, scanned = analyzer.rescore(TEXT, "Slack", sentiment, counts, version)
+
+        assert scanned is False
+        assert result["positive_indicators"] == 2
+        assert result == analyzer.analyze_sentiment(TEXT, "Slack")
+
+    def test_unknown_version_rescans(self, analyzer):
+        """Test that responses without stored counts are scored from scratch"""
+        sentiment, _, _ = self.stored(analyzer)
+
+        result, counts, scanned = analyzer.rescore(TEXT, "Slack", sentiment, None, None)
+
+        assert scanned is True
+        assert counts == {"great": 1, "clunky": 1}
@@ -0,0 +1,122 @@
+"""
+Test suite for LLM providers
+Tests the provider registry, the stub provider and cross-model fan-out
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.analysis_service import AnalysisService
+from backend.services.brand_analyzer import BrandAnalyzer
+from backend.services.llm_providers import StubProvider
+from backend.services.llm_service import LLMService, LLMError
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+def make_service(completions=None):
+    completions = completions or FakeCompletions(responder=lambda query: f"Slack is excellent. {query}")
+    llm_service = LLMService(
+        model="gpt-4o-mini",
+        client=make_fake_client(completions),
+        providers=[StubProvider()]
+    )
+    return llm_service, completions
+
+
+def make_analysis_service(llm_service):
+    brand_analyzer = BrandAnalyzer()
+
+    async def fetch_brand_info(url):
+        return {"brand_name": brand_analyzer.extract_brand_name(url), "url": url, "description": None}
+
+    brand_analyzer.fetch_brand_info = fetch_brand_info
+    return AnalysisService(brand_analyzer, SentimentAnalyzer(), llm_service)
+
+
+class TestLLMProviders:
+    """Test suite for the provider registry"""
+
+    def test_resolve_model(self):
+        """Test that bare names go to OpenAI and prefixed names to their provider"""
+        service, _ = make_service()
+
+        provider, model_name, model_id = service.resolve_model("gpt-4o")
+        assert (provider.name, model_name, model_id) == ("openai", "gpt-4o", "gpt-4o")
+
+        provider, model_name, model_id = service.resolve_model("stub:echo")
+        assert (provider.name, model_name, model_id) == ("stub", "echo", "stub:echo")
+
+    def test_unknown_provider_raises(self):
+        """Test that an unregistered provider is rejected"""
+        service, _ = make_service()
+
+        with pytest.raises(LLMError):
+            service.resolve_model("gemini:pro")
+        assert service.is_model_available("gemini:pro") is False
+
+    @pytest.mark.asyncio
+    async def test_stub_provider_is_deterministic(self):
+        """Test that the stub answers the same query identically"""
+        provider = StubProvider()
+        first = await provider.complete("echo", "What is Slack?", max_tokens=100, temperature=0.7)
+        second = await provider.complete("echo", "What is Slack?", max_tokens=100, temperature=0.7)
+
+        assert first == second
+        assert "What is Slack?" in first[0]
+
+    @pytest.mark.asyncio
+    async def test_usage_reports_model(self):
+        """Test that usage data names the model that answered"""
+        service, completions = make_service()
+        _, usage = await service.complete("What is Slack?", model="stub:echo")
+
+        assert usage["model"] == "stub:echo"
+        assert completions.calls == []
+
+    @pytest.mark.asyncio
+    async def test_fan_out_across_models(self):
+        """Test that every query runs on every model, grouped by model"""
+        llm_service, completions = make_service()
+        analysis_service = make_analysis_service(llm_service)
+
+        response = await analysis_service.analyze(
+            "https://slack.com",
+            queries=["What is Slack?", "Is Slack good?"],
+            models=["gpt-4o-mini", "stub:echo"]
+        )
+
+        assert response.queries_analyzed == 4
+        assert [a.model for a in response.analysis] == ["gpt-4o-mini", "gpt-4o-mini", "stub:echo", "stub:echo"]
+        assert [a.query for a in response.analysis] == ["What is Slack?", "Is Slack good?"] * 2
+        assert len(completions.calls) == 2
+        assert response.usage.model == "gpt-4o-mini,stub:echo"
+        assert [r.model for r in response.model_results] == ["gpt-4o-mini", "stub:echo"]
+        assert all(r.summary.total_queries == 2 for r in response.model_results)
+
+    @pytest.mark.asyncio
+    async def test_cost_uses_model_pricing(self):
+        """Test that the stub provider (no pricing) contributes no cost"""
+        llm_service, _ = make_service()
+        analysis_service = make_analysis_service(llm_service)
+
+        response = await analysis_service.analyze(
+            "https://slack.com",
+            queries=["What is Slack?"],
+            models=["stub:echo"]
+        )
+
+        assert response.usage.estimated_cost == 0
+        assert response.model_results is None
+
+    def test_unavailable_model_rejected(self):
+        """Test that requesting an unconfigured provider fails up front"""
+        llm_service = LLMService(api_key="", model="gpt-4o-mini")
+        analysis_service = AnalysisService(BrandAnalyzer(), SentimentAnalyzer(), llm_service)
+
+        with pytest.raises(LLMError):
+            analysis_service.resolve_models(["gpt-4o-mini"])
@@ -0,0 +1,87 @@
+"""
+Test suite for LLMService
+Tests concurrent query execution with a fake async OpenAI client
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.llm_service import LLMService, LLMError
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+def make_service(max_concurrency=4, **kwargs):
+    completions = FakeCompletions(**kwargs)
+    return LLMService(model="test-model", max_concurrency=max_concurrency, client=make_fake_client(completions)), completions
+
+
+class TestLLMService:
+    """Test suite for LLMService"""
+
+    @pytest.mark.asyncio
+    async def test_complete_returns_text_and_usage(self):
+        """Test that a single completion returns text and usage data"""
+        service, _ = make_service()
+        text, usage = await service.complete("What is Slack?")
+
+        assert text == "Answer to What is Slack?"
+        assert usage == {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30, "model": "test-model", "cached": False, "coalesced": False}
+
+    @pytest.mark.asyncio
+    async def test_complete_many_preserves_query_order(self):
+        """Test that concurrent results come back in query order"""
+        service, _ = make_service()
+        queries = [f"Query {i}" for i in range(6)]
+        results = await service.complete_many(queries)
+
+        assert [text for text, _ in results] == [f"Answer to {q}" for q in queries]
+
+    @pytest.mark.asyncio
+    async def test_complete_many_respects_concurrency_bound(self):
+        """Test that no more than max_concurrency calls run at once"""
+        service, completions = make_service(max_concurrency=2)
+        await service.complete_many([f"Query {i}" for i in range(8)])
+
+        assert completions.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_complete_many_raises_on_failure(self):
+        """Test that a failing query raises LLMError by default"""
+        service, _ = make_service(fail_on={"Query 1"})
+
+        with pytest.raises(LLMError):
+            await service.complete_many(["Query 0", "Query 1", "Query 2"])
+
+    @pytest.mark.asyncio
+    async def test_complete_many_return_exceptions(self):
+        """Test that failures can be returned per query"""
+        service, _ = make_service(fail_on={"Query 1"})
+        results = await service.complete_many(["Query 0", "Query 1"], return_exceptions=True)
+
+        assert results[0][0] == "Answer to Query 0"
+        assert isinstance(results[1], LLMError)
+
+    @pytest.mark.asyncio
+    async def test_complete_many_timeout_returns_timeouts(self):
+        """Test that queries still running at the timeout are reported, not awaited"""
+        service, completions = make_service(slow_on={"Query 1": 5.0})
+        results = await service.complete_many(["Query 0", "Query 1"], return_exceptions=True, timeout=0.2)
+
+        assert results[0][0] == "Answer to Query 0"
+        assert isinstance(results[1], asyncio.TimeoutError)
+        await asyncio.sleep(0.01)
+        assert completions.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_service_raises(self):
+        """Test that calling without a client raises LLMError"""
+        service = LLMService(api_key="")
+
+        assert service.is_available is False
+        with pytest.raises(LLMError):
+            await service.complete("What is Slack?")
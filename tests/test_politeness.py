@@ -0,0 +1,53 @@
+"""
+Test suite for the per-host politeness scheduler
+"""
+
+import asyncio
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.politeness import PolitenessScheduler
+
+
+async def timed_request(scheduler, url, starts):
+    async with scheduler.slot(url):
+        starts.append((scheduler.host_of(url), time.monotonic()))
+        await asyncio.sleep(0.01)
+
+
+class TestPolitenessScheduler:
+    """Test suite for PolitenessScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_same_host_requests_are_spaced(self):
+        """Test that requests to one host start at least the interval apart"""
+        scheduler = PolitenessScheduler(min_interval_seconds=0.05)
+        starts = []
+
+        await asyncio.gather(*(timed_request(scheduler, "https://a.com/page", starts) for _ in range(3)))
+
+        times = [t for _, t in starts]
+        assert all(later - earlier >= 0.045 for earlier, later in zip(times, times[1:]))
+        assert scheduler.waits == 2
+
+    @pytest.mark.asyncio
+    async def test_different_hosts_run_in_parallel(self):
+        """Test that distinct hosts don't wait for each other"""
+        scheduler = PolitenessScheduler(min_interval_seconds=1.0)
+        starts = []
+
+        started = time.monotonic()
+        await asyncio.gather(*(timed_request(scheduler, f"https://host{i}.com", starts) for i in range(5)))
+
+        assert time.monotonic() - started < 0.5
+        assert scheduler.waits == 0
+
+    def test_host_of_accepts_bare_domains(self):
+        """Test host extraction with and without a scheme"""
+        assert PolitenessScheduler.host_of("Slack.com/pricing") == "slack.com"
+        assert PolitenessScheduler.host_of("https://www.slack.com:443/") == "www.slack.com"
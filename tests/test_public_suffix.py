@@ -0,0 +1,98 @@
+"""
+Test suite for public suffix lookup
+Tests the suffix trie, host normalization and registrable domains
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.utils.public_suffix import (
+    PublicSuffixTrie,
+    map_registrable_domains,
+    normalize_host,
+    registrable_domain,
+    split_host,
+    to_unicode,
+)
+
+
+class TestPublicSuffixTrie:
+    """Test suite for PublicSuffixTrie"""
+
+    def test_rules_and_comments(self):
+        """Test that comments and blank lines are skipped"""
+        trie = PublicSuffixTrie(["// comment", "", "uk", "co.uk"])
+        assert trie.size == 2
+        assert trie.suffix_length(["brand", "co", "uk"]) == 2
+        assert trie.suffix_length(["brand", "uk"]) == 1
+
+    def test_unknown_tld_uses_implicit_rule(self):
+        """Test that hosts matching no rule treat the last label as the suffix"""
+        trie = PublicSuffixTrie(["com"])
+        assert trie.suffix_length(["brand", "example"]) == 1
+
+    def test_wildcard_and_exception(self):
+        """Test *.ck / !www.ck semantics"""
+        trie = PublicSuffixTrie(["*.ck", "!www.ck"])
+        assert trie.suffix_length(["brand", "co", "ck"]) == 2
+        assert trie.suffix_length(["www", "ck"]) == 1
+
+
+class TestNormalizeHost:
+    """Test suite for normalize_host"""
+
+    def test_strips_scheme_port_path_and_userinfo(self):
+        """Test that only the lowercase host is kept"""
+        assert normalize_host("https://user:pw@Shop.Brand.COM:8443/a?b#c") == "shop.brand.com"
+        assert normalize_host("brand.com.") == "brand.com"
+
+    def test_idn_is_punycoded(self):
+        """Test that internationalized hosts are converted to ASCII"""
+        assert normalize_host("https://bücher.de") == "xn--bcher-kva.de"
+
+    def test_missing_host(self):
+        """Test that a URL without a host normalizes to an empty string"""
+        assert normalize_host("https://") == ""
+
+
+class TestRegistrableDomain:
+    """Test suite for registrable domain lookup"""
+
+    def test_subdomains(self):
+        """Test that subdomains are dropped"""
+        assert registrable_domain("https://shop.brand.com") == "brand.com"
+        assert registrable_domain("https://www.company.co.uk") == "company.co.uk"
+
+    def test_multi_label_suffix(self):
+        """Test suffixes such as com.au"""
+        assert registrable_domain("brand.com.au") == "brand.com.au"
+        assert split_host("shop.brand.com.au") == ("shop", "brand", "com.au")
+
+    def test_wildcard_and_exception_rules(self):
+        """Test bundled wildcard and exception rules"""
+        assert registrable_domain("https://www.brand.co.ck") == "brand.co.ck"
+        assert registrable_domain("https://www.ck") == "www.ck"
+        assert registrable_domain("https://city.kawasaki.jp") == "city.kawasaki.jp"
+
+    def test_private_suffixes(self):
+        """Test that hosting platforms count as suffixes"""
+        assert registrable_domain("https://brand.github.io") == "brand.github.io"
+
+    def test_idn_suffix(self):
+        """Test that Unicode rules match punycoded hosts"""
+        assert registrable_domain("https://пример.рф") == "xn--e1afmkfd.xn--p1ai"
+        assert to_unicode("xn--e1afmkfd") == "пример"
+
+    def test_no_registrable_domain(self):
+        """Test bare suffixes, IPs and single labels"""
+        assert registrable_domain("https://co.uk") is None
+        assert registrable_domain("http://127.0.0.1:8000") is None
+        assert registrable_domain("localhost") is None
+
+    def test_map_keeps_order(self):
+        """Test that map_registrable_domains returns one result per input"""
+        urls = ["https://a.brand.com", "co.uk", "https://b.brand.com/x", "brand.co.uk"]
+        assert map_registrable_domains(urls) == ["brand.com", None, "brand.com", "brand.co.uk"]
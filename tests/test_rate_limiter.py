@@ -0,0 +1,160 @@
+"""
+Test suite for RateLimiter and LLM retry handling
+Tests token buckets, per-model quotas and 429/5xx backoff
+"""
+
+import asyncio
+import pytest
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import config
+from backend.services.llm_service import LLMService, LLMError, get_retry_after, backoff_delay
+from backend.services.rate_limiter import RateLimiter, TokenBucket, parse_model_limits
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+class FakeAPIError(Exception):
+    """Mimics openai.APIStatusError (status_code + response headers)"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class FlakyCompletions(FakeCompletions):
+    """Fake completions that fail with the given errors before succeeding"""
+
+    def __init__(self, errors):
+        super().__init__(delay=0)
+        self.errors = list(errors)
+
+    async def create(self, **kwargs):
+        if self.errors:
+            self.calls.append(kwargs["messages"][0]["content"])
+            raise self.errors.pop(0)
+        return await super().create(**kwargs)
+
+
+class TestTokenBucket:
+    """Test suite for the token bucket"""
+
+    def test_bucket_starts_full(self):
+        """Test that a new bucket allows a full burst"""
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+        assert bucket.wait_time(10) == 0
+
+    def test_bucket_reports_wait_when_empty(self):
+        """Test that an empty bucket reports the refill time"""
+        bucket = TokenBucket(capacity=10, refill_per_second=10)
+        bucket.take(10)
+        assert bucket.wait_time(5) == pytest.approx(0.5, abs=0.05)
+
+    def test_refund_is_capped_at_capacity(self):
+        """Test that refunds never overfill the bucket"""
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+        bucket.refund(100)
+        assert bucket.tokens == 10
+
+
+class TestRateLimiter:
+    """Test suite for the per-model limiter"""
+
+    def test_parse_model_limits(self):
+        """Test parsing of per-model overrides"""
+        limits = parse_model_limits("gpt-4o-mini=500:200000, gpt-4o=60:30000,bad")
+        assert limits == {"gpt-4o-mini": (500, 200000), "gpt-4o": (60, 30000)}
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_request_quota(self):
+        """Test that exceeding RPM makes callers wait"""
+        limiter = RateLimiter(requests_per_minute=120, tokens_per_minute=1_000_000)
+        limiter._limits_for("m").requests.tokens = 1
+
+        start = time.monotonic()
+        await limiter.acquire("m", 10)
+        await limiter.acquire("m", 10)
+
+        # Second request needs half a second of refill at 2 requests/second
+        assert time.monotonic() - start >= 0.4
+        assert limiter.get_stats()["m"]["throttled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_models_have_separate_quotas(self):
+        """Test that one model's usage does not throttle another"""
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=1000)
+        await limiter.acquire("a", 10)
+        await asyncio.wait_for(limiter.acquire("b", 10), timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_refunds_unused_tokens(self):
+        """Test that unused reserved tokens return to the bucket"""
+        limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+        reserved = await limiter.acquire("m", 600)
+        limiter.reconcile("m", reserved, 100)
+        assert limiter.get_stats()["m"]["available_tokens"] >= 499
+
+
+class TestRetryHandling:
+    """Test suite for LLMService retries"""
+
+    def test_retry_after_seconds_header(self):
+        """Test that Retry-After in seconds is honored"""
+        assert get_retry_after(FakeAPIError(429, {"retry-after": "3"})) == 3.0
+
+    def test_retry_after_ms_header(self):
+        """Test that retry-after-ms takes precedence"""
+        assert get_retry_after(FakeAPIError(429, {"retry-after-ms": "250", "retry-after": "3"})) == 0.25
+
+    def test_backoff_is_bounded_and_jittered(self):
+        """Test that backoff stays within [d/2, d] and respects the cap"""
+        for attempt in range(6):
+            delay = backoff_delay(attempt, base=0.5, cap=4)
+            expected = min(4, 0.5 * 2 ** attempt)
+            assert expected / 2 <= delay <= expected
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_is_retried(self):
+        """Test that 429 and 5xx answers are retried until success"""
+        completions = FlakyCompletions([
+            FakeAPIError(429, {"retry-after": "0"}),
+            FakeAPIError(503, {"retry-after": "0"})
+        ])
+        limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000)
+        service = LLMService(model="m", client=make_fake_client(completions), rate_limiter=limiter)
+
+        text, _ = await service.complete("What is Slack?")
+
+        assert text == "Answer to What is Slack?"
+        assert service.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test that 4xx errors other than 429 fail immediately"""
+        completions = FlakyCompletions([FakeAPIError(400)])
+        service = LLMService(model="m", client=make_fake_client(completions))
+
+        with pytest.raises(LLMError) as exc_info:
+            await service.complete("What is Slack?")
+
+        assert exc_info.value.transient is False
+        assert service.retries == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_raise_transient_error(self, monkeypatch):
+        """Test that persistent 429s surface as a transient LLMError"""
+        monkeypatch.setattr(config, "LLM_MAX_RETRIES", 1)
+        completions = FlakyCompletions([FakeAPIError(429, {"retry-after": "0"})] * 2)
+        service = LLMService(model="m", client=make_fake_client(completions))
+
+        with pytest.raises(LLMError) as exc_info:
+            await service.complete("What is Slack?")
+
+        assert exc_info.value.transient is True
+        assert exc_info.value.status_code == 429
@@ -0,0 +1,222 @@
+"""
+Test suite for the bulk re-scoring command
+Tests chunked runs, resuming from a checkpoint and the process pool
+"""
+
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import rescore
+from backend.config import config
+from backend.models.schemas import AnalysisResponse, QueryAnalysis, SentimentResult
+from backend.services.analysis_service import AnalysisService
+from backend.services.history_store import HistoryStore
+from backend.services.lexicon import Lexicon, LexiconRegistry
+from backend.services.sentiment_analyzer import SentimentAnalyzer
+
+OLD = Lexicon(["great"], ["clunky"])
+NEW = Lexicon(["great"], ["clunky", "pricey", "slow"])
+
+RESPONSES = [
+    "Slack is great but pricey.",
+    "Slack is slow and clunky.",
+    "Slack is great.",
+]
+
+
+def stored_analysis(i: int) -> str:
+    """An analysis scored with the old lexicon, serialized as one NDJSON line"""
+    # Archived where the re-scoring workers look up earlier versions, as the API does
+    registry = LexiconRegistry(archive_dir=str(config.DATA_DIR / "lexicons"))
+    registry.set(OLD)
+    service = AnalysisService(None, SentimentAnalyzer(lexicon=registry), None)
+    results = []
+    for response in RESPONSES:
+        scan = service.sentiment_analyzer.analyze_response(response, "Slack")
+        results.append(QueryAnalysis(
+            query=f"Query {i}",
+            response=response,
+            sentiment_analysis=SentimentResult(**scan.sentiment()),
+            citations=scan.citations,
+            term_counts=scan.term_counts(),
+            lexicon_version=scan.lexicon_version
+        ))
+    usages = [{"prompt_tokens": 10, "completion_tokens": 20, "model": "gpt-4o-mini", "cached": True}] * len(results)
+    return service.build_response(f"https://slack{i}.com", "Slack", results, usages).model_dump_json()
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "analyses.ndjson"
+    path.write_text("".join(stored_analysis(i) + "\n" for i in range(7)))
+    return path
+
+
+def read_output(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestRescoreRun:
+    """Test suite for rescore.run"""
+
+    def test_chunked_run_rescores_every_analysis(self, export, tmp_path):
+        """Test that every analysis comes out, in order, at the new lexicon version"""
+        output = tmp_path / "out.ndjson"
+        stats = rescore.run(str(export), str(output), workers=0, chunk_size=3, lexicon=NEW)
+
+        analyses = read_output(output)
+        assert stats["analyses"] == 7
+        assert [a["url"] for a in analyses] == [f"https://slack{i}.com" for i in range(7)]
+        first = analyses[0]["analysis"][0]
+        assert first["lexicon_version"] == NEW.version
+        assert first["sentiment_analysis"]["negative_indicators"] == 1
+        assert not (tmp_path / "out.ndjson.checkpoint").exists()
+
+    def test_unchanged_lexicon_reads_no_text(self, export, tmp_path):
+        """Test that analyses already at the current version are passed through"""
+        stats = rescore.run(str(export), str(tmp_path / "out.ndjson"), workers=0, lexicon=OLD)
+
+        assert stats["scanned"] == 0
+
+    def test_incremental_matches_full_rescan(self, export, tmp_path):
+        """Test that re-scoring from stored counts agrees with rescanning the text"""
+        incremental = tmp_path / "incremental.ndjson"
+        full = tmp_path / "full.ndjson"
+        rescore.run(str(export), str(incremental), workers=0, lexicon=NEW)
+        stats = rescore.run(str(export), str(full), workers=0, lexicon=NEW, full=True)
+
+        assert stats["scanned"] == 7 * len(RESPONSES)
+        assert read_output(incremental) == read_output(full)
+
+    def test_json_list_export(self, tmp_path):
+        """Test that a JSON document with an analyses list is accepted"""
+        path = tmp_path / "history.json"
+        path.write_text(json.dumps({"analyses": [json.loads(stored_analysis(0))]}))
+        output = tmp_path / "out.ndjson"
+
+        assert rescore.run(str(path), str(output), workers=0, lexicon=NEW)["analyses"] == 1
+
+    @pytest.mark.parametrize("wrap", [
+        lambda items: json.dumps(items),
+        lambda items: json.dumps(items, indent=2),
+        lambda items: json.dumps({"exported": {"by": "test", "note": "x" * 100}, "count": 7, "analyses": items}),
+    ])
+    def test_json_document_is_read_incrementally(self, export, tmp_path, wrap):
+        """Test that JSON lists are decoded across small reads into the original records"""
+        items = [json.loads(line) for line in export.read_text().splitlines()]
+        path = tmp_path / "history.json"
+        path.write_text(wrap(items))
+
+        assert [json.loads(text) for text in rescore.iter_analyses(str(path), chunk_size=7)] == items
+
+    def test_truncated_json_document_is_rejected(self, export, tmp_path):
+        """Test that a JSON list cut short raises instead of silently ending"""
+        text = json.dumps([json.loads(line) for line in export.read_text().splitlines()])
+        path = tmp_path / "history.json"
+        path.write_text(text[:len(text) // 2])
+
+        with pytest.raises(ValueError):
+            list(rescore.iter_analyses(str(path), chunk_size=64))
+
+    def test_resume_from_checkpoint(self, export, tmp_path):
+        """Test that an interrupted run continues after the last checkpoint"""
+        output = tmp_path / "out.ndjson"
+        expected_path = tmp_path / "expected.ndjson"
+        rescore.run(str(export), str(expected_path), workers=0, chunk_size=3, lexicon=NEW)
+        expected = expected_path.read_text()
+
+        # Simulate a crash after the first chunk: checkpoint says 3 done,
+        # and a partial write of the next chunk is left behind
+        first_chunk = "".join(line + "\n" for line in expected.splitlines()[:3])
+        output.write_text(first_chunk + '{"partial')
+        checkpoint = rescore.Checkpoint(
+            str(output) + ".checkpoint", input=str(export), output=str(output), lexicon_version=NEW.version, full=False
+        )
+        checkpoint.state.update(analyses_done=3, position=len(first_chunk.encode()))
+        checkpoint.save()
+
+        stats = rescore.run(str(export), str(output), workers=0, chunk_size=3, lexicon=NEW)
+
+        assert stats["resumed"] is True
+        assert stats["rescored"] == 4
+        assert output.read_text() == expected
+
+    def test_checkpoint_for_other_lexicon_is_ignored(self, export, tmp_path):
+        """Test that progress made with a different lexicon is not reused"""
+        output = tmp_path / "out.ndjson"
+        output.write_text("stale\n")
+        checkpoint = rescore.Checkpoint(
+            str(output) + ".checkpoint", input=str(export), output=str(output), lexicon_version=OLD.version
+        )
+        checkpoint.state.update(analyses_done=3, position=6)
+        checkpoint.save()
+
+        stats = rescore.run(str(export), str(output), workers=0, lexicon=NEW)
+
+        assert stats["resumed"] is False
+        assert len(read_output(output)) == 7
+
+    def test_checkpoint_for_other_mode_is_ignored(self, export, tmp_path):
+        """Test that an incremental run's progress is not reused by a full rescan"""
+        output = tmp_path / "out.ndjson"
+        output.write_text("stale\n")
+        checkpoint = rescore.Checkpoint(
+            str(output) + ".checkpoint", input=str(export), output=str(output), lexicon_version=NEW.version, full=False
+        )
+        checkpoint.state.update(analyses_done=3, position=6)
+        checkpoint.save()
+
+        stats = rescore.run(str(export), str(output), workers=0, lexicon=NEW, full=True)
+
+        assert stats["resumed"] is False
+        assert len(read_output(output)) == 7
+
+    def test_process_pool(self, export, tmp_path):
+        """Test that pool workers produce the same output as an in-process run"""
+        serial = tmp_path / "serial.ndjson"
+        pooled = tmp_path / "pooled.ndjson"
+        rescore.run(str(export), str(serial), workers=0, chunk_size=2, lexicon=NEW)
+        stats = rescore.run(str(export), str(pooled), workers=2, chunk_size=2, lexicon=NEW)
+
+        assert stats["analyses"] == 7
+        assert pooled.read_text() == serial.read_text()
+
+
+class TestRescoreHistory:
+    """Test suite for rescore.run_history"""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = HistoryStore(str(tmp_path / "history.sqlite3"))
+        for i in range(5):
+            store.add(AnalysisResponse.model_validate_json(stored_analysis(i)))
+        yield store
+        store.close()
+
+    def test_updates_records_in_place(self, store):
+        """Test that every stored analysis is re-scored and written back"""
+        stats = rescore.run_history(store, workers=0, chunk_size=2, lexicon=NEW)
+
+        assert stats["analyses"] == 5
+        versions = {a.lexicon_version for r in store.recent(10) for a in r.analysis}
+        assert versions == {NEW.version}
+
+    def test_resumes_after_last_record(self, store, tmp_path):
+        """Test that a restarted run skips records before the checkpointed id"""
+        checkpoint_path = str(tmp_path / "rescore.checkpoint")
+        checkpoint = rescore.Checkpoint(
+            checkpoint_path, history=str(Path(store.db_path).resolve()), lexicon_version=NEW.version, full=False
+        )
+        checkpoint.state.update(analyses_done=3, position=3)
+        checkpoint.save()
+
+        stats = rescore.run_history(store, workers=0, checkpoint_path=checkpoint_path, lexicon=NEW)
+
+        assert stats["rescored"] == 2
+        assert store.get(1).analysis[0].lexicon_version == OLD.version
+        assert store.get(5).analysis[0].lexicon_version == NEW.version
@@ -293,3 +293,150 @@ class TestBrandOccurrencesCounting:
         count = analyzer.count_brand_occurrences(text, brand)
 
         assert count == 3
+
+
+class TestWordBoundaries:
+    """Test suite for whole-word keyword and brand matching"""
+
+    @pytest.fixture
+    def analyzer(self):
+        return SentimentAnalyzer()
+
+    def test_keyword_inside_word_is_ignored(self, analyzer):
+        """Test that "good" inside "goodbye" is not a positive indicator"""
+        result = analyzer.analyze_sentiment("Slack said goodbye to its old UI", "Slack")
+
+        assert result["positive_indicators"] == 0
+        assert result["sentiment"] == "NEUTRAL"
+
+    def test_brand_inside_word_is_ignored(self, analyzer):
+        """Test that a brand embedded in another word is not a mention"""
+        assert analyzer.analyze_sentiment("Google is great", "Go")["mentioned"] is False
+        assert analyzer.count_brand_occurrences("Google and Go", "Go") == 1
+
+    def test_hyphenated_and_multi_word_keywords(self, analyzer):
+        """Test that keywords containing hyphens or spaces still match"""
+        result = analyzer.analyze_sentiment("Slack is top-notch, though not recommended for tiny teams", "Slack")
+
+        assert result["positive_indicators"] == 1
+        assert result["negative_indicators"] == 1
+
+    def test_words_of_the_brand_name_are_not_sentiment(self, analyzer):
+        """Test that "best" in "Best Buy" is part of the mention, not praise"""
+        result = analyzer.analyze_sentiment("Best Buy has terrible service.", "Best Buy")
+
+        assert result["positive_indicators"] == 0
+        assert result["negative_indicators"] == 1
+        assert result["sentiment"] == "NEGATIVE"
+        assert analyzer.analyze_response("Smooth Corp is a company.", "Smooth Corp").term_counts() == {}
+
+    def test_scan_finds_everything_in_one_pass(self, analyzer):
+        """Test that scan reports brand positions and distinct keywords"""
+        positions, positive, negative = analyzer.scan("Slack is great. Slack is great but slow.", "Slack")
+
+        assert positions == [0, 16]
+        assert positive == {"great"}
+        assert negative == {"slow"}
+
+
+class TestBatchScoring:
+    """Test suite for vectorized batch scoring"""
+
+    @pytest.fixture
+    def analyzer(self):
+        return SentimentAnalyzer()
+
+    CORPUS = [
+        "Slack is excellent and amazing for team collaboration",
+        "Slack is terrible and has so many problems",
+        "Slack is a communication tool that has features for teams",
+        "Microsoft Teams is a great tool",
+        "Slack said goodbye to the old UI. Slack's new one is top-notch but slow",
+        "Slack is good but has some problems",
+        "",
+        "I use slack daily; SLACK is not recommended for tiny teams, but slack is useful",
+        "Slack is fine.\n\nZoom is terrible. Teams is awful! Discord is buggy? Slack is great.",
+        "Zoom is excellent. Zoom is amazing. Zoom is great. Slack exists.",
+        "Slack is slow. Teams is bad. Zoom is poor. Webex is weak. Meet is great.",
+    ]
+
+    def test_matches_single_document_analysis(self, analyzer):
+        """Test that batch results equal per-document analyze_sentiment"""
+        batch = analyzer.analyze_batch(self.CORPUS, "Slack")
+
+        assert batch == [analyzer.analyze_sentiment(text, "Slack") for text in self.CORPUS]
+
+    @pytest.mark.parametrize("brand, texts", [
+        ("Best Buy", ["Best Buy has terrible service.", "Best Buy is great. best buy, best prices", "Buy the best"]),
+        ("Smooth Corp", ["Smooth Corp is a company.", "Smooth Corp is smooth"]),
+        ("Notch Labs", ["Notch Labs is top-notch labs. top-notch labs rule"]),
+    ])
+    def test_brand_containing_lexicon_word(self, analyzer, brand, texts):
+        """Test that both paths leave lexicon words inside the brand name out"""
+        assert analyzer.analyze_batch(texts, brand) == [analyzer.analyze_sentiment(text, brand) for text in texts]
+
+    def test_brand_occurrences_match_citation_count(self, analyzer):
+        """Test that per-document brand counts equal count_brand_occurrences"""
+        scores = analyzer.score_batch(self.CORPUS, "Slack")
+
+        assert scores["brand_occurrences"].tolist() == [
+            analyzer.count_brand_occurrences(text, "Slack") for text in self.CORPUS
+        ]
+
+    def test_term_matrix_counts_occurrences(self, analyzer):
+        """Test that the document-term matrix counts repeated terms"""
+        matrix, vocabulary, position = analyzer.term_matrix(["great great Slack", "bad"], "Slack", window=None)
+        dense = matrix.toarray()
+
+        assert matrix.shape == (2, len(vocabulary))
+        assert dense[0, vocabulary.index("great")] == 2
+        assert dense[0, -1] == 1
+        assert dense[1, vocabulary.index("bad")] == 1
+        assert position.tolist() == [12, -1]
+
+    def test_empty_batch(self, analyzer):
+        """Test that an empty batch returns no analyses"""
+        assert analyzer.analyze_batch([], "Slack") == []
+
+
+class TestMentionWindow:
+    """Test suite for mention-scoped sentiment"""
+
+    TEXT = "Zoom is excellent. Zoom is amazing and reliable. Slack is fine. Zoom is great."
+
+    def test_praise_of_other_products_is_ignored(self):
+        """Test that keywords far from any mention don't count"""
+        result = SentimentAnalyzer(mention_window=0).analyze_sentiment(self.TEXT, "Slack")
+
+        assert result["sentiment"] == "NEUTRAL"
+        assert result["positive_indicators"] == 0
+
+    def test_window_includes_neighbouring_sentences(self):
+        """Test that window=1 counts the sentences before and after a mention"""
+        result = SentimentAnalyzer(mention_window=1).analyze_sentiment(self.TEXT, "Slack")
+
+        assert result["positive_indicators"] == 3
+
+    def test_negative_window_scores_whole_response(self):
+        """Test that a negative window disables scoping"""
+        result = SentimentAnalyzer(mention_window=-1).analyze_sentiment(self.TEXT, "Slack")
+
+        assert result["positive_indicators"] == 4
+
+    def test_response_analysis_index(self):
+        """Test that one ResponseAnalysis gives citations, position and sentiment"""
+        analysis = SentimentAnalyzer(mention_window=0).analyze_response("Great tool. Slack, slack and SLACK.", "Slack")
+
+        assert analysis.citations == 3
+        assert analysis.position == 12
+        assert analysis.mention_sentences == [1]
+        assert analysis.sentiment(window=None)["positive_indicators"] == 1
+        assert analysis.sentiment()["positive_indicators"] == 0
+
+    @pytest.mark.parametrize("window", [0, 1, 2, -1])
+    def test_batch_matches_single_document_windows(self, window):
+        """Test that batch scoring applies the same window as analyze_sentiment"""
+        analyzer = SentimentAnalyzer(mention_window=window)
+        corpus = TestBatchScoring.CORPUS + [self.TEXT]
+
+        assert analyzer.analyze_batch(corpus, "Slack") == [analyzer.analyze_sentiment(t, "Slack") for t in corpus]
@@ -0,0 +1,85 @@
+"""
+Test suite for share of voice
+Tests competitor extraction, multi-brand scanning and share/rank metrics
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.share_of_voice import BrandScanner, ShareOfVoiceAnalyzer, extract_competitors
+
+COMPETITORS_ANSWER = """The main competitors of Slack are:
+
+1. **Microsoft Teams**: Deeply integrated with Office 365.
+2. **Discord** - Popular with communities.
+3. Google Chat (part of Google Workspace).
+- Slack itself is often compared to email.
+- it also competes with plain email in many companies
+"""
+
+
+class TestExtractCompetitors:
+    """Test suite for extract_competitors"""
+
+    def test_reads_list_item_names(self):
+        """Test that names are taken from numbered and bulleted items"""
+        assert extract_competitors(COMPETITORS_ANSWER, "Slack") == ["Microsoft Teams", "Discord", "Google Chat"]
+
+    def test_limit(self):
+        """Test that at most limit names are returned"""
+        assert extract_competitors(COMPETITORS_ANSWER, "Slack", limit=1) == ["Microsoft Teams"]
+
+    def test_prose_has_no_competitors(self):
+        """Test that an answer without a list yields nothing"""
+        assert extract_competitors("Slack competes with Teams and Discord.", "Slack") == []
+
+
+class TestBrandScanner:
+    """Test suite for BrandScanner"""
+
+    def test_counts_and_mention_order(self):
+        """Test occurrences, first positions and order of first mention"""
+        scanner = BrandScanner({"Slack": [], "Discord": [], "Zoom": []})
+        found = scanner.scan("Discord and Slack. slack again, then DISCORD.")
+
+        assert list(found) == ["Discord", "Slack"]
+        assert found["Slack"] == {"occurrences": 2, "first_position": 12}
+        assert found["Discord"]["occurrences"] == 2
+
+    def test_aliases_and_longest_match(self):
+        """Test that aliases count for their brand and overlapping names resolve to the longest"""
+        scanner = BrandScanner({"Microsoft Teams": ["Teams", "MS Teams"], "Slack": ["Slack Technologies"]})
+        found = scanner.scan("Slack Technologies vs Microsoft Teams vs Teams")
+
+        assert found["Slack"]["occurrences"] == 1
+        assert found["Microsoft Teams"]["occurrences"] == 2
+
+    def test_word_boundaries(self):
+        """Test that brand names inside other words are ignored"""
+        assert BrandScanner({"Go": []}).scan("Google") == {}
+
+
+class TestShareOfVoiceAnalyzer:
+    """Test suite for ShareOfVoiceAnalyzer"""
+
+    def test_share_and_rank(self):
+        """Test share of voice, average rank and first mention rate"""
+        responses = [
+            "Slack leads, then Discord. Slack is great.",
+            "Discord is popular; Slack too.",
+            "Nothing relevant here.",
+        ]
+        metrics = ShareOfVoiceAnalyzer().analyze(responses, "Slack", ["Discord"])
+
+        assert metrics.share_of_voice == 60.0
+        assert metrics.average_rank == 1.5
+        assert metrics.first_mention_rate == 50.0
+        assert [b.name for b in metrics.brands] == ["Slack", "Discord"]
+        assert metrics.brands[1].responses_mentioned == 2
+
+    def test_no_competitors(self):
+        """Test that no metrics are computed without competitors"""
+        assert ShareOfVoiceAnalyzer().analyze(["Slack"], "Slack", ["slack", " "]) is None
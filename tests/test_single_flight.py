@@ -0,0 +1,125 @@
+"""
+Test suite for SingleFlight
+Tests coalescing of identical in-flight calls
+"""
+
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.services.llm_service import LLMService
+from backend.services.single_flight import SingleFlight
+from tests.conftest import FakeCompletions, make_fake_client
+
+
+class TestSingleFlight:
+    """Test suite for the single-flight primitive"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key run func once"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert [r for r, _ in results] == ["result"] * 5
+        assert sum(1 for _, joined in results if joined) == 4
+        assert flight.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Test that a finished call is not reused"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            return len(calls)
+
+        await flight.do("key", work)
+        await flight.do("key", work)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        """Test that every waiter sees the shared failure"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_call_alive(self):
+        """Test that the shared call survives while other callers still wait"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", work))
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert (await second)[0] == "done"
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_leaving_cancels_call(self):
+        """Test that the shared call is cancelled once nobody waits for it"""
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flight.do("key", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert flight.in_flight == 0
+
+
+class TestCoalescedLLMService:
+    """Test suite for per-query coalescing in LLMService"""
+
+    @pytest.mark.asyncio
+    async def test_overlapping_query_sets_share_calls(self):
+        """Test that two analyses sharing some queries only send each query once"""
+        completions = FakeCompletions()
+        service = LLMService(model="m", client=make_fake_client(completions))
+
+        first, second = await asyncio.gather(
+            service.complete_many(["A", "B", "C"]),
+            service.complete_many(["B", "C", "D"])
+        )
+
+        assert sorted(completions.calls) == ["A", "B", "C", "D"]
+        assert [text for text, _ in second] == ["Answer to B", "Answer to C", "Answer to D"]
+        assert [usage["coalesced"] for _, usage in second] == [True, True, False]